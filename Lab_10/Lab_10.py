@@ -1,11 +1,18 @@
 # Importación de librerías necesarias para el procesamiento y modelado de datos
-from sklearn.datasets import load_iris, load_wine, load_digits
+import os
+import sys
+from sklearn.datasets import load_wine, load_digits
 from sklearn.model_selection import train_test_split, cross_val_predict, LeaveOneOut
 from sklearn.naive_bayes import GaussianNB
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import accuracy_score, confusion_matrix
+from sklearn.utils import Bunch
 import pandas as pd
 
+# El cargador con caché de los archivos de Iris vive en Lab_8
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_8"))
+from datos_iris import cargar_iris
+
 # Configuración de pandas para mostrar todas las columnas y ajustar el ancho de la salida
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 1000)
@@ -33,12 +40,14 @@ def mostrar_matriz_confusion(matriz, etiquetas_clase, metodo, clasificador, data
 # Función para cargar los datasets Iris, Wine y Digits
 def cargar_datasets():
     """
-    Carga los datasets Iris, Wine y Digits desde sklearn.
+    Carga los datasets Iris (desde bezdekIris.data, con el cargador con caché de Lab_8), Wine y Digits
+    (desde sklearn).
 
     Returns:
         dict: Un diccionario que contiene los datasets con sus nombres como claves.
     """
-    iris = load_iris()
+    X_iris, y_iris, clases_iris = cargar_iris()
+    iris = Bunch(data=X_iris, target=y_iris, target_names=clases_iris)
     wine = load_wine()
     digits = load_digits()
     return {"Iris": iris, "Wine": wine, "Digits": digits}
@@ -1,6 +1,8 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
-from sklearn.datasets import load_iris, load_wine, load_breast_cancer  # Datasets predefinidos en sklearn
+from sklearn.datasets import load_wine, load_breast_cancer  # Datasets predefinidos en sklearn
 from sklearn.model_selection import train_test_split, KFold, LeaveOneOut  # Métodos de validación
 from sklearn.metrics import accuracy_score, confusion_matrix  # Métricas de desempeño
 from sklearn.neural_network import MLPClassifier  # Perceptrón Multicapa
@@ -8,11 +10,15 @@ from sklearn.svm import SVC  # Clasificador basado en SVM con kernel RBF
 from sklearn.preprocessing import StandardScaler  # Escalador para normalizar los datos
 from sklearn.utils.multiclass import unique_labels  # Para obtener etiquetas únicas de un conjunto de datos
 
+# El cargador con caché de los archivos de Iris vive en Lab_8
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_8"))
+from datos_iris import cargar_iris  # Iris desde bezdekIris.data con tipos explícitos y caché binaria
+
 # Función para cargar los datasets
 def cargar_datasets():
     """
-    Carga y devuelve tres datasets predefinidos de sklearn:
-    - Iris: Clasificación de flores (3 clases).
+    Carga y devuelve tres datasets:
+    - Iris: Clasificación de flores (3 clases), desde bezdekIris.data con el cargador de Lab_8.
     - Wine: Clasificación de tipos de vino (3 clases).
     - Breast Cancer: Clasificación binaria de células tumorales (malignas/benignas).
     
@@ -20,8 +26,9 @@ def cargar_datasets():
     - Las características (X) y las etiquetas (y) del dataset.
     - Los nombres de las clases correspondientes.
     """
+    X_iris, y_iris, clases_iris = cargar_iris()
     datasets = {
-        "Iris": (load_iris(return_X_y=True), load_iris().target_names),
+        "Iris": ((X_iris, y_iris), clases_iris),
         "Wine": (load_wine(return_X_y=True), load_wine().target_names),
         "Breast Cancer": (load_breast_cancer(return_X_y=True), load_breast_cancer().target_names),
     }
@@ -1,14 +1,29 @@
 import numpy as np
+import argparse
+import json
+import time
+import tracemalloc
 
 # Definir la función de Himmelblau
 def funcion_himmelblau(x, y):
     return (x**2 + y - 11)**2 + (x + y**2 - 7)**2
 
+# Mínimos conocidos de la función de Himmelblau (todos con valor 0)
+MINIMOS_CONOCIDOS = [(3.0, 2.0), (-2.805118, 3.131312), (-3.779310, -3.283186), (3.584428, -1.848126)]
+
+# Distancia del punto encontrado al mínimo conocido más cercano
+def error_minimo(x, y):
+    return min(float(np.hypot(x - mx, y - my)) for mx, my in MINIMOS_CONOCIDOS)
+
 # Método 1: Usar una librería (scipy)
-def metodo_libreria():
+def metodo_libreria(mostrar=True):
     from scipy.optimize import minimize
+    evaluaciones = 0  # Contador de evaluaciones de la función objetivo
+
     # Definir la función para optimizar
     def himmelblau_opt(xy):
+        nonlocal evaluaciones
+        evaluaciones += 1
         x, y = xy
         return funcion_himmelblau(x, y)
     
@@ -20,12 +35,16 @@ def metodo_libreria():
     resultado = minimize(himmelblau_opt, valor_inicial, bounds=limites)
     
     # Mostrar resultados
-    print(f"\nMétodo con librería:")
-    print(f"El mínimo está en x = {resultado.x[0]}, y = {resultado.x[1]}, con un valor de {resultado.fun}\n")
+    if mostrar:
+        print(f"\nMétodo con librería:")
+        print(f"El mínimo está en x = {resultado.x[0]}, y = {resultado.x[1]}, con un valor de {resultado.fun}\n")
+    # L-BFGS-B aproxima el gradiente por diferencias finitas, así que todas sus evaluaciones son de la función
+    return {"x": float(resultado.x[0]), "y": float(resultado.x[1]), "valor": float(resultado.fun),
+            "evaluaciones_funcion": evaluaciones, "evaluaciones_gradiente": 0}
 
 
 # Método 2: Fuerza Bruta
-def metodo_fuerza_bruta():
+def metodo_fuerza_bruta(mostrar=True):
     # Definir los rangos de búsqueda y los pasos
     rango_x = np.linspace(-5, 5, 1000)
     rango_y = np.linspace(-5, 5, 1000)
@@ -44,41 +63,165 @@ def metodo_fuerza_bruta():
                 minimo_y = y
 
     # Mostrar resultados
-    print(f"\nMétodo de fuerza bruta:")
-    print(f"El mínimo está en x = {minimo_x}, y = {minimo_y}, con un valor de {valor_minimo}\n")
+    if mostrar:
+        print(f"\nMétodo de fuerza bruta:")
+        print(f"El mínimo está en x = {minimo_x}, y = {minimo_y}, con un valor de {valor_minimo}\n")
+    return {"x": float(minimo_x), "y": float(minimo_y), "valor": float(valor_minimo),
+            "evaluaciones_funcion": len(rango_x) * len(rango_y), "evaluaciones_gradiente": 0}
 
 
-# Método 3: Descenso por gradiente
-def metodo_gradiente():
-    # Definir el gradiente (derivadas parciales de la función)
-    def gradiente_himmelblau(x, y):
-        df_dx = 4 * (x**2 + y - 11) * x + 2 * (x + y**2 - 7)
-        df_dy = 2 * (x**2 + y - 11) + 4 * (x + y**2 - 7) * y
-        return np.array([df_dx, df_dy])
-
-    # Parámetros iniciales
-    x_actual, y_actual = 0, 0   # Punto de inicio
-    tasa_aprendizaje = 0.001    # Tamaño del paso
-    tolerancia = 1e-16          # Criterio de convergencia
-    max_iteraciones = 1500      # Máximo número de iteraciones
-
-    # Algoritmo de descenso por gradiente
-    for i in range(max_iteraciones):
-        gradiente = gradiente_himmelblau(x_actual, y_actual)
-        nuevo_x = x_actual - tasa_aprendizaje * gradiente[0]
-        nuevo_y = y_actual - tasa_aprendizaje * gradiente[1]
-        
-        # Verificar convergencia
-        if np.linalg.norm([nuevo_x - x_actual, nuevo_y - y_actual]) < tolerancia:
-            print(f"\nConvergencia alcanzada en iteración {i}")
+# Gradiente analítico de la función de Himmelblau (derivadas parciales)
+def gradiente_himmelblau(x, y):
+    df_dx = 4 * (x**2 + y - 11) * x + 2 * (x + y**2 - 7)
+    df_dy = 2 * (x**2 + y - 11) + 4 * (x + y**2 - 7) * y
+    return np.array([df_dx, df_dy])
+
+
+# Estrategias de control del paso disponibles para el descenso por gradiente
+ESTRATEGIAS_PASO = ["fijo", "momentum", "nesterov", "adam", "armijo"]
+
+# Tasa de aprendizaje por defecto de cada estrategia (en Armijo es el paso inicial de la búsqueda)
+TASAS_PREDETERMINADAS = {"fijo": 0.001, "momentum": 0.001, "nesterov": 0.001, "adam": 0.1, "armijo": 1.0}
+
+
+def descenso_gradiente(estrategia="fijo", punto_inicial=(0, 0), tasa_aprendizaje=None,
+                       tolerancia=1e-10, max_iteraciones=1500):
+    """
+    Minimiza la función de Himmelblau por descenso de gradiente con la estrategia de paso indicada.
+
+    Parámetros:
+    - estrategia: "fijo", "momentum" (bola pesada), "nesterov", "adam" o "armijo" (búsqueda lineal).
+    - punto_inicial: Coordenadas (x, y) desde las que se inicia el descenso.
+    - tasa_aprendizaje: Tamaño del paso; si es None se usa el de TASAS_PREDETERMINADAS.
+    - tolerancia: Se considera que converge cuando la norma del gradiente es menor que este valor.
+    - max_iteraciones: Máximo número de iteraciones.
+
+    Retorna:
+    - Diccionario con el punto final, su valor, las iteraciones realizadas, las evaluaciones
+      del gradiente y de la función, y si se alcanzó la convergencia.
+    """
+    if estrategia not in ESTRATEGIAS_PASO:
+        raise ValueError(f"Estrategia desconocida: {estrategia}. Opciones: {', '.join(ESTRATEGIAS_PASO)}")
+    if tasa_aprendizaje is None:
+        tasa_aprendizaje = TASAS_PREDETERMINADAS[estrategia]
+
+    punto = np.array(punto_inicial, dtype=float)
+    velocidad = np.zeros(2)       # Momentum y Nesterov
+    momento_1 = np.zeros(2)       # Adam: media móvil del gradiente
+    momento_2 = np.zeros(2)       # Adam: media móvil del gradiente al cuadrado
+    beta = 0.9                    # Coeficiente de inercia (momentum / nesterov)
+    beta1, beta2, epsilon = 0.9, 0.999, 1e-8  # Parámetros de Adam
+    c_armijo, reduccion = 1e-4, 0.5           # Condición de suficiente descenso y factor de reducción
+
+    evaluaciones_gradiente = 0
+    evaluaciones_funcion = 0
+    convergio = False
+    iteracion = 0
+
+    # Gradiente en el punto actual
+    gradiente = gradiente_himmelblau(*punto)
+    evaluaciones_gradiente += 1
+
+    for iteracion in range(1, max_iteraciones + 1):
+        if np.linalg.norm(gradiente) < tolerancia:
+            convergio = True
+            iteracion -= 1
             break
-        
-        x_actual, y_actual = nuevo_x, nuevo_y
+
+        if estrategia == "fijo":
+            punto = punto - tasa_aprendizaje * gradiente
+
+        elif estrategia == "momentum":
+            velocidad = beta * velocidad - tasa_aprendizaje * gradiente
+            punto = punto + velocidad
+
+        elif estrategia == "nesterov":
+            # Forma reformulada: 'punto' es el punto adelantado x + beta * v, así que el
+            # gradiente evaluado al final del bucle ya es el de Nesterov (una evaluación por iteración)
+            velocidad = beta * velocidad - tasa_aprendizaje * gradiente
+            punto = punto + beta * velocidad - tasa_aprendizaje * gradiente
+
+        elif estrategia == "adam":
+            momento_1 = beta1 * momento_1 + (1 - beta1) * gradiente
+            momento_2 = beta2 * momento_2 + (1 - beta2) * gradiente**2
+            m_corregido = momento_1 / (1 - beta1**iteracion)
+            v_corregido = momento_2 / (1 - beta2**iteracion)
+            punto = punto - tasa_aprendizaje * m_corregido / (np.sqrt(v_corregido) + epsilon)
+
+        elif estrategia == "armijo":
+            # Búsqueda lineal hacia atrás: reduce el paso hasta cumplir la condición de Armijo
+            valor_actual = funcion_himmelblau(*punto)
+            norma_cuadrada = gradiente @ gradiente
+            paso = tasa_aprendizaje
+            estancado = False
+            while True:
+                candidato = punto - paso * gradiente
+                evaluaciones_funcion += 1
+                objetivo = valor_actual - c_armijo * paso * norma_cuadrada
+                if funcion_himmelblau(*candidato) <= objetivo:
+                    break
+                paso *= reduccion
+                # Paso despreciable o descenso exigido por debajo del redondeo de f: ya no se puede bajar
+                if paso < 1e-16 or valor_actual - c_armijo * paso * norma_cuadrada == valor_actual:
+                    estancado = True
+                    break
+            evaluaciones_funcion += 1
+            if estancado:
+                # Ningún paso cumple la condición: se conserva el punto y se termina sin convergencia
+                iteracion -= 1
+                break
+            punto = candidato
+
+        gradiente = gradiente_himmelblau(*punto)
+        evaluaciones_gradiente += 1
+    else:
+        convergio = np.linalg.norm(gradiente) < tolerancia
+
+    evaluaciones_funcion += 1  # Evaluación final del valor alcanzado
+    return {
+        "estrategia": estrategia,
+        "x": float(punto[0]),
+        "y": float(punto[1]),
+        "valor": float(funcion_himmelblau(*punto)),
+        "iteraciones": iteracion,
+        "evaluaciones_gradiente": evaluaciones_gradiente,
+        "evaluaciones_funcion": evaluaciones_funcion,
+        "convergio": bool(convergio),
+    }
+
+
+# Método 3: Descenso por gradiente
+def metodo_gradiente(estrategia="fijo", mostrar=True):
+    # Ejecutar el descenso con la estrategia de paso seleccionada
+    resultado = descenso_gradiente(estrategia)
+    if not mostrar:
+        return resultado
+
+    if resultado["convergio"]:
+        print(f"\nConvergencia alcanzada en iteración {resultado['iteraciones']}")
 
     # Mostrar resultados
-    valor_minimo = funcion_himmelblau(x_actual, y_actual)
-    print(f"Método de descenso por gradiente:")
-    print(f"El mínimo está en x = {x_actual}, y = {y_actual}, con un valor de {valor_minimo}\n")
+    print(f"Método de descenso por gradiente ({estrategia}):")
+    print(f"El mínimo está en x = {resultado['x']}, y = {resultado['y']}, con un valor de {resultado['valor']}")
+    print(f"Iteraciones: {resultado['iteraciones']}, evaluaciones del gradiente: {resultado['evaluaciones_gradiente']}, "
+          f"evaluaciones de la función: {resultado['evaluaciones_funcion']}\n")
+    return resultado
+
+
+# Comparar todas las estrategias de paso con el mismo criterio de convergencia
+def comparar_estrategias(tolerancia=1e-10, max_iteraciones=20000):
+    resultados = [descenso_gradiente(estrategia, tolerancia=tolerancia, max_iteraciones=max_iteraciones)
+                  for estrategia in ESTRATEGIAS_PASO]
+    # Primero las que convergen, ordenadas por evaluaciones totales (gradiente + función)
+    resultados.sort(key=lambda r: (not r["convergio"], r["evaluaciones_gradiente"] + r["evaluaciones_funcion"]))
+
+    print(f"\nComparación de estrategias (tolerancia {tolerancia} en la norma del gradiente):")
+    print(f"{'Estrategia':<10} {'Iter.':>6} {'Ev. grad.':>10} {'Ev. func.':>10} {'Converge':>9}  Mínimo")
+    for r in resultados:
+        print(f"{r['estrategia']:<10} {r['iteraciones']:>6} {r['evaluaciones_gradiente']:>10} "
+              f"{r['evaluaciones_funcion']:>10} {'sí' if r['convergio'] else 'no':>9}  "
+              f"({r['x']:.6f}, {r['y']:.6f})")
+    return resultados
 
 
 # Menú para seleccionar el método
@@ -88,7 +231,8 @@ def menu():
         print("1. Usar librería (scipy)")
         print("2. Fuerza bruta")
         print("3. Descenso por gradiente")
-        print("4. Salir")
+        print("4. Comparar estrategias de paso del descenso por gradiente")
+        print("5. Salir")
         eleccion = input("Introduce el número del método que deseas usar: ")
 
         if eleccion == '1':
@@ -96,12 +240,90 @@ def menu():
         elif eleccion == '2':
             metodo_fuerza_bruta()
         elif eleccion == '3':
-            metodo_gradiente()
+            estrategia = input(f"Estrategia de paso ({', '.join(ESTRATEGIAS_PASO)}) [fijo]: ").strip().lower() or "fijo"
+            if estrategia in ESTRATEGIAS_PASO:
+                metodo_gradiente(estrategia)
+            else:
+                print("Estrategia no válida.")
         elif eleccion == '4':
+            comparar_estrategias()
+        elif eleccion == '5':
             print("\nSaliendo del programa. ¡Hasta luego!")
             break  # Salir del bucle y finalizar el programa
         else:
-            print("Opción no válida. Por favor, selecciona 1, 2, 3 o 4.")
+            print("Opción no válida. Por favor, selecciona 1, 2, 3, 4 o 5.")
+
+# Métodos disponibles en el modo por lotes
+METODOS = {
+    "libreria": metodo_libreria,
+    "fuerza_bruta": metodo_fuerza_bruta,
+    "gradiente": metodo_gradiente,
+}
+
+# Modo por lotes: ejecuta los métodos sin interacción y devuelve las mediciones
+def ejecutar_lote(metodos, repeticiones=1, estrategia="fijo"):
+    """
+    Ejecuta cada método indicado 'repeticiones' veces y mide su desempeño.
+
+    Parámetros:
+    - metodos: Lista de nombres de METODOS a ejecutar.
+    - repeticiones: Número de ejecuciones cronometradas por método.
+    - estrategia: Estrategia de paso usada por el método de gradiente.
+
+    Retorna:
+    - Lista de diccionarios (uno por método) con tiempos, evaluaciones, error y memoria pico.
+    """
+    if repeticiones < 1:
+        raise ValueError(f"Se necesita al menos una repetición (se pidieron {repeticiones})")
+    informe = []
+    for nombre in metodos:
+        funcion = METODOS[nombre]
+        argumentos = {"estrategia": estrategia} if nombre == "gradiente" else {}
+
+        # Calentamiento sin medir (p. ej. importar scipy), para que la memoria pico sea solo la del método
+        funcion(mostrar=False, **argumentos)
+        tracemalloc.start()
+        funcion(mostrar=False, **argumentos)
+        _, memoria_pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Ejecuciones cronometradas (sin tracemalloc, que distorsiona los tiempos)
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion(mostrar=False, **argumentos)
+            tiempos.append(time.perf_counter() - inicio)
+
+        informe.append({
+            "metodo": nombre if nombre != "gradiente" else f"gradiente:{estrategia}",
+            "repeticiones": repeticiones,
+            "tiempo_medio_s": sum(tiempos) / len(tiempos),
+            "tiempo_min_s": min(tiempos),
+            "tiempo_max_s": max(tiempos),
+            "evaluaciones_funcion": resultado["evaluaciones_funcion"],
+            "evaluaciones_gradiente": resultado["evaluaciones_gradiente"],
+            "x": resultado["x"],
+            "y": resultado["y"],
+            "valor": resultado["valor"],
+            "error_posicion": error_minimo(resultado["x"], resultado["y"]),
+            "memoria_pico_bytes": memoria_pico,
+        })
+    return informe
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mínimo de la función de Himmelblau. Sin argumentos abre el menú interactivo.")
+    parser.add_argument("--metodos", nargs="+", choices=list(METODOS),
+                        help="Ejecuta en modo por lotes los métodos indicados e imprime el informe en JSON")
+    parser.add_argument("--repeticiones", type=int, default=1, help="Ejecuciones cronometradas por método")
+    parser.add_argument("--estrategia", choices=ESTRATEGIAS_PASO, default="fijo",
+                        help="Estrategia de paso del método de gradiente")
+    args = parser.parse_args()
+    if args.repeticiones < 1:
+        parser.error("--repeticiones debe ser al menos 1")
 
-# Ejecutar el menú
-menu()
+    if args.metodos:
+        print(json.dumps(ejecutar_lote(args.metodos, args.repeticiones, args.estrategia), indent=2))
+    else:
+        # Ejecutar el menú
+        menu()
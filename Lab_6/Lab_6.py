@@ -1,6 +1,9 @@
 import numpy as np
 import random
 import math
+import time
+import argparse
+import multiprocessing
 
 # Función de Himmelblau
 def funcion_himmelblau(x, y):
@@ -16,8 +19,24 @@ def funcion_himmelblau(x, y):
     """
     return (x**2 + y - 11)**2 + (x + y**2 - 7)**2
 
+# Función de Rastrigin en dos dimensiones
+def funcion_rastrigin(x, y):
+    """
+    Calcula el valor de la función de Rastrigin en el punto (x, y). Tiene un mínimo global de 0 en (0, 0)
+    rodeado de una malla regular de mínimos locales, por lo que es difícil para el recocido simulado.
+    
+    Parámetros:
+    x (float): Coordenada x.
+    y (float): Coordenada y.
+    
+    Retorna:
+    float: El valor de la función de Rastrigin en el punto (x, y).
+    """
+    return 20 + x**2 - 10 * np.cos(2 * np.pi * x) + y**2 - 10 * np.cos(2 * np.pi * y)
+
 # Algoritmo de Recocido Simulado
-def recocido_simulado(limites, max_iteraciones, temp_inicial, alfa):
+def recocido_simulado(limites, max_iteraciones, temp_inicial, alfa, funcion=funcion_himmelblau, objetivo=None,
+                      mostrar=True):
     """
     Implementa el algoritmo de recocido simulado para minimizar la función de Himmelblau.
     
@@ -26,6 +45,9 @@ def recocido_simulado(limites, max_iteraciones, temp_inicial, alfa):
     max_iteraciones (int): Número máximo de iteraciones que realizará el algoritmo.
     temp_inicial (float): Temperatura inicial del recocido simulado, que afecta la probabilidad de aceptar soluciones peores.
     alfa (float): Factor de enfriamiento que determina cómo se reduce la temperatura en cada iteración.
+    funcion (callable): Función objetivo f(x, y) a minimizar (por defecto, la de Himmelblau).
+    objetivo (float): Si se indica, el algoritmo se detiene en cuanto el mejor costo es menor o igual a este valor.
+    mostrar (bool): Si es True, imprime los parámetros utilizados.
     
     Retorna:
     tuple: Una tupla que contiene las mejores coordenadas encontradas (mejor_x, mejor_y) 
@@ -37,7 +59,7 @@ def recocido_simulado(limites, max_iteraciones, temp_inicial, alfa):
     y = random.uniform(limites[0], limites[1])
     
     # Evaluar la función objetivo en el punto inicial (costo inicial)
-    costo_actual = funcion_himmelblau(x, y)
+    costo_actual = funcion(x, y)
     
     # Almacenar el mejor punto encontrado hasta ahora
     mejor_x, mejor_y = x, y
@@ -57,7 +79,7 @@ def recocido_simulado(limites, max_iteraciones, temp_inicial, alfa):
         y_nuevo = max(min(y_nuevo, limites[1]), limites[0])
         
         # Evaluar la función objetivo en el nuevo punto
-        nuevo_costo = funcion_himmelblau(x_nuevo, y_nuevo)
+        nuevo_costo = funcion(x_nuevo, y_nuevo)
         
         # Calcular el cambio en la función objetivo (diferencia de costos entre el punto actual y el nuevo)
         delta_costo = nuevo_costo - costo_actual
@@ -74,24 +96,435 @@ def recocido_simulado(limites, max_iteraciones, temp_inicial, alfa):
         if costo_actual < mejor_costo:
             mejor_x, mejor_y = x, y
             mejor_costo = costo_actual
+            # Detenerse si ya se alcanzó el costo objetivo
+            if objetivo is not None and mejor_costo <= objetivo:
+                break
         
         # Enfriar la temperatura multiplicándola por el factor alfa
         temperatura *= alfa
     
     # Imprimir los parámetros utilizados
-    print(f"Parámetros del recocido simulado:\n - Temperatura inicial: {temp_inicial}\n - Factor de enfriamiento: {alfa}\n - Iteraciones máximas: {max_iteraciones}")
+    if mostrar:
+        print(f"Parámetros del recocido simulado:\n - Temperatura inicial: {temp_inicial}\n - Factor de enfriamiento: {alfa}\n - Iteraciones máximas: {max_iteraciones}")
     
     # Devolver las mejores coordenadas encontradas y el costo asociado
     return mejor_x, mejor_y, mejor_costo
 
-# Parámetros ajustados para el recocido simulado
-limites = [-5, 5]  # Límites de búsqueda
-max_iteraciones = 50000  # Mayor número de iteraciones para exploración
-temp_inicial = 10000  # Alta temperatura inicial
-alfa = 0.9995  # Enfriamiento lento
+# Recocido simulado con varias cadenas independientes vectorizadas con NumPy
+def recocido_simulado_vectorizado(limites, max_iteraciones, temp_inicial, alfa, num_cadenas=64,
+                                  tamano_bloque=1000, semilla=None):
+    """
+    Ejecuta 'num_cadenas' cadenas independientes de recocido simulado a la vez, representadas como
+    arreglos de NumPy. La propuesta de vecinos, la aceptación de Metropolis y el enfriamiento se
+    calculan para todas las cadenas en cada paso, y los números aleatorios se generan por bloques.
+
+    Parámetros:
+    limites (list): Lista con dos valores [min, max] que definen los límites del rango de búsqueda para x e y.
+    max_iteraciones (int): Número de pasos de cada cadena.
+    temp_inicial (float): Temperatura inicial (común a todas las cadenas).
+    alfa (float): Factor de enfriamiento geométrico aplicado en cada paso.
+    num_cadenas (int): Número de cadenas independientes (K).
+    tamano_bloque (int): Número de pasos cuyos números aleatorios se generan de una sola vez.
+    semilla (int): Semilla del generador de números aleatorios (opcional).
+
+    Retorna:
+    tuple: Las mejores coordenadas entre todas las cadenas (mejor_x, mejor_y) y su costo (mejor_costo).
+    """
+    rng = np.random.default_rng(semilla)
+    minimo, maximo = limites
+
+    # Estado de todas las cadenas: un punto inicial aleatorio por cadena
+    x = rng.uniform(minimo, maximo, num_cadenas)
+    y = rng.uniform(minimo, maximo, num_cadenas)
+    costo_actual = funcion_himmelblau(x, y)
+
+    # Mejor punto de cada cadena
+    mejor_x, mejor_y = x.copy(), y.copy()
+    mejor_costo = costo_actual.copy()
+
+    for inicio in range(0, max_iteraciones, tamano_bloque):
+        pasos = min(tamano_bloque, max_iteraciones - inicio)
+
+        # Números aleatorios y temperaturas de todo el bloque
+        desplazamientos = rng.uniform(-0.01, 0.01, (pasos, 2, num_cadenas))
+        uniformes = rng.random((pasos, num_cadenas))
+        temperaturas = np.maximum(temp_inicial * alfa ** np.arange(inicio, inicio + pasos), np.finfo(float).tiny)
+
+        for paso in range(pasos):
+            # Vecinos de todas las cadenas, recortados a los límites
+            x_nuevo = np.clip(x + desplazamientos[paso, 0], minimo, maximo)
+            y_nuevo = np.clip(y + desplazamientos[paso, 1], minimo, maximo)
+            nuevo_costo = funcion_himmelblau(x_nuevo, y_nuevo)
+
+            # Criterio de Metropolis; con delta <= 0 la probabilidad es 1 y siempre se acepta
+            delta_costo = nuevo_costo - costo_actual
+            aceptar = uniformes[paso] < np.exp(-np.maximum(delta_costo, 0) / temperaturas[paso])
+            x = np.where(aceptar, x_nuevo, x)
+            y = np.where(aceptar, y_nuevo, y)
+            costo_actual = np.where(aceptar, nuevo_costo, costo_actual)
+
+            # Actualizar el mejor punto de cada cadena
+            mejora = costo_actual < mejor_costo
+            mejor_x = np.where(mejora, x, mejor_x)
+            mejor_y = np.where(mejora, y, mejor_y)
+            mejor_costo = np.where(mejora, costo_actual, mejor_costo)
+
+    # Mejor estado entre todas las cadenas
+    indice = int(np.argmin(mejor_costo))
+    return float(mejor_x[indice]), float(mejor_y[indice]), float(mejor_costo[indice])
+
+# Recocido simulado con vecindad autoajustable y terminación temprana
+def recocido_simulado_adaptativo(limites, max_iteraciones, temp_inicial, alfa, funcion=funcion_himmelblau,
+                                 aceptacion_objetivo=0.44, ventana=100, temp_fria=0.01, temp_minima=1e-4,
+                                 paciencia=2000, mejora_minima=1e-12, max_reinicios=3, semilla=None):
+    """
+    Variante del recocido simulado que ajusta el ancho de la vecindad para mantener una tasa de aceptación
+    cercana a 'aceptacion_objetivo' y que deja de iterar cuando el trabajo restante ya no aporta.
+    
+    Cada 'ventana' pasos el ancho se multiplica por exp(tasa_observada - aceptacion_objetivo). Una vez que la
+    temperatura baja de 'temp_fria' (fase casi voraz), si durante 'paciencia' pasos el mejor costo no mejora en más de 'mejora_minima', la búsqueda se reinicia desde el
+    mejor punto con el ancho inicial; tras 'max_reinicios' reinicios sin mejora, o cuando la temperatura
+    cae por debajo de 'temp_minima', el algoritmo termina.
+    
+    Parámetros:
+    limites (list): Lista con dos valores [min, max] que definen los límites del rango de búsqueda para x e y.
+    max_iteraciones (int): Número máximo de iteraciones (el mismo presupuesto que el recocido original).
+    temp_inicial (float): Temperatura inicial.
+    alfa (float): Factor de enfriamiento geométrico aplicado en cada paso.
+    funcion (callable): Función objetivo f(x, y) a minimizar.
+    aceptacion_objetivo (float): Fracción de propuestas aceptadas que se busca mantener.
+    ventana (int): Pasos entre dos ajustes del ancho de la vecindad.
+    temp_fria (float): Temperatura a partir de la cual se vigila el estancamiento.
+    temp_minima (float): Temperatura por debajo de la cual se termina.
+    paciencia (int): Pasos sin mejora antes de reiniciar desde el mejor punto.
+    mejora_minima (float): Mejora del mejor costo que se considera significativa.
+    max_reinicios (int): Reinicios consecutivos sin mejora antes de terminar.
+    semilla (int): Semilla del generador de números aleatorios (opcional).
+    
+    Retorna:
+    dict: Mejor punto y costo, evaluaciones de la función, reinicios, ancho final y motivo de parada.
+    """
+    generador = random.Random(semilla)
+    ancho_inicial = 0.01
+    ancho_maximo = (limites[1] - limites[0]) / 2
+
+    x = generador.uniform(limites[0], limites[1])
+    y = generador.uniform(limites[0], limites[1])
+    costo_actual = funcion(x, y)
+    evaluaciones = 1
+    mejor_x, mejor_y, mejor_costo = x, y, costo_actual
+
+    temperatura = temp_inicial
+    ancho = ancho_inicial
+    aceptados_ventana = 0
+    pasos_sin_mejora = 0
+    reinicios = 0
+    reinicios_sin_mejora = 0
+    motivo = "iteraciones"
+
+    for i in range(1, max_iteraciones + 1):
+        x_nuevo = max(min(x + generador.uniform(-ancho, ancho), limites[1]), limites[0])
+        y_nuevo = max(min(y + generador.uniform(-ancho, ancho), limites[1]), limites[0])
+        nuevo_costo = funcion(x_nuevo, y_nuevo)
+        evaluaciones += 1
+        delta_costo = nuevo_costo - costo_actual
+
+        if delta_costo < 0 or generador.random() < math.exp(-delta_costo / temperatura):
+            x, y, costo_actual = x_nuevo, y_nuevo, nuevo_costo
+            aceptados_ventana += 1
+
+        # Actualizar la mejor solución y el contador de estancamiento
+        if costo_actual < mejor_costo - mejora_minima:
+            pasos_sin_mejora = 0
+            reinicios_sin_mejora = 0
+        elif temperatura < temp_fria:
+            # En la fase caliente es normal no mejorar; solo se cuenta en la fase fría
+            pasos_sin_mejora += 1
+        if costo_actual < mejor_costo:
+            mejor_x, mejor_y, mejor_costo = x, y, costo_actual
+
+        # Ajustar el ancho de la vecindad hacia la tasa de aceptación objetivo
+        if i % ventana == 0:
+            ancho *= math.exp(aceptados_ventana / ventana - aceptacion_objetivo)
+            ancho = min(max(ancho, 1e-12), ancho_maximo)
+            aceptados_ventana = 0
+
+        # Reiniciar desde el mejor punto si la búsqueda está estancada
+        if pasos_sin_mejora >= paciencia:
+            if reinicios_sin_mejora >= max_reinicios:
+                motivo = "estancamiento"
+                break
+            x, y, costo_actual = mejor_x, mejor_y, mejor_costo
+            ancho = ancho_inicial
+            pasos_sin_mejora = 0
+            reinicios += 1
+            reinicios_sin_mejora += 1
+
+        temperatura *= alfa
+        if temperatura < temp_minima:
+            motivo = "temperatura"
+            break
+
+    return {
+        "mejor_x": mejor_x,
+        "mejor_y": mejor_y,
+        "mejor_costo": mejor_costo,
+        "evaluaciones": evaluaciones,
+        "reinicios": reinicios,
+        "ancho_final": ancho,
+        "motivo": motivo,
+    }
+
+# Comparación de evaluaciones entre el recocido original y la variante adaptativa
+def comparar_adaptativo(repeticiones=10):
+    """
+    Ejecuta el recocido original (presupuesto fijo) y el adaptativo con los mismos parámetros e imprime
+    las evaluaciones ahorradas y la calidad de la solución de cada uno.
+    """
+    limites, max_iteraciones, temp_inicial, alfa = [-5, 5], 50000, 10000, 0.9995
+    costos_fijo, costos_adaptativo, evaluaciones = [], [], []
+    for r in range(repeticiones):
+        random.seed(r)
+        *_, costo = recocido_simulado(limites, max_iteraciones, temp_inicial, alfa, mostrar=False)
+        costos_fijo.append(costo)
+        resultado = recocido_simulado_adaptativo(limites, max_iteraciones, temp_inicial, alfa, semilla=r)
+        costos_adaptativo.append(resultado["mejor_costo"])
+        evaluaciones.append(resultado["evaluaciones"])
+
+    media_evaluaciones = sum(evaluaciones) / repeticiones
+    print(f"Recocido original:   {max_iteraciones + 1} evaluaciones, mediana del mejor costo {np.median(costos_fijo):.3e}")
+    print(f"Recocido adaptativo: {media_evaluaciones:.0f} evaluaciones de media, "
+          f"mediana del mejor costo {np.median(costos_adaptativo):.3e}")
+    print(f"Evaluaciones ahorradas: {100 * (1 - media_evaluaciones / (max_iteraciones + 1)):.1f} %")
+
+# Escalera geométrica de temperaturas para el templado paralelo
+def escalera_temperaturas(temp_min, temp_max, num_replicas):
+    """
+    Genera 'num_replicas' temperaturas espaciadas geométricamente entre temp_min y temp_max.
+    
+    Retorna:
+    list: Temperaturas ordenadas de la más fría a la más caliente.
+    """
+    if num_replicas == 1:
+        return [temp_min]
+    razon = (temp_max / temp_min) ** (1 / (num_replicas - 1))
+    return [temp_min * razon**i for i in range(num_replicas)]
+
+# Caminata de Metropolis de una réplica a temperatura fija (se ejecuta en el proceso principal o en un trabajador)
+def _segmento_replica(argumentos):
+    """
+    Avanza una réplica 'pasos' iteraciones de Metropolis a temperatura constante.
+    
+    Parámetros:
+    argumentos (tuple): (funcion, limites, x, y, costo, temperatura, ancho, pasos, semilla, objetivo).
+    
+    Retorna:
+    tuple: (x, y, costo, mejor_x, mejor_y, mejor_costo, aceptados, pasos_realizados).
+    """
+    funcion, limites, x, y, costo, temperatura, ancho, pasos, semilla, objetivo = argumentos
+    generador = random.Random(semilla)
+    mejor_x, mejor_y, mejor_costo = x, y, costo
+    aceptados = 0
+    paso = 0
+
+    for paso in range(1, pasos + 1):
+        # Vecino aleatorio dentro de los límites
+        x_nuevo = max(min(x + generador.uniform(-ancho, ancho), limites[1]), limites[0])
+        y_nuevo = max(min(y + generador.uniform(-ancho, ancho), limites[1]), limites[0])
+        nuevo_costo = funcion(x_nuevo, y_nuevo)
+        delta_costo = nuevo_costo - costo
+
+        # Criterio de Metropolis a la temperatura de la réplica
+        if delta_costo < 0 or generador.random() < math.exp(-delta_costo / temperatura):
+            x, y, costo = x_nuevo, y_nuevo, nuevo_costo
+            aceptados += 1
+            if costo < mejor_costo:
+                mejor_x, mejor_y, mejor_costo = x, y, costo
+                if objetivo is not None and mejor_costo <= objetivo:
+                    break
+
+    return x, y, costo, mejor_x, mejor_y, mejor_costo, aceptados, paso
+
+# Templado paralelo (intercambio de réplicas)
+def templado_paralelo(limites, max_iteraciones, temperaturas, funcion=funcion_himmelblau, intervalo_intercambio=100,
+                      paso=0.01, procesos=1, objetivo=None, semilla=None):
+    """
+    Minimiza 'funcion' con templado paralelo: una réplica por temperatura de la escalera, cada una con su
+    propia caminata de Metropolis, y cada 'intervalo_intercambio' pasos se intenta intercambiar el estado
+    de réplicas vecinas (pares pares e impares de forma alternada).
+    
+    Parámetros:
+    limites (list): Lista con dos valores [min, max] que definen los límites del rango de búsqueda para x e y.
+    max_iteraciones (int): Número de pasos de cada réplica.
+    temperaturas (list): Escalera de temperaturas, de la más fría a la más caliente (ver escalera_temperaturas).
+    funcion (callable): Función objetivo f(x, y) a minimizar.
+    intervalo_intercambio (int): Pasos de cada réplica entre dos rondas de intercambio.
+    paso (float): Ancho de la propuesta en la réplica más fría; crece con la raíz de la temperatura.
+    procesos (int): Si es mayor que 1, los segmentos de las réplicas se reparten en un grupo de procesos.
+    objetivo (float): Si se indica, se detiene al terminar la ronda en la que el mejor costo lo alcanza.
+    semilla (int): Semilla del generador de números aleatorios (opcional).
+    
+    Retorna:
+    dict: Mejor punto y costo, tasas de intercambio por par de vecinos, tasas de aceptación por réplica,
+          evaluaciones realizadas y, si se alcanzó el objetivo, el tiempo y las evaluaciones necesarias.
+    """
+    generador = random.Random(semilla)
+    num_replicas = len(temperaturas)
+    rango = limites[1] - limites[0]
+    # Las réplicas calientes proponen saltos más largos para cruzar entre cuencas
+    anchos = [min(paso * math.sqrt(t / temperaturas[0]), rango / 2) for t in temperaturas]
+
+    # Estado de cada posición de la escalera: [x, y, costo]
+    estados = []
+    for _ in range(num_replicas):
+        x = generador.uniform(limites[0], limites[1])
+        y = generador.uniform(limites[0], limites[1])
+        estados.append([x, y, funcion(x, y)])
+    mejor_costo = min(e[2] for e in estados)
+    mejor_x, mejor_y = next((e[0], e[1]) for e in estados if e[2] == mejor_costo)
+
+    intentos = [0] * (num_replicas - 1)
+    intercambios = [0] * (num_replicas - 1)
+    aceptados = [0] * num_replicas
+    propuestas = [0] * num_replicas  # Pasos que cada réplica ejecutó de verdad (un segmento puede cortarse antes)
+    evaluaciones = num_replicas
+    tiempo_objetivo = evaluaciones_objetivo = None
+
+    grupo = multiprocessing.Pool(procesos) if procesos > 1 else None
+    inicio = time.perf_counter()
+    try:
+        ronda = 0
+        pasos_hechos = 0
+        while pasos_hechos < max_iteraciones:
+            pasos = min(intervalo_intercambio, max_iteraciones - pasos_hechos)
+            tareas = [(funcion, limites, e[0], e[1], e[2], t, a, pasos, generador.getrandbits(32), objetivo)
+                      for e, t, a in zip(estados, temperaturas, anchos)]
+            resultados = grupo.map(_segmento_replica, tareas) if grupo else list(map(_segmento_replica, tareas))
+            pasos_hechos += pasos
+
+            for k, (x, y, costo, bx, by, bc, acept, realizados) in enumerate(resultados):
+                estados[k] = [x, y, costo]
+                aceptados[k] += acept
+                propuestas[k] += realizados
+                evaluaciones += realizados
+                if bc < mejor_costo:
+                    mejor_x, mejor_y, mejor_costo = bx, by, bc
+
+            if objetivo is not None and mejor_costo <= objetivo:
+                tiempo_objetivo = time.perf_counter() - inicio
+                evaluaciones_objetivo = evaluaciones
+                break
+
+            # Intentos de intercambio entre vecinos (i, i+1), alternando pares pares e impares
+            for i in range(ronda % 2, num_replicas - 1, 2):
+                intentos[i] += 1
+                delta = (1 / temperaturas[i] - 1 / temperaturas[i + 1]) * (estados[i][2] - estados[i + 1][2])
+                if delta >= 0 or generador.random() < math.exp(delta):
+                    estados[i], estados[i + 1] = estados[i + 1], estados[i]
+                    intercambios[i] += 1
+            ronda += 1
+    finally:
+        if grupo:
+            grupo.close()
+            grupo.join()
+
+    return {
+        "mejor_x": mejor_x,
+        "mejor_y": mejor_y,
+        "mejor_costo": mejor_costo,
+        "tasas_intercambio": [c / n if n else 0.0 for c, n in zip(intercambios, intentos)],
+        "tasas_aceptacion": [a / n if n else 0.0 for a, n in zip(aceptados, propuestas)],
+        "evaluaciones": evaluaciones,
+        "tiempo_objetivo": tiempo_objetivo,
+        "evaluaciones_objetivo": evaluaciones_objetivo,
+    }
+
+# Comparación del templado paralelo contra el recocido simulado simple
+def comparar_templado(objetivo=1e-4, repeticiones=5, procesos=1):
+    """
+    Mide el tiempo hasta alcanzar 'objetivo' del recocido simulado original y del templado paralelo en las
+    funciones de Himmelblau y Rastrigin, e imprime las tasas de intercambio del templado.
+    """
+    problemas = [("Himmelblau", funcion_himmelblau, [-5, 5]), ("Rastrigin", funcion_rastrigin, [-5.12, 5.12])]
+    temperaturas = escalera_temperaturas(0.01, 100, 8)
+
+    for nombre, funcion, limites in problemas:
+        print(f"\n{nombre} (objetivo: costo <= {objetivo}, {repeticiones} repeticiones)")
+        for metodo in ["recocido", "templado"]:
+            tiempos, exitos, tasas = [], 0, []
+            for r in range(repeticiones):
+                inicio = time.perf_counter()
+                if metodo == "recocido":
+                    random.seed(r)
+                    *_, costo = recocido_simulado(limites, 50000, 10000, 0.9995, funcion=funcion,
+                                                  objetivo=objetivo, mostrar=False)
+                else:
+                    resultado = templado_paralelo(limites, 50000 // len(temperaturas), temperaturas, funcion=funcion,
+                                                  procesos=procesos, objetivo=objetivo, semilla=r)
+                    costo = resultado["mejor_costo"]
+                    tasas.append(resultado["tasas_intercambio"])
+                if costo <= objetivo:
+                    exitos += 1
+                    tiempos.append(time.perf_counter() - inicio)
+            tiempo_medio = f"{sum(tiempos) / len(tiempos):.3f} s" if tiempos else "-"
+            print(f"  {metodo:<9} éxitos: {exitos}/{repeticiones}  tiempo medio hasta el objetivo: {tiempo_medio}")
+            if tasas:
+                medias = [sum(t[i] for t in tasas) / len(tasas) for i in range(len(temperaturas) - 1)]
+                print("  tasas de intercambio entre vecinos: " + ", ".join(f"{m:.2f}" for m in medias))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recocido simulado sobre la función de Himmelblau.")
+    parser.add_argument("--modo", choices=["simple", "vectorizado", "templado", "comparar_templado", "adaptativo",
+                                           "comparar_adaptativo"], default="simple",
+                        help="simple: una cadena (versión original); vectorizado: K cadenas con NumPy; "
+                             "templado: intercambio de réplicas; comparar_templado: templado contra recocido; "
+                             "adaptativo: vecindad autoajustable con terminación temprana; "
+                             "comparar_adaptativo: evaluaciones ahorradas por la variante adaptativa")
+    parser.add_argument("--cadenas", type=int, default=64, help="Número de cadenas del modo vectorizado")
+    parser.add_argument("--replicas", type=int, default=8, help="Número de réplicas del templado paralelo")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos para repartir las réplicas del templado")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    # Parámetros ajustados para el recocido simulado
+    limites = [-5, 5]  # Límites de búsqueda
+    max_iteraciones = 50000  # Mayor número de iteraciones para exploración
+    temp_inicial = 10000  # Alta temperatura inicial
+    alfa = 0.9995  # Enfriamiento lento
+
+    if args.modo == "comparar_templado":
+        comparar_templado(procesos=args.procesos)
+        raise SystemExit
+    if args.modo == "comparar_adaptativo":
+        comparar_adaptativo()
+        raise SystemExit
 
-# Ejecutar el algoritmo de recocido simulado
-mejor_x, mejor_y, mejor_costo = recocido_simulado(limites, max_iteraciones, temp_inicial, alfa)
+    inicio = time.perf_counter()
+    if args.modo == "simple":
+        # Ejecutar el algoritmo de recocido simulado
+        random.seed(args.semilla)
+        mejor_x, mejor_y, mejor_costo = recocido_simulado(limites, max_iteraciones, temp_inicial, alfa)
+        pasos_totales = max_iteraciones
+    elif args.modo == "templado":
+        # Mismo presupuesto total de evaluaciones, repartido entre las réplicas
+        temperaturas = escalera_temperaturas(0.01, 100, args.replicas)
+        resultado = templado_paralelo(limites, max_iteraciones // args.replicas, temperaturas,
+                                      procesos=args.procesos, semilla=args.semilla)
+        mejor_x, mejor_y, mejor_costo = resultado["mejor_x"], resultado["mejor_y"], resultado["mejor_costo"]
+        pasos_totales = resultado["evaluaciones"]
+        print("Tasas de intercambio entre vecinos: " + ", ".join(f"{t:.2f}" for t in resultado["tasas_intercambio"]))
+    elif args.modo == "adaptativo":
+        resultado = recocido_simulado_adaptativo(limites, max_iteraciones, temp_inicial, alfa, semilla=args.semilla)
+        mejor_x, mejor_y, mejor_costo = resultado["mejor_x"], resultado["mejor_y"], resultado["mejor_costo"]
+        pasos_totales = resultado["evaluaciones"]
+        print(f"Terminó por {resultado['motivo']} tras {resultado['evaluaciones']} evaluaciones "
+              f"({resultado['reinicios']} reinicios)")
+    else:
+        mejor_x, mejor_y, mejor_costo = recocido_simulado_vectorizado(limites, max_iteraciones, temp_inicial, alfa,
+                                                                     num_cadenas=args.cadenas, semilla=args.semilla)
+        pasos_totales = max_iteraciones * args.cadenas
+    duracion = time.perf_counter() - inicio
 
-print(f"Los valores mínimos encontrados son: x = {mejor_x}, y = {mejor_y}")
-print(f"El valor mínimo de la función es: {mejor_costo}")
+    print(f"Los valores mínimos encontrados son: x = {mejor_x}, y = {mejor_y}")
+    print(f"El valor mínimo de la función es: {mejor_costo}")
+    print(f"Rendimiento: {pasos_totales / duracion:,.0f} pasos de cadena por segundo ({duracion:.2f} s)")
@@ -1,5 +1,15 @@
 import tkinter as tk
 import math
+import queue
+import random
+import threading
+import time
+import os
+from mcts_gato import MotorMCTS
+from motor_gato import MotorGato, desde_tablero
+from motor_nk import MotorNK, obtener_geometria
+from motor_nk import desde_tablero as desde_tablero_nk
+from tablebase_gato import RUTA_PREDETERMINADA, TablaFinal
 
 # Constantes del juego
 JUGADOR = 'X'  # Símbolo del jugador humano
@@ -9,19 +19,161 @@ VACIO = '.'    # Símbolo que representa una casilla vacía en el tablero
 # Profundidad máxima permitida para el algoritmo Minimax
 PROFUNDIDAD_MAX = 4  # Se ha reducido para acelerar el tiempo de respuesta
 
+# Tiempo de búsqueda por jugada (segundos); la interfaz usa profundización iterativa con este límite
+TIEMPO_POR_JUGADA = 1.0
+
+# Intervalo (ms) con el que la interfaz revisa si la IA ya respondió; menor que un cuadro de 60 Hz
+INTERVALO_REVISION = 15
+
+# ------------------- Trabajador de la IA ------------------- #
+
+class TrabajadorIA:
+    """
+    Ejecuta las búsquedas de la IA en un hilo aparte para que la ventana no se congele.
+    Las solicitudes llegan por una cola y los resultados se devuelven por otra, que la interfaz
+    vacía desde el bucle de Tk. Cada solicitud lleva la generación vigente: cancelar() la incrementa
+    y detiene la búsqueda en curso, de modo que los resultados atrasados se descartan.
+    El motor solo se usa desde el hilo del trabajador. Mientras busca, el hilo cede el GIL cada
+    5 ms (sys.getswitchinterval), así que la ventana sigue atendiendo eventos dentro de un cuadro.
+    Con el algoritmo "Minimax", si existe el archivo de tablas de finales (python tablebase_gato.py
+    generar), la jugada se obtiene de él con juego perfecto en lugar de buscarla. Con "MCTS" se usa
+    la búsqueda Monte Carlo de mcts_gato.py con el mismo tiempo por jugada. En tableros distintos
+    de 4x4 con 4 en línea siempre se usa MotorNK con profundización iterativa (la interfaz
+    deshabilita ahí la opción MCTS del menú).
+    Con 'meditar', después de cada búsqueda de profundización iterativa el hilo sigue trabajando
+    mientras el humano piensa: busca la respuesta a cada jugada posible del humano (primero la que
+    predijo la variante principal) y la guarda en 'meditadas'; si el humano juega una de ellas,
+    la respuesta sale de inmediato.
+    """
+
+    def __init__(self, tiempo_por_jugada, tamaño=4, k=4, meditar=True):
+        self.tiempo_por_jugada = tiempo_por_jugada
+        self.algoritmo = "Minimax"
+        self.general = (tamaño, k) != (4, 4)
+        self.geometria = obtener_geometria(tamaño, k)
+        self.motor = MotorNK(tamaño, k) if self.general else MotorGato(usar_tabla=True)
+        self.motor_mcts = MotorMCTS()
+        self.tablas = TablaFinal() if os.path.exists(RUTA_PREDETERMINADA) and not self.general else None
+        self.solicitudes = queue.Queue()
+        self.resultados = queue.Queue()
+        self.generacion = 0
+        self.meditar = meditar
+        self.meditadas = {}     # (generación, ia, jugador) -> (fila, columna) calculada durante el turno del humano
+        self.meditando = None   # Posición (generación, ia, jugador) que se está meditando
+        self.aciertos_meditacion = 0
+        self.cerrojo = threading.Lock()  # Ordena solicitar() con el inicio y el fin de cada meditación
+        self.hilo = threading.Thread(target=self.ejecutar, daemon=True)
+        self.hilo.start()
+
+    def posicion(self, tablero):
+        """Máscaras (ia, jugador) del tablero para el motor del trabajador."""
+        return desde_tablero_nk(tablero, IA, JUGADOR) if self.general else desde_tablero(tablero, IA, JUGADOR)
+
+    def solicitar(self, tablero):
+        """
+        Encola una búsqueda sobre una copia del tablero con el algoritmo seleccionado. Si el hilo está
+        meditando otra posición, la detiene; si medita justo esta, la deja terminar.
+        """
+        copia = [fila[:] for fila in tablero]
+        with self.cerrojo:
+            self.solicitudes.put((self.generacion, self.algoritmo, copia))
+            if self.meditando is not None and self.meditando != (self.generacion, *self.posicion(copia)):
+                self.motor.cancelar()
+
+    def cancelar(self):
+        """Invalida las solicitudes pendientes y detiene la búsqueda en curso."""
+        self.generacion += 1
+        self.motor.cancelar()
+        self.motor_mcts.cancelar()
+
+    def ejecutar(self):
+        """Bucle del hilo: atiende solicitudes y publica (generación, fila, columna) en la cola de resultados."""
+        while True:
+            generacion, algoritmo, tablero = self.solicitudes.get()
+            # Limpiar la cancelación antes de comprobar la generación: si cancelar() llega después,
+            # el indicador queda activo y la búsqueda se interrumpe
+            self.motor.reanudar()
+            self.motor_mcts.reanudar()
+            if generacion != self.generacion:
+                continue  # Solicitud de una partida ya reiniciada
+            if algoritmo == "MCTS" and not self.general:
+                ia, jugador = desde_tablero(tablero, IA, JUGADOR)
+                fila, columna = self.motor_mcts.mejor_movimiento(ia, jugador, tiempo_limite=self.tiempo_por_jugada)
+            elif self.tablas is not None:
+                x, o = desde_tablero(tablero, JUGADOR, IA)  # Máscaras del primer y segundo jugador
+                fila, columna = self.tablas.mejor_movimiento(x, o)
+            else:
+                # Profundización iterativa (MotorGato, o MotorNK en otros tableros)
+                ia, jugador = self.posicion(tablero)
+                fila, columna = self.buscar_o_recordar(generacion, ia, jugador)
+                self.resultados.put((generacion, fila, columna))
+                if self.meditar and fila >= 0:
+                    self.meditar_respuestas(generacion, ia | 1 << (fila * self.geometria.tamaño + columna), jugador)
+                continue
+            self.resultados.put((generacion, fila, columna))
+
+    def buscar_o_recordar(self, generacion, ia, jugador):
+        """
+        Jugada de la IA para la posición: la meditada durante el turno del humano si existe, si no una
+        profundización iterativa con el tiempo por jugada. Las meditaciones del turno anterior se descartan.
+        """
+        jugada = self.meditadas.get((generacion, ia, jugador))
+        self.meditadas.clear()
+        if jugada is not None:
+            self.aciertos_meditacion += 1
+            return jugada
+        return self.motor.mejor_movimiento_iterativo(ia, jugador, self.tiempo_por_jugada)
+
+    def meditar_respuestas(self, generacion, ia, jugador):
+        """
+        Mientras el humano piensa, busca la respuesta de la IA a cada jugada posible suya, empezando por
+        la que predijo la variante principal, con el mismo tiempo que una jugada normal. Se detiene en
+        cuanto llega una solicitud (salvo que sea justo la posición que está buscando) o se reinicia la partida.
+        """
+        geometria = self.geometria
+        if geometria.gana(ia) or ia | jugador == geometria.lleno:
+            return
+        variante = self.motor.variante
+        prediccion = variante[1] if len(variante) > 1 else 0
+        vacias = geometria.lleno & ~(ia | jugador)
+        candidatas = [1 << c for c in range(geometria.casillas) if vacias >> c & 1 and 1 << c != prediccion]
+        if prediccion & vacias:
+            candidatas.insert(0, prediccion)
+        for bit in candidatas:
+            respuesta = jugador | bit
+            if geometria.gana(respuesta) or ia | respuesta == geometria.lleno:
+                continue  # Partida terminada: no hay jugada de la IA que preparar
+            clave = (generacion, ia, respuesta)
+            with self.cerrojo:
+                if not self.solicitudes.empty() or generacion != self.generacion:
+                    return
+                self.meditando = clave
+            jugada = self.motor.mejor_movimiento_iterativo(ia, respuesta, self.tiempo_por_jugada)
+            with self.cerrojo:
+                self.meditando = None
+                completa = not self.motor.cancelado
+            if not completa:
+                return
+            self.meditadas[clave] = jugada
+
 # ------------------- Clase Principal del Juego ------------------- #
 
 class JuegoGato4x4:
     """Clase principal que implementa la interfaz gráfica y la lógica del juego del gato 4x4."""
 
-    def __init__(self, root):
-        """Inicializa el tablero, los botones, el modo de juego y la interfaz gráfica."""
+    def __init__(self, root, tamaño=4, k=4):
+        """
+        Inicializa el tablero, los botones, el modo de juego y la interfaz gráfica.
+        'tamaño' y 'k' permiten jugar en tableros N×N ganando con k en línea (por defecto 4x4 con 4).
+        """
         self.root = root
-        self.root.title("Gato 4x4")
+        self.tamaño = tamaño
+        self.geometria = obtener_geometria(tamaño, k)
+        self.root.title(f"Gato {tamaño}x{tamaño}" + (f" ({k} en línea)" if k != tamaño else ""))
 
-        # Crear el tablero 4x4 vacío
-        self.tablero = crear_tablero()  # Inicializa el tablero con posiciones vacías
-        self.botones = [[None for _ in range(4)] for _ in range(4)]  # Matriz para los botones
+        # Crear el tablero vacío
+        self.tablero = crear_tablero(self.tamaño)  # Inicializa el tablero con posiciones vacías
+        self.botones = [[None for _ in range(self.tamaño)] for _ in range(self.tamaño)]  # Matriz para los botones
         self.turno_humano = True  # El jugador humano comienza el juego
 
         # Crear la cuadrícula de botones que representan el tablero en la GUI
@@ -29,7 +181,7 @@ class JuegoGato4x4:
 
         # Etiqueta para mostrar mensajes sobre el estado del juego (quién tiene el turno o si alguien ganó)
         self.mensaje = tk.Label(self.root, text="Turno del Jugador X", font=("Helvetica", 16))
-        self.mensaje.grid(row=4, column=0, columnspan=4)
+        self.mensaje.grid(row=self.tamaño, column=0, columnspan=self.tamaño)
 
         # Variable que indica el modo de juego actual
         self.modo_juego = "Humano vs Humano"  # Modo de juego predeterminado
@@ -37,16 +189,27 @@ class JuegoGato4x4:
         # Crear el menú para seleccionar los modos de juego
         self.crear_menu()
 
+        # La IA busca en segundo plano; la interfaz revisa periódicamente si ya respondió
+        self.trabajador = TrabajadorIA(TIEMPO_POR_JUGADA, tamaño, k)
+        self.pendiente = None  # Identificador del próximo turno IA vs IA programado con after
+        self.root.after(INTERVALO_REVISION, self.revisar_ia)
+
     def crear_cuadricula(self):
         """Crea una cuadrícula de botones que representan el tablero en la interfaz gráfica."""
-        for i in range(4):
-            for j in range(4):
+        for i in range(self.tamaño):
+            for j in range(self.tamaño):
                 # Cada botón representa una celda en el tablero y se coloca en la cuadrícula
                 boton = tk.Button(self.root, text="", font=("Helvetica", 20), width=5, height=2,
                                   command=lambda i=i, j=j: self.click_boton(i, j))  # Al hacer clic, llama a click_boton
                 boton.grid(row=i, column=j)
                 self.botones[i][j] = boton  # Guarda el botón en la matriz
 
+    def hay_ganador(self, simbolo):
+        """Verifica si 'simbolo' tiene k en línea en el tablero actual (cualquier tamaño)."""
+        otro = IA if simbolo == JUGADOR else JUGADOR
+        mascara, _ = desde_tablero_nk(self.tablero, simbolo, otro)
+        return self.geometria.gana(mascara)
+
     def click_boton(self, i, j):
         """
         Maneja el evento de click en los botones del tablero. El jugador humano marca una casilla
@@ -75,10 +238,10 @@ class JuegoGato4x4:
                     self.root.after(500, self.turno_ia)  # Retraso de 0.5s para simular respuesta de la IA
 
         # Después del movimiento, verifica si hay un ganador o empate
-        if hay_ganador(self.tablero, JUGADOR):
+        if self.hay_ganador(JUGADOR):
             self.mensaje.config(text="¡Jugador X ha ganado!")
             self.deshabilitar_botones()  # Bloquea el tablero
-        elif hay_ganador(self.tablero, IA):
+        elif self.hay_ganador(IA):
             self.mensaje.config(text="¡Jugador O ha ganado!" if self.modo_juego == "Humano vs Humano" else "¡La IA ha ganado!")
             self.deshabilitar_botones()
         elif es_tablero_lleno(self.tablero):
@@ -87,18 +250,37 @@ class JuegoGato4x4:
 
     def turno_ia(self):
         """
-        Realiza el turno de la IA utilizando el algoritmo Minimax con poda Alfa-Beta.
-        La IA selecciona el mejor movimiento disponible.
+        Pide al trabajador el movimiento de la IA (Minimax con poda Alfa-Beta en segundo plano).
+        La jugada se aplica en aplicar_movimiento_ia cuando llega el resultado.
         """
-        if self.modo_juego == "Humano vs IA" and not self.turno_humano:
-            fila, columna = mejor_movimiento(self.tablero, PROFUNDIDAD_MAX)  # IA elige su movimiento
+        if self.modo_juego == "Humano vs IA" and not self.turno_humano and not self.hay_ganador(JUGADOR):
+            self.trabajador.solicitar(self.tablero)
+
+    def revisar_ia(self):
+        """Vacía la cola de resultados del trabajador desde el bucle de Tk y se vuelve a programar."""
+        try:
+            while True:
+                generacion, fila, columna = self.trabajador.resultados.get_nowait()
+                if generacion != self.trabajador.generacion:
+                    continue  # Resultado de una partida ya reiniciada
+                if self.modo_juego == "Humano vs IA":
+                    self.aplicar_movimiento_ia(fila, columna)
+                elif self.modo_juego == "IA vs IA":
+                    self.aplicar_movimiento_ia_vs_ia(fila, columna)
+        except queue.Empty:
+            pass
+        self.root.after(INTERVALO_REVISION, self.revisar_ia)
+
+    def aplicar_movimiento_ia(self, fila, columna):
+        """Aplica el movimiento elegido por la IA en el modo Humano vs IA."""
+        if not self.turno_humano:
             self.tablero[fila][columna] = IA
             self.botones[fila][columna].config(text=IA)
             self.turno_humano = True  # Después del turno, vuelve a ser turno del humano
             self.mensaje.config(text="Turno del Jugador")
 
         # Después del movimiento, verifica si hay un ganador o empate
-        if hay_ganador(self.tablero, IA):
+        if self.hay_ganador(IA):
             self.mensaje.config(text="¡La IA ha ganado!")
             self.deshabilitar_botones()
         elif es_tablero_lleno(self.tablero):
@@ -113,9 +295,14 @@ class JuegoGato4x4:
 
     def reiniciar_juego(self):
         """Reinicia el tablero y habilita los botones para empezar un nuevo juego."""
-        self.tablero = crear_tablero()  # Resetea el tablero
-        for i in range(4):
-            for j in range(4):
+        # Cancelar la búsqueda en curso y el próximo turno IA vs IA programado
+        self.trabajador.cancelar()
+        if self.pendiente is not None:
+            self.root.after_cancel(self.pendiente)
+            self.pendiente = None
+        self.tablero = crear_tablero(self.tamaño)  # Resetea el tablero
+        for i in range(self.tamaño):
+            for j in range(self.tamaño):
                 self.botones[i][j].config(text="", state=tk.NORMAL)  # Resetea cada botón
         self.mensaje.config(text="Turno del Jugador X")  # El jugador X empieza de nuevo
         self.turno_humano = True
@@ -133,10 +320,25 @@ class JuegoGato4x4:
         opciones_menu.add_command(label="Humano vs IA", command=self.modo_humano_vs_ia)
         opciones_menu.add_command(label="IA vs IA", command=self.modo_ia_vs_ia)
         opciones_menu.add_separator()
+        # Algoritmo de la IA; el cambio se aplica desde la siguiente jugada
+        self.algoritmo = tk.StringVar(value="Minimax")
+        algoritmo_menu = tk.Menu(opciones_menu, tearoff=0)
+        opciones_menu.add_cascade(label="Algoritmo de la IA", menu=algoritmo_menu)
+        for nombre in ("Minimax", "MCTS"):
+            algoritmo_menu.add_radiobutton(label=nombre, value=nombre, variable=self.algoritmo,
+                                           command=self.cambiar_algoritmo)
+        # MCTS (mcts_gato.py) solo sabe jugar 4x4 con 4 en línea; en otros tableros queda deshabilitado
+        if (self.tamaño, self.geometria.k) != (4, 4):
+            algoritmo_menu.entryconfig("MCTS", label="MCTS (solo 4x4)", state=tk.DISABLED)
+        opciones_menu.add_separator()
         # Opciones para reiniciar el juego o salir
         opciones_menu.add_command(label="Reiniciar Juego", command=self.reiniciar_juego)
         opciones_menu.add_command(label="Salir", command=self.root.quit)
 
+    def cambiar_algoritmo(self):
+        """Indica al trabajador el algoritmo elegido en el menú."""
+        self.trabajador.algoritmo = self.algoritmo.get()
+
     def modo_humano_vs_humano(self):
         """Configura el modo de juego Humano vs Humano."""
         self.modo_juego = "Humano vs Humano"
@@ -152,19 +354,24 @@ class JuegoGato4x4:
         self.modo_juego = "IA vs IA"
         self.reiniciar_juego()
         self.mensaje.config(text="Turno de la IA X")
-        self.root.after(500, self.turno_ia_vs_ia)  # Inicia el juego entre dos IAs
+        self.pendiente = self.root.after(500, self.turno_ia_vs_ia)  # Inicia el juego entre dos IAs
 
     def turno_ia_vs_ia(self):
-        """Realiza los turnos alternativos entre dos IAs jugando entre sí."""
-        if not hay_ganador(self.tablero, JUGADOR) and not hay_ganador(self.tablero, IA) and not es_tablero_lleno(self.tablero):
-            fila, columna = mejor_movimiento(self.tablero, PROFUNDIDAD_MAX)
+        """Pide al trabajador el siguiente movimiento de la partida entre dos IAs."""
+        self.pendiente = None
+        if not self.hay_ganador(JUGADOR) and not self.hay_ganador(IA) and not es_tablero_lleno(self.tablero):
+            self.trabajador.solicitar(self.tablero)
+
+    def aplicar_movimiento_ia_vs_ia(self, fila, columna):
+        """Aplica el movimiento recibido y programa el turno de la otra IA."""
+        if not self.hay_ganador(JUGADOR) and not self.hay_ganador(IA) and not es_tablero_lleno(self.tablero):
             jugador_actual = JUGADOR if self.turno_humano else IA  # Alterna el turno entre las dos IAs
             self.tablero[fila][columna] = jugador_actual
             self.botones[fila][columna].config(text=jugador_actual)
             self.turno_humano = not self.turno_humano
 
             # Verificar el estado del juego después del turno de la IA
-            if hay_ganador(self.tablero, jugador_actual):
+            if self.hay_ganador(jugador_actual):
                 self.mensaje.config(text=f"¡La IA {jugador_actual} ha ganado!")
                 self.deshabilitar_botones()
             elif es_tablero_lleno(self.tablero):
@@ -173,13 +380,13 @@ class JuegoGato4x4:
             else:
                 siguiente_jugador = "IA X" if self.turno_humano else "IA O"
                 self.mensaje.config(text=f"Turno de la {siguiente_jugador}")
-                self.root.after(500, self.turno_ia_vs_ia)  # Continua el ciclo
+                self.pendiente = self.root.after(500, self.turno_ia_vs_ia)  # Continua el ciclo
 
 # ------------------- Funciones de Lógica del Juego ------------------- #
 
-def crear_tablero():
-    """Crea un tablero vacío de 4x4, representado por una lista de listas."""
-    return [[VACIO for _ in range(4)] for _ in range(4)]  # Inicializa un tablero vacío
+def crear_tablero(tamaño=4):
+    """Crea un tablero vacío de tamaño×tamaño (4x4 por defecto), representado por una lista de listas."""
+    return [[VACIO for _ in range(tamaño)] for _ in range(tamaño)]  # Inicializa un tablero vacío
 
 def hay_ganador(tablero, jugador):
     """
@@ -274,8 +481,32 @@ def minimax(tablero, profundidad, es_max, alpha, beta):
                         break
         return min_eval
 
+# Motores de bitboards (ver motor_gato.py): uno de profundidad fija y otro, con tabla de
+# transposición, para la profundización iterativa que usa la interfaz
+motor = MotorGato()
+motor_iterativo = MotorGato(usar_tabla=True)
+
 # Encuentra el mejor movimiento para la IA
 def mejor_movimiento(tablero, profundidad):
+    """
+    Encuentra el mejor movimiento posible para la IA usando Minimax con Poda Alfa-Beta.
+    Convierte el tablero a bitboards y delega la búsqueda en el motor de motor_gato.py,
+    que devuelve el mismo movimiento que mejor_movimiento_listas.
+    """
+    ia, jugador = desde_tablero(tablero, IA, JUGADOR)
+    return motor.mejor_movimiento(ia, jugador, profundidad)
+
+# Mejor movimiento con profundización iterativa y límite de tiempo
+def mejor_movimiento_iterativo(tablero, tiempo_limite):
+    """
+    Profundiza la búsqueda (0, 1, 2, ...) hasta agotar 'tiempo_limite' segundos y devuelve el mejor
+    movimiento de la última profundidad completada.
+    """
+    ia, jugador = desde_tablero(tablero, IA, JUGADOR)
+    return motor_iterativo.mejor_movimiento_iterativo(ia, jugador, tiempo_limite)
+
+# Versión original sobre listas, conservada como referencia para comparar los motores
+def mejor_movimiento_listas(tablero, profundidad):
     """Encuentra el mejor movimiento posible para la IA usando Minimax con Poda Alfa-Beta."""
     mejor_valor = -math.inf
     mejor_mov = (-1, -1)  # Coordenadas iniciales del mejor movimiento
@@ -290,9 +521,67 @@ def mejor_movimiento(tablero, profundidad):
                     mejor_mov = (i, j)
     return mejor_mov
 
+# ------------------- Medición de la meditación ------------------- #
+
+def medir_meditacion(partidas=3, tiempo=0.3, pensar=1.5, semilla=0):
+    """
+    Juega partidas sin interfaz entre el trabajador de la IA y un humano simulado que piensa 'pensar'
+    segundos antes de cada jugada, con y sin meditación, y reporta el tiempo que el humano espera la
+    respuesta de la IA (desde solicitar() hasta el resultado). El humano simulado juega con minimax a
+    profundidad 2 o al azar.
+    """
+    humano = MotorGato()
+    print(f"{'Humano':<14} {'Meditación':<11} {'Jugadas':>8} {'Media (ms)':>11} {'p50 (ms)':>9} {'Máx (ms)':>9} {'Aciertos':>9}")
+    for estilo in ("profundidad 2", "azar"):
+        for meditar in (False, True):
+            trabajador = TrabajadorIA(tiempo, meditar=meditar)
+            generador = random.Random(semilla)
+            esperas = []
+            for _ in range(partidas):
+                trabajador.cancelar()
+                tablero = crear_tablero()
+                while True:
+                    time.sleep(pensar)  # El humano piensa; el trabajador medita si puede
+                    ia, jugador = desde_tablero(tablero, IA, JUGADOR)
+                    if estilo == "azar":
+                        fila, columna = generador.choice([(i, j) for i in range(4) for j in range(4)
+                                                          if tablero[i][j] == VACIO])
+                    else:
+                        fila, columna = humano.mejor_movimiento(jugador, ia, 2)
+                    tablero[fila][columna] = JUGADOR
+                    if hay_ganador(tablero, JUGADOR) or es_tablero_lleno(tablero):
+                        break
+                    inicio = time.perf_counter()
+                    trabajador.solicitar(tablero)
+                    _, fila, columna = trabajador.resultados.get()
+                    esperas.append(time.perf_counter() - inicio)
+                    tablero[fila][columna] = IA
+                    if hay_ganador(tablero, IA) or es_tablero_lleno(tablero):
+                        break
+            trabajador.cancelar()
+            ordenadas = sorted(esperas)
+            print(f"{estilo:<14} {'sí' if meditar else 'no':<11} {len(esperas):>8} "
+                  f"{sum(esperas) / len(esperas) * 1e3:>11.1f} {ordenadas[len(ordenadas) // 2] * 1e3:>9.1f} "
+                  f"{ordenadas[-1] * 1e3:>9.1f} {trabajador.aciertos_meditacion:>9}")
+
 # ------------------- EJECUCIÓN DEL PROGRAMA ------------------- #
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gato con interfaz gráfica (4x4 con 4 en línea por defecto).")
+    parser.add_argument("--tamaño", type=int, default=4, help="Lado del tablero N")
+    parser.add_argument("--k", type=int, default=None, help="Fichas en línea para ganar (por defecto N)")
+    parser.add_argument("--medir-meditacion", action="store_true",
+                        help="Sin interfaz: mide el tiempo de respuesta de la IA con y sin meditación")
+    args = parser.parse_args()
+    if args.medir_meditacion:
+        medir_meditacion()
+        raise SystemExit
+    k = args.k if args.k is not None else args.tamaño
+    if not 2 <= k <= args.tamaño:
+        parser.error("Se necesita 2 <= k <= N")
+
     root = tk.Tk()  # Crear la ventana principal
-    juego = JuegoGato4x4(root)  # Crear el objeto de juego
+    juego = JuegoGato4x4(root, args.tamaño, k)  # Crear el objeto de juego
     root.mainloop()  # Iniciar el loop de la ventana
@@ -1,33 +1,22 @@
+import argparse
+import queue
 import socket
-import pickle
 import tkinter as tk
 from tkinter import messagebox
 import threading
 
+from protocolo_gato import (ASIGNACION, CONTRA_HUMANO, CONTRA_IA, DESPEDIDA, EMPATE, LADO_O, LADO_X, MODO,
+                            MOVIMIENTO, OBSERVAR, PARTIDA, RESULTADO, REVANCHA, TABLERO, ConexionCerrada,
+                            desde_mascaras, enviar_mensaje, recibir_mensaje)
+
 # --- Configuración general ---
 # Definición de los jugadores y casillas vacías
 JUGADOR_X = "X"  # Jugador X
 JUGADOR_O = "O"  # Jugador O
 VACIO = ""       # Casilla vacía
 TAMAÑO = 4       # Tamaño del tablero (4x4)
-
-def recibir_datos(socket):
-    """
-    Recibe y deserializa datos a través del socket.
-    :param socket: El socket desde el cual se reciben los datos.
-    :return: Los datos deserializados.
-    """
-    datos_serializados = socket.recv(1024)  # Recibe datos del socket (máximo 1024 bytes)
-    return pickle.loads(datos_serializados)  # Deserializa los datos usando pickle
-
-def enviar_datos(socket, datos):
-    """
-    Serializa y envía datos a través del socket.
-    :param socket: El socket a través del cual se envían los datos.
-    :param datos: Los datos a enviar (pueden ser cualquier tipo de dato serializable).
-    """
-    datos_serializados = pickle.dumps(datos)  # Serializa los datos usando pickle
-    socket.sendall(datos_serializados)  # Envía los datos serializados
+SIMBOLOS = {LADO_X: JUGADOR_X, LADO_O: JUGADOR_O}  # Símbolo de cada lado del protocolo
+INTERVALO_REVISION = 15  # Milisegundos entre revisiones de la cola de mensajes de red
 
 # --- Interfaz gráfica con Tkinter ---
 class ClienteGato4x4:
@@ -39,21 +28,24 @@ class ClienteGato4x4:
         Inicializa el cliente con la ventana Tkinter, el socket del cliente y el jugador asignado.
         :param root: La ventana principal de Tkinter.
         :param cliente: El socket de conexión con el servidor.
-        :param jugador: El jugador asignado ("X" o "O").
+        :param jugador: El jugador asignado ("X" o "O"), o None para observar la partida como espectador.
         """
         self.root = root
-        self.root.title(f"Gato 4x4 - Jugador {jugador}")
+        self.root.title(f"Gato 4x4 - Jugador {jugador}" if jugador else "Gato 4x4 - Espectador")
         self.cliente = cliente
         self.jugador = jugador
         self.turno_actual = JUGADOR_X  # El turno comienza con "X"
         self.mi_turno = False  # Controla si es el turno del jugador
         self.tablero = [[VACIO for _ in range(TAMAÑO)] for _ in range(TAMAÑO)]  # Inicializa el tablero vacío
         self.botones = [[None for _ in range(TAMAÑO)] for _ in range(TAMAÑO)]  # Botones de la interfaz
+        self.pintado = [[VACIO for _ in range(TAMAÑO)] for _ in range(TAMAÑO)]  # Lo que muestran los botones
         self.crear_tablero()  # Crea la interfaz del tablero
-        
-        # Iniciar un hilo para manejar la recepción de datos sin bloquear la interfaz gráfica
+
+        # Tk no es seguro entre hilos: el hilo de red solo encola mensajes y el bucle de Tk los procesa
+        self.mensajes = queue.Queue()
         self.hilo_escucha = threading.Thread(target=self.recibir_actualizacion, daemon=True)
         self.hilo_escucha.start()
+        self.root.after(INTERVALO_REVISION, self.procesar_mensajes)
 
     def crear_tablero(self):
         """
@@ -78,67 +70,127 @@ class ClienteGato4x4:
         # Solo permite al jugador hacer clic si es su turno y la casilla está vacía
         if self.tablero[i][j] == VACIO and self.mi_turno:
             self.tablero[i][j] = self.jugador  # Actualiza el tablero con el símbolo del jugador
-            self.botones[i][j]['text'] = self.jugador  # Actualiza el texto del botón
-            enviar_datos(self.cliente, (i, j))  # Envía el movimiento al servidor
+            self.actualizar_tablero()  # Pinta la casilla sin esperar al delta del servidor
+            enviar_mensaje(self.cliente, MOVIMIENTO, i * TAMAÑO + j, 0)  # Envía la casilla al servidor
             self.mi_turno = False  # Desactiva el turno hasta la próxima actualización
 
     def recibir_actualizacion(self):
         """
-        Hilo que recibe continuamente actualizaciones del estado del tablero y el turno desde el servidor.
+        Hilo que recibe continuamente los mensajes del servidor y los deja en la cola.
+        No toca la interfaz: de eso se encarga procesar_mensajes en el hilo de Tk.
         """
         while True:
-            mensaje = recibir_datos(self.cliente)  # Recibe los datos del servidor
-            if isinstance(mensaje, str):
-                # Si el mensaje es una cadena, significa que es el resultado del juego
-                if mensaje.startswith("¿Quieres jugar de nuevo?"):
-                    self.preguntar_reiniciar()
-                else:
-                    messagebox.showinfo("Resultado", mensaje)
+            try:
+                tipo, campos = recibir_mensaje(self.cliente)  # Recibe una trama completa del servidor
+            except (ConexionCerrada, OSError):
+                self.mensajes.put((None, ()))  # Avisa al hilo de Tk que la conexión terminó
+                break
+            self.mensajes.put((tipo, campos))
+            if tipo == DESPEDIDA:
+                break
+
+    def procesar_mensajes(self):
+        """
+        Vacía la cola de mensajes desde el bucle de Tk y se vuelve a programar.
+        Los tableros y deltas de una ráfaga solo cambian el estado; la interfaz se redibuja una vez
+        al final (o antes de mostrar un diálogo, para que se vea la última jugada).
+        """
+        try:
+            while True:
+                tipo, campos = self.mensajes.get_nowait()
+                if tipo == TABLERO:
+                    # Estado completo del tablero y el turno actual
+                    x, o, turno = campos
+                    self.tablero = desde_mascaras(x, o, JUGADOR_X, JUGADOR_O, VACIO)
+                    self.mi_turno = (SIMBOLOS[turno] == self.jugador)  # Activa el turno si corresponde al jugador
+                elif tipo == MOVIMIENTO:
+                    # Delta: solo cambia la casilla jugada y el turno pasa al otro lado
+                    casilla, lado = campos
+                    i, j = divmod(casilla, TAMAÑO)
+                    self.tablero[i][j] = SIMBOLOS[lado]
+                    self.mi_turno = (SIMBOLOS[1 - lado] == self.jugador)
+                elif tipo == PARTIDA:
+                    # Identificador con el que otros pueden observar esta partida
+                    self.root.title(f"Gato 4x4 - Jugador {self.jugador} - Partida {campos[0]}")
+                elif tipo == RESULTADO:
+                    (resultado,) = campos
+                    self.actualizar_tablero()
+                    messagebox.showinfo("Resultado", "Empate" if resultado == EMPATE else f"{SIMBOLOS[resultado]} ha ganado!")
                     self.reiniciar_juego()  # Reinicia el tablero si termina el juego
-            else:
-                # El mensaje es el estado del tablero y el turno actual
-                self.tablero, turno = mensaje
-                self.mi_turno = (turno == self.jugador)  # Activa el turno si corresponde al jugador
-                self.actualizar_tablero()  # Actualiza visualmente el tablero
+                elif tipo == REVANCHA:
+                    self.actualizar_tablero()
+                    if not self.preguntar_reiniciar():
+                        return
+                elif tipo == DESPEDIDA:
+                    self.actualizar_tablero()
+                    messagebox.showinfo("Fin", "Gracias por jugar!")
+                    self.root.quit()
+                    return
+                else:
+                    # La conexión se cerró sin despedida
+                    messagebox.showinfo("Fin", "Se perdió la conexión con el servidor")
+                    self.root.quit()
+                    return
+        except queue.Empty:
+            pass
+        self.actualizar_tablero()
+        self.root.after(INTERVALO_REVISION, self.procesar_mensajes)
 
     def actualizar_tablero(self):
         """
-        Actualiza el tablero en la interfaz gráfica según el estado actual.
+        Actualiza en la interfaz solo las casillas que cambiaron desde el último dibujo.
         """
         for i in range(TAMAÑO):
             for j in range(TAMAÑO):
-                self.botones[i][j]['text'] = self.tablero[i][j]  # Actualiza el texto del botón según el tablero
+                if self.pintado[i][j] != self.tablero[i][j]:
+                    self.botones[i][j]['text'] = self.tablero[i][j]  # Actualiza el texto del botón según el tablero
+                    self.pintado[i][j] = self.tablero[i][j]
 
     def reiniciar_juego(self):
         """
         Reinicia el estado del tablero y la interfaz para una nueva partida.
         """
         self.tablero = [[VACIO for _ in range(TAMAÑO)] for _ in range(TAMAÑO)]  # Resetea el tablero
-        for i in range(TAMAÑO):
-            for j in range(TAMAÑO):
-                self.botones[i][j]['text'] = ""  # Limpia los botones
+        self.actualizar_tablero()  # Limpia los botones ocupados
 
     def preguntar_reiniciar(self):
         """
         Pregunta al jugador si desea jugar nuevamente y envía su respuesta al servidor.
+        :return: True si el jugador sigue en la sesión.
         """
         respuesta = messagebox.askyesno("Nuevo Juego", "¿Quieres jugar de nuevo?")  # Pregunta al jugador
         if respuesta:
-            enviar_datos(self.cliente, 's')  # Si acepta, envía 's' al servidor
+            enviar_mensaje(self.cliente, REVANCHA, 1)  # Si acepta, envía 1 al servidor
             self.reiniciar_juego()  # Reinicia el tablero
-        else:
-            enviar_datos(self.cliente, 'n')  # Si no acepta, envía 'n' al servidor y cierra la ventana
-            self.root.quit()
+            return True
+        enviar_mensaje(self.cliente, REVANCHA, 0)  # Si no acepta, envía 0 al servidor y cierra la ventana
+        self.root.quit()
+        return False
 
 # --- Ejecución del Cliente ---
 if __name__ == "__main__":
-    # Conectar al servidor en localhost:12345
+    parser = argparse.ArgumentParser(description="Cliente del gato 4x4 en red.")
+    parser.add_argument("--ia", action="store_true", help="Jugar contra la IA del servidor en lugar de otra persona")
+    parser.add_argument("--observar", type=int, metavar="PARTIDA", default=None,
+                        help="Observar como espectador la partida con este identificador")
+    args = parser.parse_args()
+
+    # Conectar al servidor en localhost:12345 e indicar el tipo de rival (o la partida a observar)
     cliente = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     cliente.connect(('localhost', 12345))
+    if args.observar is not None:
+        enviar_mensaje(cliente, OBSERVAR, args.observar)
+    else:
+        enviar_mensaje(cliente, MODO, CONTRA_IA if args.ia else CONTRA_HUMANO)
 
     # Iniciar la interfaz Tkinter y el juego
     root = tk.Tk()
-    jugador = recibir_datos(cliente)  # Recibe si el jugador es "X" o "O" desde el servidor
+    jugador = None  # Los espectadores no reciben asignación: el servidor manda directamente el tablero
+    if args.observar is None:
+        tipo, (lado,) = recibir_mensaje(cliente)  # Recibe la asignación: si el jugador es "X" o "O"
+        if tipo != ASIGNACION:
+            raise ValueError(f"Se esperaba la asignación de lado y llegó el mensaje de tipo {tipo}")
+        jugador = SIMBOLOS[lado]
     juego = ClienteGato4x4(root, cliente, jugador)
     root.mainloop()  # Inicia el ciclo de eventos de Tkinter
     cliente.close()  # Cierra la conexión cuando termina el juego
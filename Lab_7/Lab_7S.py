@@ -1,5 +1,20 @@
+import argparse
+import asyncio
+import multiprocessing
+import random
 import socket
-import pickle
+import time
+
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from bitacora_gato import (ABANDONADA, INTERVALO_FSYNC, RUTA_PREDETERMINADA as RUTA_BITACORA, Bitacora,
+                            reproducir, sembrar_cache, ultima_partida)
+from motor_gato import GANA, LLENO, SIMETRIAS, MotorGato
+from protocolo_gato import (ASIGNACION, CONTRA_HUMANO, CONTRA_IA, DESPEDIDA, EMPATE, LADO_O, LADO_X, MODO,
+                            MOVIMIENTO, OBSERVAR, PARTIDA, PREFIJO, RESULTADO, REVANCHA, TABLERO, ConexionCerrada,
+                            a_mascaras, desempaquetar, empaquetar, recibir_mensaje_async)
+from tablebase_gato import canonico_con_simetria
 
 # --- Configuración general ---
 # Definición de los jugadores y casillas vacías
@@ -7,6 +22,28 @@ JUGADOR_X = "X"  # Jugador X
 JUGADOR_O = "O"  # Jugador O
 VACIO = ""       # Casilla vacía
 TAMAÑO = 4       # Tamaño del tablero (4x4)
+TIEMPO_ESPERA = 60.0  # Segundos que el servidor espera un movimiento o una respuesta antes de cerrar la partida
+PROFUNDIDAD_IA = 4       # Profundidad de la IA del servidor (la misma que PROFUNDIDAD_MAX en Lab_7.py)
+CAPACIDAD_CACHE = 100000  # Posiciones canónicas guardadas en la caché de jugadas
+LIMITE_ESPECTADOR = 4096  # Bytes sin enviar a partir de los cuales un espectador deja de recibir deltas
+ATRASO_MAXIMO = 10.0      # Segundos que un espectador puede seguir atrasado antes de desconectarlo
+BUFER_ESPECTADOR = 16384  # Búfer de envío del sistema operativo para cada espectador
+
+
+def calcular_inversas():
+    """
+    Invierte las permutaciones de SIMETRIAS para devolver una jugada del marco canónico al original.
+    :return: Una lista donde INVERSAS[s][c'] es la casilla que la simetría s lleva a c'.
+    """
+    inversas = []
+    for permutacion in SIMETRIAS:
+        inversa = [0] * (TAMAÑO * TAMAÑO)
+        for casilla, destino in enumerate(permutacion):
+            inversa[destino] = casilla
+        inversas.append(inversa)
+    return inversas
+
+INVERSAS = calcular_inversas()
 
 def inicializar_tablero():
     """
@@ -42,101 +79,895 @@ def verificar_ganador(tablero, jugador):
         return True
     return False
 
-def enviar_datos(socket, datos):
-    """
-    Serializa y envía datos a través del socket.
-    :param socket: El socket a través del cual se envían los datos.
-    :param datos: Los datos a enviar (pueden ser cualquier tipo de dato serializable).
-    """
-    datos_serializados = pickle.dumps(datos)  # Serializa los datos usando pickle
-    socket.sendall(datos_serializados)  # Envía los datos serializados
-
-def recibir_datos(socket):
-    """
-    Recibe y deserializa datos a través del socket.
-    :param socket: El socket desde el cual se reciben los datos.
-    :return: Los datos deserializados.
-    """
-    datos_serializados = socket.recv(1024)  # Recibe datos del socket (máximo 1024 bytes)
-    return pickle.loads(datos_serializados)  # Deserializa los datos usando pickle
-
-def juego_servidor():
-    """
-    Función principal del servidor que maneja la conexión, el flujo del juego y
-    la reinicialización de partidas según la elección de los jugadores.
-    """
-    # Configuración del servidor: creación de socket y escucha en localhost en el puerto 12345
-    servidor = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    servidor.bind(('localhost', 12345))
-    servidor.listen(2)  # Escucha hasta 2 conexiones (jugadores)
-
-    print("Esperando a los jugadores...")
-    conexion_jugador1, _ = servidor.accept()  # Conecta al primer jugador
-    print("Jugador 1 (X) conectado.")
-    conexion_jugador2, _ = servidor.accept()  # Conecta al segundo jugador
-    print("Jugador 2 (O) conectado.")
-
-    while True:
-        # Inicializar el tablero para una nueva partida
-        tablero = inicializar_tablero()
-        turno = JUGADOR_X  # Comienza el jugador "X"
-
-        # Enviar información inicial a ambos jugadores (quién es X y quién es O)
-        enviar_datos(conexion_jugador1, JUGADOR_X)
-        enviar_datos(conexion_jugador2, JUGADOR_O)
-
-        juego_activo = True  # Controla si la partida está activa
-
-        # Bucle principal del juego
-        while juego_activo:
-            # Enviar el tablero actual y el turno a ambos jugadores
-            enviar_datos(conexion_jugador1, (tablero, turno))
-            enviar_datos(conexion_jugador2, (tablero, turno))
-
-            # Recibe el movimiento del jugador en turno
-            if turno == JUGADOR_X:
-                print("Esperando movimiento del Jugador X...")
-                movimiento = recibir_datos(conexion_jugador1)
-            else:
-                print("Esperando movimiento del Jugador O...")
-                movimiento = recibir_datos(conexion_jugador2)
-
-            # Actualizar el tablero con el movimiento recibido
-            fila, col = movimiento
-            tablero[fila][col] = turno
-
-            # Verificar si el jugador actual ha ganado
-            if verificar_ganador(tablero, turno):
-                enviar_datos(conexion_jugador1, f"{turno} ha ganado!")
-                enviar_datos(conexion_jugador2, f"{turno} ha ganado!")
-                juego_activo = False  # Termina el juego si hay un ganador
-                break
-
-            # Verificar si el tablero está lleno (empate)
-            if tablero_lleno(tablero):
-                enviar_datos(conexion_jugador1, "Empate")
-                enviar_datos(conexion_jugador2, "Empate")
-                juego_activo = False  # Termina el juego si hay empate
-                break
-
-            # Cambiar turno: alterna entre jugador X y O
-            turno = JUGADOR_O if turno == JUGADOR_X else JUGADOR_X
-
-        # Preguntar si los jugadores desean jugar nuevamente
-        enviar_datos(conexion_jugador1, "¿Quieres jugar de nuevo? (s/n)")
-        enviar_datos(conexion_jugador2, "¿Quieres jugar de nuevo? (s/n)")
-        respuesta_jugador1 = recibir_datos(conexion_jugador1)  # Respuesta de Jugador 1
-        respuesta_jugador2 = recibir_datos(conexion_jugador2)  # Respuesta de Jugador 2
-
-        # Si alguno de los jugadores dice que no, finalizar el juego
-        if respuesta_jugador1.lower() != 's' or respuesta_jugador2.lower() != 's':
-            enviar_datos(conexion_jugador1, "Gracias por jugar!")
-            enviar_datos(conexion_jugador2, "Gracias por jugar!")
-            break
-
-    # Cierra el servidor cuando el ciclo termina
-    servidor.close()
+# --- Servidor asyncio con emparejamiento ---
+
+class Conexion:
+    """Un cliente conectado: sus flujos y un evento que se activa cuando deja de necesitarse."""
+
+    def __init__(self, lector, escritor):
+        self.lector = lector
+        self.escritor = escritor
+        self.terminada = asyncio.Event()
+
+    def desconectada(self):
+        """
+        Verifica si el cliente ya cerró la conexión.
+        :return: True si el cliente se fue mientras esperaba.
+        """
+        return self.lector.at_eof() or self.escritor.is_closing()
+
+    def escribir(self, trama):
+        """Encola una trama en el búfer de salida (si la conexión sigue abierta)."""
+        if not self.escritor.is_closing():
+            self.escritor.write(trama)
+
+    async def drenar(self):
+        """Espera a que el búfer de salida se vacíe lo suficiente."""
+        await self.escritor.drain()
+
+    def pendiente(self):
+        """
+        Bytes escritos que el sistema operativo todavía no aceptó.
+        :return: El tamaño del búfer de salida del transporte.
+        """
+        return self.escritor.transport.get_write_buffer_size()
+
+    def limitar_bufer(self, tamaño):
+        """
+        Fija el búfer de envío del socket. Sin esto el sistema lo agranda solo (hasta megabytes en
+        localhost) y un cliente que no lee tarda mucho en notarse en el búfer del transporte.
+        """
+        conector = self.escritor.get_extra_info("socket")
+        if conector is not None:
+            conector.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, tamaño)
+
+    def abortar(self):
+        """Cierra la conexión de inmediato, descartando lo que quede en el búfer de salida."""
+        self.escritor.transport.abort()
+
+    async def recibir(self):
+        """Recibe el siguiente mensaje del cliente."""
+        return await recibir_mensaje_async(self.lector)
+
+    async def cerrar(self):
+        """Cierra la conexión sin propagar errores del otro extremo."""
+        if not self.escritor.is_closing():
+            self.escritor.close()
+        try:
+            await self.escritor.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+        self.terminada.set()
+
+class AsientoIA:
+    """
+    Rival controlado por el servidor. Recibe las mismas tramas que un cliente y, cuando le toca,
+    pide la jugada al servidor; sus respuestas salen por una cola como si llegaran de la red.
+    Siempre acepta la revancha.
+    """
+
+    def __init__(self, servidor):
+        self.servidor = servidor
+        self.lado = LADO_O
+        self.mascaras = [0, 0]
+        self.turno = LADO_X
+        self.salida = asyncio.Queue()
+        self.pensando = None
+        self.terminada = asyncio.Event()
+
+    def desconectada(self):
+        """La IA nunca se desconecta por su cuenta."""
+        return False
+
+    def escribir(self, trama):
+        """Actualiza el estado con la trama recibida y empieza a pensar si le toca."""
+        tipo, campos = desempaquetar(trama[PREFIJO.size:])
+        if tipo == ASIGNACION:
+            self.lado = campos[0]
+        elif tipo == TABLERO:
+            x, o, self.turno = campos
+            self.mascaras = [x, o]
+            self.pensar_si_toca()
+        elif tipo == MOVIMIENTO:
+            casilla, lado = campos
+            self.mascaras[lado] |= 1 << casilla
+            if not GANA[self.mascaras[lado]]:
+                self.turno = 1 - lado
+                self.pensar_si_toca()
+        elif tipo == REVANCHA:
+            self.salida.put_nowait((REVANCHA, (1,)))
+
+    def pensar_si_toca(self):
+        """Lanza la búsqueda si es el turno de la IA y quedan casillas libres."""
+        if self.turno == self.lado and self.mascaras[0] | self.mascaras[1] != LLENO:
+            self.pensando = asyncio.create_task(self.pensar())
+
+    async def pensar(self):
+        """
+        Obtiene la jugada del servidor y la deja en la cola de salida. Si la búsqueda falla (por ejemplo,
+        el grupo de procesos se rompió o ya se apagó), deja el error en la cola para que la partida termine
+        en seguida en lugar de esperar TIEMPO_ESPERA una jugada que nunca llegará.
+        """
+        propias, rivales = self.mascaras[self.lado], self.mascaras[1 - self.lado]
+        try:
+            casilla = await self.servidor.jugada_ia(propias, rivales)
+        except Exception as error:
+            self.salida.put_nowait((None, error))
+            return
+        self.salida.put_nowait((MOVIMIENTO, (casilla, 0)))
+
+    async def drenar(self):
+        """No hay búfer de red que vaciar."""
+
+    async def recibir(self):
+        """
+        Siguiente respuesta de la IA.
+        :raise ConexionCerrada: Si la IA no pudo calcular su jugada; la partida se cierra como abandonada.
+        """
+        tipo, campos = await self.salida.get()
+        if tipo is None:
+            raise ConexionCerrada(f"La IA no pudo calcular su jugada: {campos!r}") from campos
+        return tipo, campos
+
+    async def cerrar(self):
+        """Cancela la búsqueda pendiente de esta partida."""
+        if self.pensando is not None:
+            self.pensando.cancel()
+        self.terminada.set()
+
+class Transmision:
+    """
+    Difusión de una partida a sus espectadores. Cada actualización se empaqueta una sola vez (la misma
+    trama que reciben los jugadores) y se escribe en el búfer de cada suscriptor sin esperar a que se vacíe.
+    Un espectador con más de LIMITE_ESPECTADOR bytes pendientes deja de recibir deltas; cuando se pone al
+    día recibe un tablero completo que reemplaza todas las jugadas que se saltó. Si sigue atrasado más de
+    ATRASO_MAXIMO segundos se le desconecta, así un espectador lento nunca frena a los jugadores.
+    """
+
+    def __init__(self, identificador):
+        self.identificador = identificador
+        self.suscriptores = {}  # Conexión -> instante desde el que está atrasado (None si está al día)
+        self.mascaras = [0, 0]
+        self.turno = LADO_X
+        self.fusionadas = 0    # Tramas que algún espectador atrasado no recibió
+        self.descartados = 0   # Espectadores desconectados por lentos
+
+    def instantanea(self):
+        """Trama con el tablero y el turno actuales."""
+        return empaquetar(TABLERO, self.mascaras[0], self.mascaras[1], self.turno)
+
+    def suscribir(self, conexion):
+        """Agrega un espectador y le envía el estado actual."""
+        self.suscriptores[conexion] = None
+        conexion.escribir(self.instantanea())
+
+    def desuscribir(self, conexion):
+        """Quita a un espectador (si seguía suscrito)."""
+        self.suscriptores.pop(conexion, None)
+
+    def publicar(self, tipo, campos, trama):
+        """
+        Actualiza el estado de la partida y reparte la trama entre los espectadores.
+        :param tipo: Tipo de mensaje.
+        :param campos: Valores de los campos del tipo.
+        :param trama: La trama ya empaquetada.
+        """
+        if tipo == TABLERO:
+            x, o, self.turno = campos
+            self.mascaras = [x, o]
+        elif tipo == MOVIMIENTO:
+            casilla, lado = campos
+            self.mascaras[lado] |= 1 << casilla
+            self.turno = 1 - lado
+        # Los tableros y deltas se pueden fusionar en una instantánea; el resultado y la despedida no
+        fusionable = tipo in (TABLERO, MOVIMIENTO)
+        ahora = time.monotonic()
+        instantanea = None
+        for conexion, atrasado in list(self.suscriptores.items()):
+            if conexion.pendiente() > LIMITE_ESPECTADOR:
+                if atrasado is None:
+                    self.suscriptores[conexion] = ahora
+                elif ahora - atrasado > ATRASO_MAXIMO:
+                    del self.suscriptores[conexion]
+                    self.descartados += 1
+                    conexion.abortar()
+                    continue
+                if fusionable:
+                    self.fusionadas += 1
+                    continue
+            elif atrasado is not None:
+                # Se puso al día: el tablero completo ya incluye esta actualización si era un delta
+                if instantanea is None:
+                    instantanea = self.instantanea()
+                conexion.escribir(instantanea)
+                self.suscriptores[conexion] = None
+                if fusionable:
+                    continue
+            conexion.escribir(trama)
+
+    def terminar(self):
+        """Cierra las conexiones de todos los espectadores al terminar la partida."""
+        for conexion in self.suscriptores:
+            conexion.escritor.close()
+        self.suscriptores.clear()
+
+class CacheJugadas:
+    """
+    Caché acotada de tablero canónico -> casilla, con desalojo del elemento usado hace más tiempo (LRU).
+    Como la clave es canónica, una posición y sus 7 simetrías comparten la misma entrada.
+    """
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self.datos = OrderedDict()
+        self.consultas = 0
+        self.aciertos = 0
+
+    def obtener(self, clave):
+        """
+        Busca la jugada de una posición canónica.
+        :return: La casilla en el marco canónico, o None si no está.
+        """
+        self.consultas += 1
+        casilla = self.datos.get(clave)
+        if casilla is not None:
+            self.datos.move_to_end(clave)
+            self.aciertos += 1
+        return casilla
+
+    def guardar(self, clave, casilla):
+        """Guarda la jugada y desaloja la entrada más antigua si se supera la capacidad."""
+        self.datos[clave] = casilla
+        self.datos.move_to_end(clave)
+        if len(self.datos) > self.capacidad:
+            self.datos.popitem(last=False)
+
+def _buscar_jugada(propias, rivales, profundidad):
+    """
+    Se ejecuta en un proceso del grupo: busca con el motor de bitboards (uno por proceso).
+    :return: El índice de la casilla elegida.
+    """
+    global _motor_ia
+    if _motor_ia is None:
+        _motor_ia = MotorGato()
+    fila, columna = _motor_ia.mejor_movimiento(propias, rivales, profundidad)
+    return fila * TAMAÑO + columna
+
+_motor_ia = None
+
+class ServidorGato:
+    """
+    Servidor de muchas partidas simultáneas en un solo proceso. Cada conexión entra a una cola de
+    emparejamiento; cada par forma una partida que corre como una tarea de asyncio. Si un jugador se
+    desconecta o no responde en 'tiempo_espera' segundos, solo termina su partida.
+    Quien pide jugar contra la IA recibe un AsientoIA como rival; las búsquedas se reparten en un
+    grupo de procesos y sus resultados se comparten entre partidas mediante una caché acotada.
+    Cada partida tiene un identificador; quien abre la conexión con OBSERVAR y ese identificador la
+    sigue como espectador a través de su Transmision.
+    Con una bitácora (bitacora_gato.Bitacora) cada inicio, jugada y resultado queda registrado; las
+    escrituras y el fsync se hacen en lote cada INTERVALO_FSYNC segundos.
+    """
+
+    def __init__(self, tiempo_espera=TIEMPO_ESPERA, procesos_ia=None, profundidad_ia=PROFUNDIDAD_IA,
+                 capacidad_cache=CAPACIDAD_CACHE, bitacora=None):
+        self.tiempo_espera = tiempo_espera
+        self.grupo = ProcessPoolExecutor(procesos_ia)  # Búsquedas de la IA fuera del bucle de eventos
+        self.profundidad_ia = profundidad_ia
+        self.cache = CacheJugadas(capacidad_cache)
+        self.en_curso = {}  # Clave canónica -> búsqueda pendiente
+        self.latencias_ia = deque(maxlen=10000)  # (acierto de caché, segundos) de las últimas jugadas de la IA
+        self.cola = asyncio.Queue()  # Conexiones esperando rival
+        self.tareas = set()          # Partidas en curso (se guardan para que no las recolecte el GC)
+        self.transmisiones = {}      # Identificador -> Transmision de cada partida en curso
+        self.siguiente_partida = 1
+        self.partidas_activas = 0
+        self.partidas_terminadas = 0
+        self.abandonos = 0
+        self.tramas_fusionadas = 0
+        self.espectadores_descartados = 0
+        self.bitacora = bitacora
+
+    def cargar_bitacora(self, directorio=RUTA_BITACORA):
+        """
+        Abre la bitácora del directorio y retoma su estado: los identificadores siguen después del último
+        registrado, la caché de la IA se llena con las jugadas que la IA ya dio a la misma profundidad y
+        las partidas que quedaron a medias se cierran como abandonadas (sus jugadores ya no están).
+        :return: Una tupla (partidas leídas, jugadas sembradas en la caché, partidas cerradas como abandonadas).
+        """
+        terminadas, en_curso = reproducir(directorio)
+        leidas = 0
+
+        def contar():
+            nonlocal leidas
+            for partida in terminadas:
+                leidas += 1
+                yield partida
+
+        sembradas = sembrar_cache(contar(), self.cache, self.profundidad_ia)
+        self.siguiente_partida = ultima_partida(directorio) + 1
+        self.bitacora = Bitacora(directorio)
+        for partida in en_curso:
+            self.bitacora.fin(partida, ABANDONADA)
+        return leidas, sembradas, len(en_curso)
+
+    async def guardar_bitacora(self):
+        """
+        Escribe en lote lo acumulado en la bitácora y hace el fsync en un hilo, sin bloquear el bucle.
+        Si se cancela mientras el hilo sincroniza, espera a que termine antes de propagar la
+        cancelación: el hilo sigue usando los descriptores que cerrar() va a cerrar.
+        """
+        bucle = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(INTERVALO_FSYNC)
+            if self.bitacora.escribir():
+                sincronizacion = bucle.run_in_executor(None, self.bitacora.sincronizar)
+                try:
+                    await asyncio.shield(sincronizacion)
+                except asyncio.CancelledError:
+                    await sincronizacion
+                    raise
+
+    async def atender(self, lector, escritor):
+        """
+        Callback de asyncio.start_server: encola la conexión y espera a que su partida termine.
+        :param lector: El StreamReader del cliente.
+        :param escritor: El StreamWriter del cliente.
+        """
+        conexion = Conexion(lector, escritor)
+        try:
+            tipo, campos = await asyncio.wait_for(conexion.recibir(), self.tiempo_espera)
+        except (ConexionCerrada, asyncio.TimeoutError, ConnectionError, ValueError):
+            await conexion.cerrar()
+            return
+        if tipo == OBSERVAR:
+            await self.observar(conexion, campos[0])
+            return
+        if tipo == MODO and campos[0] == CONTRA_IA:
+            # La IA ocupa el otro asiento; el humano juega con X
+            self.iniciar_partida(conexion, AsientoIA(self))
+        else:
+            await self.cola.put(conexion)
+        try:
+            await conexion.terminada.wait()
+        except asyncio.CancelledError:
+            # El servidor se está apagando: se cierra la conexión sin dejar una tarea cancelada sin revisar
+            escritor.close()
+
+    async def observar(self, conexion, identificador):
+        """
+        Suscribe a un espectador a la partida pedida y lo mantiene hasta que se vaya o la partida termine.
+        Si la partida no existe, se despide de inmediato.
+        """
+        transmision = self.transmisiones.get(identificador)
+        if transmision is None:
+            conexion.escribir(empaquetar(DESPEDIDA))
+            await conexion.cerrar()
+            return
+        conexion.limitar_bufer(BUFER_ESPECTADOR)
+        transmision.suscribir(conexion)
+        try:
+            while True:
+                await conexion.recibir()  # Un espectador no envía nada: esto solo detecta que se fue
+        except (ConexionCerrada, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            conexion.escritor.close()  # El servidor se está apagando
+            return
+        finally:
+            transmision.desuscribir(conexion)
+        await conexion.cerrar()
+
+    async def emparejar(self):
+        """Forma parejas con las conexiones de la cola, descartando las que se fueron mientras esperaban."""
+        esperando = None
+        while True:
+            conexion = await self.cola.get()
+            if conexion.desconectada():
+                await conexion.cerrar()
+                continue
+            if esperando is None or esperando.desconectada():
+                if esperando is not None:
+                    await esperando.cerrar()
+                esperando = conexion
+                continue
+            self.iniciar_partida(esperando, conexion)
+            esperando = None
+
+    def iniciar_partida(self, jugador1, jugador2):
+        """Crea la tarea de una partida, con su identificador y su transmisión, y la guarda mientras dura."""
+        transmision = Transmision(self.siguiente_partida)
+        self.transmisiones[transmision.identificador] = transmision
+        self.siguiente_partida += 1
+        tarea = asyncio.create_task(self.partida(jugador1, jugador2, transmision))
+        self.tareas.add(tarea)
+        tarea.add_done_callback(self.tareas.discard)
+
+    async def jugada_ia(self, propias, rivales):
+        """
+        Mejor casilla para el lado con las fichas 'propias'. Primero se consulta la caché por tablero
+        canónico; si no está, la búsqueda corre en el grupo de procesos sin bloquear el bucle de eventos.
+        Si la misma posición (o una simétrica) ya se está buscando para otra partida, se espera esa búsqueda.
+        :return: El índice de la casilla (i * 4 + j).
+        """
+        inicio = time.perf_counter()
+        clave, simetria = canonico_con_simetria(propias << 16 | rivales)
+        casilla = self.cache.obtener(clave)
+        acierto = casilla is not None
+        if not acierto:
+            futuro = self.en_curso.get(clave)
+            if futuro is None:
+                futuro = asyncio.get_running_loop().run_in_executor(
+                    self.grupo, _buscar_jugada, clave >> 16, clave & 0xFFFF, self.profundidad_ia)
+                self.en_curso[clave] = futuro
+                futuro.add_done_callback(lambda f: self.busqueda_terminada(clave, f))
+            # shield: si esta partida se cancela, la búsqueda sigue para las demás que la esperan
+            casilla = await asyncio.shield(futuro)
+        self.latencias_ia.append((acierto, time.perf_counter() - inicio))
+        return INVERSAS[simetria][casilla]
+
+    def busqueda_terminada(self, clave, futuro):
+        """Guarda en la caché el resultado de una búsqueda del grupo de procesos."""
+        del self.en_curso[clave]
+        if not futuro.cancelled() and futuro.exception() is None:
+            self.cache.guardar(clave, futuro.result())
+
+    async def enviar(self, conexiones, tipo, *campos, transmision=None):
+        """
+        Envía el mismo mensaje a varias conexiones: la trama se empaqueta una sola vez.
+        :param conexiones: Las conexiones destino.
+        :param tipo: Tipo de mensaje.
+        :param campos: Valores de los campos del tipo.
+        :param transmision: Si se indica, la misma trama se reparte también a los espectadores (sin esperarlos).
+        """
+        trama = empaquetar(tipo, *campos)
+        for conexion in conexiones:
+            conexion.escribir(trama)
+        if transmision is not None:
+            transmision.publicar(tipo, campos, trama)
+        for conexion in conexiones:
+            await asyncio.wait_for(conexion.drenar(), self.tiempo_espera)
+
+    async def recibir(self, conexion):
+        """
+        Recibe un mensaje con límite de tiempo.
+        :param conexion: La conexión de la que se espera el mensaje.
+        :return: Una tupla (tipo, campos).
+        """
+        return await asyncio.wait_for(conexion.recibir(), self.tiempo_espera)
+
+    async def respuesta_revancha(self, conexion):
+        """
+        Espera la respuesta a la revancha. Un movimiento que el cliente envió antes de enterarse del
+        resultado se descarta.
+        :return: True si el jugador acepta.
+        """
+        while True:
+            tipo, campos = await self.recibir(conexion)
+            if tipo == REVANCHA:
+                return campos[0] == 1
+            if tipo != MOVIMIENTO:
+                raise ValueError(f"Se esperaba la respuesta a la revancha y llegó el mensaje de tipo {tipo}")
+
+    async def partida(self, jugador1, jugador2, transmision):
+        """
+        Flujo de una partida (y sus revanchas) entre dos conexiones. Al inicio de cada partida se envía
+        el tablero completo y después solo el movimiento de cada turno; los espectadores de 'transmision'
+        reciben las mismas tramas salvo la revancha.
+        """
+        conexiones = (jugador1, jugador2)
+        lados = {JUGADOR_X: LADO_X, JUGADOR_O: LADO_O}
+        identificador = transmision.identificador
+        en_juego = False  # Hay un INICIO en la bitácora sin su FIN
+        self.partidas_activas += 1
+        try:
+            # Informar a cada jugador qué lado le toca
+            await self.enviar((jugador1,), ASIGNACION, LADO_X)
+            await self.enviar((jugador2,), ASIGNACION, LADO_O)
+            await self.enviar(conexiones, PARTIDA, transmision.identificador)
+
+            while True:
+                # Inicializar el tablero para una nueva partida
+                tablero = inicializar_tablero()
+                turno = JUGADOR_X  # Comienza el jugador "X"
+                await self.enviar(conexiones, TABLERO, 0, 0, LADO_X, transmision=transmision)
+                if self.bitacora is not None:
+                    contra_ia = isinstance(jugador2, AsientoIA)
+                    self.bitacora.inicio(identificador, contra_ia, self.profundidad_ia if contra_ia else 0)
+                    en_juego = True
+
+                # Bucle principal del juego
+                while True:
+                    conexion_turno = jugador1 if turno == JUGADOR_X else jugador2
+                    tipo, campos = await self.recibir(conexion_turno)
+                    fila, col = divmod(campos[0], TAMAÑO) if tipo == MOVIMIENTO else (-1, -1)
+                    if not (0 <= fila < TAMAÑO and tablero[fila][col] == VACIO):
+                        # Mensaje o casilla inválida: se reenvía el tablero para resincronizar al cliente
+                        x, o = a_mascaras(tablero, JUGADOR_X, JUGADOR_O)
+                        await self.enviar((conexion_turno,), TABLERO, x, o, lados[turno])
+                        continue
+
+                    # Actualizar el tablero y enviar solo el movimiento a ambos jugadores
+                    tablero[fila][col] = turno
+                    if self.bitacora is not None:
+                        self.bitacora.jugada(identificador, campos[0], lados[turno])
+                    await self.enviar(conexiones, MOVIMIENTO, campos[0], lados[turno], transmision=transmision)
+
+                    # Verificar si el jugador actual ha ganado o si el tablero está lleno (empate)
+                    if verificar_ganador(tablero, turno):
+                        resultado = lados[turno]
+                        break
+                    if tablero_lleno(tablero):
+                        resultado = EMPATE
+                        break
+
+                    # Cambiar turno: alterna entre jugador X y O
+                    turno = JUGADOR_O if turno == JUGADOR_X else JUGADOR_X
+
+                await self.enviar(conexiones, RESULTADO, resultado, transmision=transmision)
+                if self.bitacora is not None:
+                    self.bitacora.fin(identificador, resultado)
+                    en_juego = False
+                self.partidas_terminadas += 1
+
+                # Preguntar si los jugadores desean jugar nuevamente (las respuestas se esperan a la vez)
+                await self.enviar(conexiones, REVANCHA, 0)
+                respuestas = await asyncio.gather(self.respuesta_revancha(jugador1), self.respuesta_revancha(jugador2))
+                if not all(respuestas):
+                    await self.enviar(conexiones, DESPEDIDA, transmision=transmision)
+                    break
+        except (ConexionCerrada, asyncio.TimeoutError, ConnectionError, ValueError):
+            # Un jugador se fue, tardó demasiado o envió una trama inválida: se avisa al otro si sigue ahí
+            self.abandonos += 1
+            trama = empaquetar(DESPEDIDA)
+            for conexion in conexiones:
+                conexion.escribir(trama)
+            transmision.publicar(DESPEDIDA, (), trama)
+        finally:
+            if en_juego:
+                self.bitacora.fin(identificador, ABANDONADA)
+            self.partidas_activas -= 1
+            del self.transmisiones[identificador]
+            transmision.terminar()
+            self.tramas_fusionadas += transmision.fusionadas
+            self.espectadores_descartados += transmision.descartados
+            await asyncio.gather(*(conexion.cerrar() for conexion in conexiones))
+
+    async def servir(self, host="localhost", puerto=12345, listo=None):
+        """
+        Acepta conexiones hasta que se cancele la tarea.
+        :param listo: Evento opcional que se activa cuando el servidor ya escucha.
+        """
+        servidor = await asyncio.start_server(self.atender, host, puerto, backlog=4096)
+        emparejador = asyncio.create_task(self.emparejar())
+        guardado = asyncio.create_task(self.guardar_bitacora()) if self.bitacora is not None else None
+        if listo is not None:
+            listo.set()
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            emparejador.cancel()
+            self.grupo.shutdown(wait=False, cancel_futures=True)
+            if guardado is not None:
+                guardado.cancel()
+                await asyncio.gather(guardado, return_exceptions=True)  # Incluye el fsync en curso
+                # Las partidas canceladas registran su abandono antes de cerrar la bitácora. wait_for (en
+                # Python 3.11) puede tragarse una cancelación que coincide con un mensaje: se insiste
+                pendientes = set(self.tareas)
+                while pendientes:
+                    for tarea in pendientes:
+                        tarea.cancel()
+                    _, pendientes = await asyncio.wait(pendientes, timeout=0.1)
+                self.bitacora.cerrar()
+
+def juego_servidor(host="localhost", puerto=12345, bitacora=RUTA_BITACORA):
+    """
+    Función principal del servidor: atiende partidas simultáneas hasta que se interrumpa con Ctrl+C.
+    :param host: Dirección en la que escucha.
+    :param puerto: Puerto en el que escucha.
+    :param bitacora: Directorio de la bitácora de partidas, o None para no registrar nada.
+    """
+    servidor = ServidorGato()
+    if bitacora is not None:
+        inicio = time.perf_counter()
+        leidas, sembradas, abandonadas = servidor.cargar_bitacora(bitacora)
+        print(f"Bitácora {bitacora}: {leidas:,} partidas leídas, {sembradas:,} jugadas de la IA en caché, "
+              f"{abandonadas} partidas a medias cerradas como abandonadas ({time.perf_counter() - inicio:.2f} s)")
+    print(f"Servidor escuchando en {host}:{puerto}")
+    try:
+        asyncio.run(servidor.servir(host, puerto))
+    except KeyboardInterrupt:
+        pass
+
+# --- Medición de capacidad ---
+
+async def bot_aleatorio(host, puerto, continuar, inicio=None, avisar=None, modo=CONTRA_HUMANO, al_mover=None):
+    """
+    Cliente sin interfaz que juega casillas al azar y acepta revanchas mientras continuar() sea verdadero.
+    :param inicio: Evento opcional que el bot espera antes de su primer movimiento.
+    :param avisar: Función opcional que se llama al recibir el primer tablero.
+    :param modo: CONTRA_HUMANO (emparejamiento) o CONTRA_IA.
+    :param al_mover: Función opcional que se llama con el número de partidas terminadas al enviar cada jugada.
+    :return: Número de partidas que terminó este bot.
+    """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    escritor.write(empaquetar(MODO, modo))
+    terminadas = 0
+    try:
+        _, (lado,) = await recibir_mensaje_async(lector)
+        libres = []
+        mascaras = [0, 0]
+        turno = LADO_X
+        while True:
+            tipo, campos = await recibir_mensaje_async(lector)
+            if tipo == TABLERO:
+                x, o, turno = campos
+                mascaras = [x, o]
+                libres = [c for c in range(TAMAÑO * TAMAÑO) if not (x | o) >> c & 1]
+                random.shuffle(libres)
+                if avisar is not None:
+                    avisar()
+                    avisar = None
+                if inicio is not None:
+                    await inicio.wait()
+            elif tipo == MOVIMIENTO:
+                libres.remove(campos[0])
+                mascaras[campos[1]] |= 1 << campos[0]
+                if GANA[mascaras[campos[1]]]:
+                    continue  # Partida terminada: sigue el resultado
+                turno = 1 - campos[1]
+            elif tipo == RESULTADO:
+                terminadas += 1
+                continue
+            elif tipo == REVANCHA:
+                escritor.write(empaquetar(REVANCHA, 1 if continuar() else 0))
+                continue
+            elif tipo == DESPEDIDA:
+                return terminadas
+            elif tipo == PARTIDA:
+                continue
+            if turno == lado and libres:
+                if al_mover is not None:
+                    al_mover(terminadas)
+                escritor.write(empaquetar(MOVIMIENTO, libres[-1], 0))
+    except ConexionCerrada:
+        return terminadas
+    finally:
+        escritor.close()
+
+def memoria_residente(pid):
+    """
+    Memoria residente de un proceso según /proc (solo Linux).
+    :return: Bytes residentes, o None si no se puede leer.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as archivo:
+            for linea in archivo:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+def _servidor_en_proceso(host, puerto, listo):
+    """Punto de entrada del proceso servidor de la medición."""
+    async def principal():
+        evento = asyncio.Event()
+        tarea = asyncio.create_task(ServidorGato().servir(host, puerto, evento))
+        await evento.wait()
+        listo.set()
+        await tarea
+    asyncio.run(principal())
+
+def medir_servidor(partidas_concurrentes=1000, duracion=10.0, host="localhost", puerto=12399):
+    """
+    Arranca el servidor en otro proceso y lo carga con bots aleatorios. Mide la memoria por partida
+    con todas las partidas abiertas a la vez y después las partidas por segundo sostenidas.
+    """
+    listo = multiprocessing.Event()
+    proceso = multiprocessing.Process(target=_servidor_en_proceso, args=(host, puerto, listo), daemon=True)
+    proceso.start()
+    listo.wait()
+
+    async def cargar():
+        base = memoria_residente(proceso.pid)
+        inicio = asyncio.Event()
+        recibidos = 0
+        todos = asyncio.Event()
+
+        def avisar():
+            nonlocal recibidos
+            recibidos += 1
+            if recibidos == 2 * partidas_concurrentes:
+                todos.set()
+
+        fin = None
+        bots = []
+        for _ in range(2 * partidas_concurrentes):
+            bots.append(asyncio.create_task(bot_aleatorio(host, puerto, lambda: time.perf_counter() < fin,
+                                                         inicio, avisar)))
+            await asyncio.sleep(0)
+        await todos.wait()
+        activa = memoria_residente(proceso.pid)
+        if base is not None and activa is not None:
+            print(f"Memoria del servidor con {partidas_concurrentes} partidas abiertas: "
+                  f"{(activa - base) / partidas_concurrentes / 1024:.1f} KiB por partida")
+
+        comienzo = time.perf_counter()
+        fin = comienzo + duracion
+        inicio.set()
+        terminadas = sum(await asyncio.gather(*bots)) // 2  # Cada partida la cuentan sus dos bots
+        transcurrido = time.perf_counter() - comienzo
+        print(f"{terminadas} partidas en {transcurrido:.1f} s: {terminadas / transcurrido:,.0f} partidas/s sostenidas")
+
+    try:
+        asyncio.run(cargar())
+    finally:
+        proceso.terminate()
+        proceso.join()
+
+def medir_ia(partidas=300, concurrentes=20, procesos=None, host="localhost", puerto=12398):
+    """
+    Juega 'partidas' partidas de bots aleatorios contra la IA del servidor ('concurrentes' a la vez) y
+    reporta la tasa de aciertos de la caché y la latencia de la IA con y sin acierto.
+    """
+    def resumen(latencias):
+        if not latencias:
+            return "sin datos"
+        latencias = sorted(latencias)
+        return (f"{len(latencias)} jugadas, p50 {latencias[len(latencias) // 2] * 1e3:.2f} ms, "
+                f"p99 {latencias[int(len(latencias) * 0.99)] * 1e3:.2f} ms")
+
+    async def cargar():
+        servidor = ServidorGato(procesos_ia=procesos)
+        listo = asyncio.Event()
+        tarea = asyncio.create_task(servidor.servir(host, puerto, listo))
+        await listo.wait()
+        inicio = time.perf_counter()
+        await asyncio.gather(*(bot_aleatorio(host, puerto, lambda: servidor.partidas_terminadas < partidas,
+                                             modo=CONTRA_IA) for _ in range(concurrentes)))
+        transcurrido = time.perf_counter() - inicio
+        tarea.cancel()
+        cache = servidor.cache
+        print(f"{servidor.partidas_terminadas} partidas contra la IA en {transcurrido:.1f} s")
+        print(f"Caché: {cache.aciertos}/{cache.consultas} aciertos ({cache.aciertos / max(1, cache.consultas):.0%}), "
+              f"{len(cache.datos)} posiciones canónicas")
+        print("  con acierto:  " + resumen([t for acierto, t in servidor.latencias_ia if acierto]))
+        print("  con búsqueda: " + resumen([t for acierto, t in servidor.latencias_ia if not acierto]))
+
+    asyncio.run(cargar())
+
+async def espectador(host, puerto, identificador, envios, latencias):
+    """
+    Cliente que observa una partida y registra la latencia de cada delta: desde que el jugador envió
+    la jugada (según 'envios') hasta que llega aquí.
+    :param envios: Diccionario partida -> lista de instantes de envío de cada jugada, en orden.
+    :param latencias: Lista donde se agregan las latencias medidas.
+    :return: Número de tableros completos recibidos (el inicial, uno por revancha y los de fusión).
+    """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    escritor.write(empaquetar(OBSERVAR, identificador))
+    mascaras = [0, 0]
+    partida = 0
+    tableros = 0
+    try:
+        while True:
+            tipo, campos = await recibir_mensaje_async(lector)
+            if tipo == TABLERO:
+                mascaras = [campos[0], campos[1]]
+                tableros += 1
+            elif tipo == MOVIMIENTO:
+                casilla, lado = campos
+                jugadas = envios.get(partida, ())
+                n = bin(mascaras[0] | mascaras[1]).count("1")  # Jugadas anteriores de esta partida
+                if n < len(jugadas):
+                    latencias.append(time.perf_counter() - jugadas[n])
+                mascaras[lado] |= 1 << casilla
+            elif tipo == RESULTADO:
+                partida += 1
+            elif tipo == DESPEDIDA:
+                return tableros
+    except (ConexionCerrada, ConnectionError):
+        return tableros
+    finally:
+        escritor.close()
+
+def medir_espectadores(espectadores=1000, duracion=10.0, host="localhost", puerto=12397):
+    """
+    Dos bots aleatorios juegan revanchas seguidas durante 'duracion' segundos, primero sin público y
+    después con 'espectadores' clientes observando la partida (más uno que nunca lee su socket).
+    Reporta las jugadas por segundo de los jugadores en ambos casos, la latencia de los deltas hasta
+    los espectadores y qué pasó con el espectador detenido. Servidor y clientes comparten el proceso.
+    """
+    def resumen(latencias):
+        latencias = sorted(latencias)
+        return (f"p50 {latencias[len(latencias) // 2] * 1e3:.2f} ms, "
+                f"p99 {latencias[int(len(latencias) * 0.99)] * 1e3:.2f} ms")
+
+    async def ronda(publico):
+        servidor = ServidorGato()
+        listo = asyncio.Event()
+        tarea = asyncio.create_task(servidor.servir(host, puerto, listo))
+        await listo.wait()
+
+        envios = {}
+        inicio = asyncio.Event()
+        recibidos = 0
+        preparados = asyncio.Event()
+
+        def avisar():
+            nonlocal recibidos
+            recibidos += 1
+            if recibidos == 2:
+                preparados.set()
+
+        def al_mover(partida):
+            envios.setdefault(partida, []).append(time.perf_counter())
+
+        fin = None
+        bots = [asyncio.create_task(bot_aleatorio(host, puerto, lambda: time.perf_counter() < fin, inicio, avisar,
+                                                  al_mover=al_mover)) for _ in range(2)]
+        await preparados.wait()
+        identificador = next(iter(servidor.transmisiones))
+
+        latencias = []
+        observadores = []
+        for _ in range(publico):
+            observadores.append(asyncio.create_task(espectador(host, puerto, identificador, envios, latencias)))
+            await asyncio.sleep(0)
+        detenido = None
+        if publico:
+            # Espectador que nunca lee: con búferes pequeños se atrasa enseguida
+            detenido = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            detenido.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+            detenido.setblocking(False)
+            await asyncio.get_running_loop().sock_connect(detenido, (host, puerto))
+            detenido.send(empaquetar(OBSERVAR, identificador))
+            while len(servidor.transmisiones[identificador].suscriptores) < publico + 1:
+                await asyncio.sleep(0.01)
+
+        comienzo = time.perf_counter()
+        fin = comienzo + duracion
+        inicio.set()
+        terminadas = sum(await asyncio.gather(*bots)) // 2
+        transcurrido = time.perf_counter() - comienzo
+        tableros = await asyncio.gather(*observadores)
+        tarea.cancel()
+        jugadas = sum(len(lista) for lista in envios.values())
+        print(f"{publico} espectadores: {terminadas} partidas, {jugadas / transcurrido:,.0f} jugadas/s de los jugadores")
+        if publico:
+            print(f"  Deltas entregados: {len(latencias):,} de {jugadas * publico:,} "
+                  f"({len(latencias) / max(1, jugadas * publico):.1%}); latencia jugador -> espectador: {resumen(latencias)}")
+            print(f"  Tableros completos por espectador: {sum(tableros) / publico:.1f} "
+                  f"(1 inicial + {terminadas - 1} revanchas + fusiones)")
+            print(f"  Tramas fusionadas: {servidor.tramas_fusionadas:,}; "
+                  f"espectadores descartados por lentos: {servidor.espectadores_descartados}")
+            detenido.close()
+        return jugadas / transcurrido
+
+    base = asyncio.run(ronda(0))
+    con_publico = asyncio.run(ronda(espectadores))
+    print(f"Rendimiento de los jugadores con {espectadores} espectadores: {con_publico / base:.0%} del de sin público")
 
 # Iniciar el servidor
 if __name__ == "__main__":
-    juego_servidor()
+    parser = argparse.ArgumentParser(description="Servidor del gato 4x4 con partidas simultáneas.")
+    parser.add_argument("--medir", type=int, metavar="PARTIDAS", default=None,
+                        help="En lugar de servir, mide memoria y partidas/s con este número de partidas simultáneas")
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos de carga sostenida en --medir")
+    parser.add_argument("--medir-ia", type=int, metavar="PARTIDAS", default=None,
+                        help="En lugar de servir, juega este número de partidas de bots contra la IA y mide la caché")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos de búsqueda de la IA")
+    parser.add_argument("--medir-espectadores", type=int, metavar="ESPECTADORES", default=None,
+                        help="En lugar de servir, mide la difusión de una partida a este número de espectadores")
+    parser.add_argument("--bitacora", default=RUTA_BITACORA, help="Directorio de la bitácora de partidas")
+    parser.add_argument("--sin-bitacora", action="store_true", help="No registrar las partidas")
+    args = parser.parse_args()
+    if args.medir:
+        medir_servidor(args.medir, args.duracion)
+    elif args.medir_espectadores:
+        medir_espectadores(args.medir_espectadores, args.duracion)
+    elif args.medir_ia:
+        medir_ia(args.medir_ia, procesos=args.procesos)
+    else:
+        juego_servidor(bitacora=None if args.sin_bitacora else args.bitacora)
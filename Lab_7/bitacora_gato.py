@@ -0,0 +1,324 @@
+import argparse
+import os
+import random
+import struct
+import time
+
+from motor_gato import GANA, LLENO, SIMETRIAS, TAMAÑO
+from tablebase_gato import canonico_con_simetria
+
+# ------------------- Bitácora binaria de partidas del servidor del gato ------------------- #
+# Cada evento de una partida es un registro de 5 bytes: 1 byte de tipo y dato, y 4 bytes con el
+# identificador de la partida (el mismo que reciben los jugadores en el mensaje PARTIDA). Los
+# registros solo se agregan al final; el servidor los acumula en memoria, los escribe en lote y
+# llama a fsync unas pocas veces por segundo. Cuando un segmento supera su tamaño máximo se abre
+# el siguiente (bitacora_000001.bin, bitacora_000002.bin, ...).
+#
+# Byte de tipo: los 2 bits altos son el tipo y los 6 bajos el dato
+#   INICIO  dato = profundidad << 1 | ia   (tablero vacío, empieza X)
+#           ia = 1 si el lado O lo juega la IA del servidor; profundidad es la de su búsqueda (1-31),
+#           o 0 si no se conoce (partidas entre personas o bitácoras anteriores a este campo)
+#   JUGADA  dato = lado << 4 | casilla
+#   FIN     dato = 0 gana X, 1 gana O, 2 empate, 3 partida abandonada
+# Un identificador puede tener varias partidas seguidas (las revanchas): cada una empieza con INICIO.
+
+INICIO, JUGADA, FIN = 0, 1, 2
+GANA_X, GANA_O, EMPATE, ABANDONADA = 0, 1, 2, 3
+
+RUTA_PREDETERMINADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bitacora")
+MAGICO = b"GATOBIT1"
+REGISTRO = struct.Struct("<BI")
+PROFUNDIDAD_MAXIMA = 31            # La profundidad de la IA ocupa 5 bits del registro INICIO
+TAMAÑO_SEGMENTO = 64 * 1024 * 1024  # Bytes a partir de los cuales se abre un segmento nuevo
+INTERVALO_FSYNC = 0.2               # Segundos entre escrituras en lote (y su fsync) en el servidor
+
+def ruta_segmento(directorio, numero):
+    """Nombre del segmento 'numero' dentro del directorio."""
+    return os.path.join(directorio, f"bitacora_{numero:06d}.bin")
+
+def listar_segmentos(directorio):
+    """
+    Segmentos existentes en orden de escritura.
+    :return: Lista de tuplas (número, ruta).
+    """
+    if not os.path.isdir(directorio):
+        return []
+    segmentos = []
+    for nombre in os.listdir(directorio):
+        if nombre.startswith("bitacora_") and nombre.endswith(".bin"):
+            numero = nombre[len("bitacora_"):-len(".bin")]
+            if numero.isdigit():
+                segmentos.append((int(numero), os.path.join(directorio, nombre)))
+    return sorted(segmentos)
+
+class Bitacora:
+    """
+    Escritor de la bitácora. Los métodos inicio/jugada/fin solo agregan bytes a un búfer en memoria;
+    escribir() los pasa al archivo en una sola llamada y sincronizar() hace el fsync (el servidor la
+    ejecuta fuera del bucle de eventos). Un registro incompleto al final del último segmento (por un
+    corte a mitad de escritura) se descarta al abrir.
+    """
+
+    def __init__(self, directorio=RUTA_PREDETERMINADA, tamaño_segmento=TAMAÑO_SEGMENTO):
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.tamaño_segmento = tamaño_segmento
+        self.pendiente = bytearray()
+        self.registros = 0
+        self.rotados = []  # Descriptores de segmentos ya llenos, pendientes de fsync y cierre
+        segmentos = listar_segmentos(directorio)
+        self.numero = segmentos[-1][0] if segmentos else 1
+        self.abrir_segmento()
+
+    def abrir_segmento(self):
+        """Abre el segmento actual para agregar al final, creándolo o reparando su cola si hace falta."""
+        ruta = ruta_segmento(self.directorio, self.numero)
+        self.descriptor = os.open(ruta, os.O_WRONLY | os.O_CREAT, 0o644)
+        self.tamaño = os.fstat(self.descriptor).st_size
+        if self.tamaño < len(MAGICO):
+            os.ftruncate(self.descriptor, 0)
+            os.write(self.descriptor, MAGICO)
+            self.tamaño = len(MAGICO)
+        else:
+            completos = len(MAGICO) + (self.tamaño - len(MAGICO)) // REGISTRO.size * REGISTRO.size
+            if completos != self.tamaño:
+                os.ftruncate(self.descriptor, completos)
+                self.tamaño = completos
+        os.lseek(self.descriptor, self.tamaño, os.SEEK_SET)
+
+    def inicio(self, partida, contra_ia=False, profundidad=0):
+        """
+        Registra el comienzo de una partida (o revancha) con el tablero vacío.
+        :param profundidad: Profundidad de búsqueda de la IA en esta partida (0 si no aplica).
+        """
+        if not 0 <= profundidad <= PROFUNDIDAD_MAXIMA:
+            raise ValueError(f"La profundidad de la IA debe estar entre 0 y {PROFUNDIDAD_MAXIMA}")
+        self.pendiente += REGISTRO.pack(INICIO << 6 | profundidad << 1 | (1 if contra_ia else 0), partida)
+        self.registros += 1
+
+    def jugada(self, partida, casilla, lado):
+        """Registra la casilla (0-15) que jugó el lado (0 = X, 1 = O)."""
+        self.pendiente += REGISTRO.pack(JUGADA << 6 | lado << 4 | casilla, partida)
+        self.registros += 1
+
+    def fin(self, partida, resultado):
+        """Registra el resultado: GANA_X, GANA_O, EMPATE o ABANDONADA."""
+        self.pendiente += REGISTRO.pack(FIN << 6 | resultado, partida)
+        self.registros += 1
+
+    def escribir(self):
+        """
+        Pasa al archivo todo lo acumulado y rota el segmento si superó su tamaño máximo. El segmento
+        lleno no se sincroniza aquí (el servidor llama a escribir() en el bucle de eventos): su
+        descriptor queda en self.rotados hasta el siguiente sincronizar().
+        :return: True si había algo que escribir (y por lo tanto algo que sincronizar).
+        """
+        if not self.pendiente:
+            return False
+        datos = bytes(self.pendiente)
+        self.pendiente.clear()
+        escritos = 0
+        while escritos < len(datos):
+            escritos += os.write(self.descriptor, datos[escritos:])
+        self.tamaño += len(datos)
+        if self.tamaño >= self.tamaño_segmento:
+            self.rotados.append(self.descriptor)
+            self.numero += 1
+            self.abrir_segmento()
+        return True
+
+    def cerrar_rotados(self):
+        """fsync y cierre de los segmentos que escribir() dejó llenos."""
+        while self.rotados:
+            descriptor = self.rotados.pop(0)
+            os.fsync(descriptor)
+            os.close(descriptor)
+
+    def sincronizar(self):
+        """
+        fsync de los segmentos rotados y del actual: lo escrito sobrevive a un corte de energía.
+        No debe coincidir con escribir() ni con cerrar() (el servidor la espera antes de llamarlas).
+        """
+        self.cerrar_rotados()
+        os.fsync(self.descriptor)
+
+    def cerrar(self):
+        """Escribe lo pendiente, sincroniza y cierra."""
+        self.escribir()
+        self.sincronizar()
+        os.close(self.descriptor)
+
+# ------------------- Lectura y reproducción ------------------- #
+
+def registros(directorio=RUTA_PREDETERMINADA):
+    """
+    Recorre todos los registros de la bitácora en orden, segmento por segmento (cada uno se lee
+    de una vez y se decodifica con struct.iter_unpack). Ignora un registro final incompleto.
+    :return: Un generador de tuplas (byte de tipo y dato, partida).
+    """
+    for _, ruta in listar_segmentos(directorio):
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        if datos[:len(MAGICO)] != MAGICO:
+            raise ValueError(f"{ruta} no es un segmento de bitácora del gato")
+        fin = len(MAGICO) + (len(datos) - len(MAGICO)) // REGISTRO.size * REGISTRO.size
+        yield from REGISTRO.iter_unpack(memoryview(datos)[len(MAGICO):fin])
+
+def reproducir(directorio=RUTA_PREDETERMINADA):
+    """
+    Reconstruye las partidas de la bitácora.
+    :return: Una tupla (terminadas, en_curso). 'terminadas' es un generador de tuplas
+             (partida, contra_ia, profundidad, casillas, resultado), con las casillas en orden como
+             bytes; 'en_curso' es un diccionario que se completa al agotar el generador, con
+             partida -> (contra_ia, profundidad, casillas) de las partidas que no tienen FIN.
+    """
+    en_curso = {}
+
+    def terminadas():
+        abiertas = en_curso
+        for codigo, partida in registros(directorio):
+            tipo = codigo >> 6
+            if tipo == JUGADA:
+                abierta = abiertas.get(partida)
+                if abierta is not None:
+                    abierta[2].append(codigo & 15)
+            elif tipo == INICIO:
+                abiertas[partida] = (codigo & 1 == 1, codigo >> 1 & PROFUNDIDAD_MAXIMA, bytearray())
+            else:
+                abierta = abiertas.pop(partida, None)
+                if abierta is not None:
+                    yield partida, abierta[0], abierta[1], bytes(abierta[2]), codigo & 63
+
+    return terminadas(), en_curso
+
+def reconstruir(casillas):
+    """
+    Tablero de una partida a partir de sus casillas (X juega primero).
+    :return: Una tupla (x, o, turno) como en el mensaje TABLERO.
+    """
+    mascaras = [0, 0]
+    for n, c in enumerate(casillas):
+        mascaras[n & 1] |= 1 << c
+    return mascaras[0], mascaras[1], len(casillas) & 1
+
+def ultima_partida(directorio=RUTA_PREDETERMINADA):
+    """
+    Mayor identificador registrado; los identificadores crecen, así que basta con leer el último
+    segmento que tenga registros.
+    :return: El identificador, o 0 si la bitácora está vacía.
+    """
+    for _, ruta in reversed(listar_segmentos(directorio)):
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        fin = len(MAGICO) + (len(datos) - len(MAGICO)) // REGISTRO.size * REGISTRO.size
+        if fin > len(MAGICO):
+            return max(partida for _, partida in REGISTRO.iter_unpack(memoryview(datos)[len(MAGICO):fin]))
+    return 0
+
+def sembrar_cache(terminadas, cache, profundidad):
+    """
+    Llena una caché de jugadas (Lab_7S.CacheJugadas) con las respuestas que dio la IA del servidor en
+    partidas registradas: la IA es determinista, así que su jugada en una posición sigue valiendo, pero
+    solo si buscó a la misma profundidad. Las partidas con otra profundidad (o sin ella registrada)
+    se saltan.
+    :param terminadas: Partidas como las que genera reproducir().
+    :param profundidad: Profundidad de búsqueda de la IA que va a usar la caché.
+    :return: Número de jugadas guardadas.
+    """
+    guardadas = 0
+    for _, contra_ia, profundidad_partida, casillas, _ in terminadas:
+        if not contra_ia or profundidad_partida != profundidad:
+            continue
+        x = o = 0
+        for n, c in enumerate(casillas):
+            if n & 1:
+                # Jugada de la IA (lado O): clave canónica de (propias, rivales) y casilla en ese marco
+                clave, simetria = canonico_con_simetria(o << 16 | x)
+                cache.guardar(clave, SIMETRIAS[simetria][c])
+                guardadas += 1
+                o |= 1 << c
+            else:
+                x |= 1 << c
+    return guardadas
+
+# ------------------- Medición ------------------- #
+
+def generar_aleatorias(directorio, partidas, simultaneas=1000, semilla=0, tamaño_segmento=TAMAÑO_SEGMENTO):
+    """
+    Escribe 'partidas' partidas aleatorias intercaladas ('simultaneas' abiertas a la vez, como en el
+    servidor), con una escritura en lote cada 10 000 registros.
+    :return: Una tupla (registros, segundos).
+    """
+    generador = random.Random(semilla)
+    bitacora = Bitacora(directorio, tamaño_segmento)
+    inicio = time.perf_counter()
+    abiertas = {}  # partida -> (casillas restantes, mascaras, número de jugada)
+    siguiente = 1
+    creadas = 0
+    while creadas < partidas or abiertas:
+        while creadas < partidas and len(abiertas) < simultaneas:
+            abiertas[siguiente] = (generador.sample(range(TAMAÑO * TAMAÑO), TAMAÑO * TAMAÑO), [0, 0], [0])
+            contra_ia = generador.random() < 0.5
+            bitacora.inicio(siguiente, contra_ia, 4 if contra_ia else 0)
+            siguiente += 1
+            creadas += 1
+        for partida in list(abiertas):
+            casillas, mascaras, n = abiertas[partida]
+            lado = n[0] & 1
+            c = casillas[n[0]]
+            bitacora.jugada(partida, c, lado)
+            mascaras[lado] |= 1 << c
+            n[0] += 1
+            if GANA[mascaras[lado]]:
+                bitacora.fin(partida, lado)
+                del abiertas[partida]
+            elif mascaras[0] | mascaras[1] == LLENO:
+                bitacora.fin(partida, EMPATE)
+                del abiertas[partida]
+        if len(bitacora.pendiente) >= 10000 * REGISTRO.size:
+            bitacora.escribir()
+            bitacora.cerrar_rotados()
+    total = bitacora.registros
+    bitacora.cerrar()
+    return total, time.perf_counter() - inicio
+
+def medir_lectura(directorio):
+    """Reproduce toda la bitácora e imprime partidas por segundo y bytes por jugada."""
+    tamaño = sum(os.path.getsize(ruta) for _, ruta in listar_segmentos(directorio))
+    inicio = time.perf_counter()
+    terminadas, en_curso = reproducir(directorio)
+    partidas = jugadas = 0
+    for _, _, _, casillas, _ in terminadas:
+        partidas += 1
+        jugadas += len(casillas)
+    transcurrido = time.perf_counter() - inicio
+    print(f"{partidas:,} partidas terminadas ({len(en_curso):,} en curso), {jugadas:,} jugadas, "
+          f"{tamaño / 1e6:.1f} MB en {len(listar_segmentos(directorio))} segmentos "
+          f"({tamaño / max(1, jugadas):.2f} bytes por jugada)")
+    print(f"Reproducción: {transcurrido:.2f} s, {partidas / transcurrido:,.0f} partidas/s, "
+          f"{tamaño / transcurrido / 1e6:.0f} MB/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitácora binaria de partidas del servidor del gato 4x4.")
+    parser.add_argument("accion", choices=["leer", "generar", "en-curso"],
+                        help="leer: reproduce la bitácora y mide la velocidad; generar: escribe partidas aleatorias "
+                             "para medir; en-curso: lista las partidas sin terminar y su tablero")
+    parser.add_argument("--ruta", default=RUTA_PREDETERMINADA, help="Directorio de la bitácora")
+    parser.add_argument("--partidas", type=int, default=1000000, help="Partidas aleatorias de 'generar'")
+    parser.add_argument("--segmento", type=int, default=TAMAÑO_SEGMENTO, help="Bytes por segmento en 'generar'")
+    args = parser.parse_args()
+
+    if args.accion == "generar":
+        total, transcurrido = generar_aleatorias(args.ruta, args.partidas, tamaño_segmento=args.segmento)
+        print(f"{total:,} registros escritos en {transcurrido:.1f} s ({total / transcurrido:,.0f} registros/s)")
+    elif args.accion == "leer":
+        medir_lectura(args.ruta)
+    else:
+        terminadas, en_curso = reproducir(args.ruta)
+        for _ in terminadas:
+            pass
+        for partida, (contra_ia, profundidad, casillas) in sorted(en_curso.items()):
+            x, o, turno = reconstruir(casillas)
+            ia = f" (contra la IA, profundidad {profundidad or '?'})" if contra_ia else ""
+            print(f"Partida {partida}{ia}: {len(casillas)} jugadas, "
+                  f"x={x:#06x} o={o:#06x}, turno de {'XO'[turno]}")
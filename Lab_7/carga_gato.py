@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import math
+import multiprocessing
+import random
+import time
+
+from motor_gato import GANA
+from protocolo_gato import (CONTRA_HUMANO, CONTRA_IA, DESPEDIDA, MODO, MOVIMIENTO, RESULTADO, REVANCHA, TABLERO,
+                            TAMAÑO, ConexionCerrada, empaquetar, recibir_mensaje_async)
+
+# --- Generador de carga sin interfaz para Lab_7S.py ---
+# Abre N conexiones de bots que juegan con el protocolo real y mide la latencia de ida y vuelta de
+# cada jugada: desde que el bot envía su casilla hasta que el servidor le devuelve el delta de esa
+# misma jugada. Las etapas con distinto número de conexiones muestran dónde se satura el servidor.
+
+TIEMPO_ESPERA = 30.0  # Segundos sin mensajes antes de contar un timeout
+BASE_HISTOGRAMA = 1.05  # Cada cubeta del histograma es un 5 % más ancha que la anterior
+MINIMO_HISTOGRAMA = 1e-6  # Latencia de la primera cubeta (1 µs)
+
+class Histograma:
+    """Histograma logarítmico de latencias: memoria fija sin importar cuántas muestras se registren."""
+
+    def __init__(self, cubetas=None):
+        self.cubetas = dict(cubetas or {})
+        self.total = sum(self.cubetas.values())
+
+    def registrar(self, segundos):
+        """
+        Suma una muestra a su cubeta.
+        :param segundos: La latencia medida.
+        """
+        indice = int(math.log(max(segundos, MINIMO_HISTOGRAMA) / MINIMO_HISTOGRAMA) / math.log(BASE_HISTOGRAMA))
+        self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+        self.total += 1
+
+    def combinar(self, otro):
+        """Agrega las cubetas de otro histograma (por ejemplo, de otro proceso)."""
+        for indice, cuenta in otro.cubetas.items():
+            self.cubetas[indice] = self.cubetas.get(indice, 0) + cuenta
+        self.total += otro.total
+
+    def percentil(self, p):
+        """
+        Latencia aproximada (centro geométrico de la cubeta) bajo la cual queda el p % de las muestras.
+        :return: Segundos, o NaN si no hay muestras.
+        """
+        if not self.total:
+            return math.nan
+        objetivo = self.total * p / 100
+        acumulado = 0
+        for indice in sorted(self.cubetas):
+            acumulado += self.cubetas[indice]
+            if acumulado >= objetivo:
+                return MINIMO_HISTOGRAMA * BASE_HISTOGRAMA ** (indice + 0.5)
+        return MINIMO_HISTOGRAMA * BASE_HISTOGRAMA ** (max(self.cubetas) + 0.5)
+
+def nuevas_estadisticas():
+    """Contadores de una etapa."""
+    return {"jugadas": 0, "partidas": 0, "errores_conexion": 0, "timeouts": 0, "abandonos": 0}
+
+async def jugar_bot(host, puerto, fin, modo, guion, histograma, estadisticas, generador):
+    """
+    Un bot: se conecta, juega partidas con revancha hasta el instante 'fin' y se despide.
+    :param guion: Lista de casillas preferidas; el bot juega la primera libre y, si no queda ninguna, al azar.
+    """
+    try:
+        lector, escritor = await asyncio.wait_for(asyncio.open_connection(host, puerto), TIEMPO_ESPERA)
+    except (OSError, asyncio.TimeoutError):
+        estadisticas["errores_conexion"] += 1
+        return
+    escritor.write(empaquetar(MODO, modo))
+    lado = None
+    mascaras = [0, 0]
+    turno = 0
+    enviada = None  # (casilla, instante) de la jugada propia que espera su delta
+    declinada = False
+
+    def mover():
+        nonlocal enviada
+        ocupadas = mascaras[0] | mascaras[1]
+        preferidas = [c for c in guion if not ocupadas >> c & 1]
+        if preferidas:
+            casilla = preferidas[0]
+        else:
+            casilla = generador.choice([c for c in range(TAMAÑO * TAMAÑO) if not ocupadas >> c & 1])
+        enviada = (casilla, time.perf_counter())
+        escritor.write(empaquetar(MOVIMIENTO, casilla, 0))
+
+    try:
+        while True:
+            tipo, campos = await asyncio.wait_for(recibir_mensaje_async(lector), TIEMPO_ESPERA)
+            if lado is None:
+                (lado,) = campos  # El primer mensaje es la asignación
+            elif tipo == TABLERO:
+                x, o, turno = campos
+                mascaras = [x, o]
+                if turno == lado:
+                    mover()
+            elif tipo == MOVIMIENTO:
+                casilla, quien = campos
+                if enviada is not None and quien == lado and casilla == enviada[0]:
+                    histograma.registrar(time.perf_counter() - enviada[1])
+                    estadisticas["jugadas"] += 1
+                    enviada = None
+                mascaras[quien] |= 1 << casilla
+                if not GANA[mascaras[quien]] and mascaras[0] | mascaras[1] != (1 << TAMAÑO * TAMAÑO) - 1:
+                    turno = 1 - quien
+                    if turno == lado:
+                        mover()
+            elif tipo == RESULTADO:
+                estadisticas["partidas"] += 1
+            elif tipo == REVANCHA:
+                declinada = time.perf_counter() >= fin
+                escritor.write(empaquetar(REVANCHA, 0 if declinada else 1))
+            elif tipo == DESPEDIDA:
+                if not declinada:
+                    estadisticas["abandonos"] += 1  # El rival se fue o el servidor cerró la partida
+                return
+    except asyncio.TimeoutError:
+        estadisticas["timeouts"] += 1
+    except (ConexionCerrada, ConnectionError):
+        if not declinada:
+            estadisticas["abandonos"] += 1
+    finally:
+        escritor.close()
+
+def _etapa_proceso(argumentos):
+    """
+    Ejecuta los bots que le tocan a un proceso durante una etapa.
+    :return: (cubetas del histograma, estadísticas, segundos transcurridos).
+    """
+    host, puerto, conexiones, duracion, modo, guion, semilla = argumentos
+    histograma = Histograma()
+    estadisticas = nuevas_estadisticas()
+    generador = random.Random(semilla)
+
+    async def principal():
+        fin = time.perf_counter() + duracion
+        bots = []
+        for _ in range(conexiones):
+            bots.append(asyncio.create_task(jugar_bot(host, puerto, fin, modo, guion, histograma,
+                                                      estadisticas, generador)))
+            await asyncio.sleep(0)  # Reparte las conexiones en lugar de abrirlas todas en un mismo paso
+        await asyncio.gather(*bots)
+
+    inicio = time.perf_counter()
+    asyncio.run(principal())
+    return histograma.cubetas, estadisticas, time.perf_counter() - inicio
+
+def etapa(host, puerto, conexiones, duracion, modo=CONTRA_HUMANO, guion=(), procesos=1, semilla=0):
+    """
+    Corre 'conexiones' bots repartidos en 'procesos' procesos durante 'duracion' segundos.
+    :return: (histograma combinado, estadísticas sumadas, segundos transcurridos).
+    """
+    reparto = [conexiones // procesos + (1 if p < conexiones % procesos else 0) for p in range(procesos)]
+    tareas = [(host, puerto, n, duracion, modo, list(guion), semilla + p) for p, n in enumerate(reparto) if n]
+    if len(tareas) == 1:
+        resultados = [_etapa_proceso(tareas[0])]
+    else:
+        with multiprocessing.Pool(len(tareas)) as grupo:
+            resultados = grupo.map(_etapa_proceso, tareas)
+    histograma = Histograma()
+    estadisticas = nuevas_estadisticas()
+    for cubetas, parciales, _ in resultados:
+        histograma.combinar(Histograma(cubetas))
+        for clave, valor in parciales.items():
+            estadisticas[clave] += valor
+    return histograma, estadisticas, max(transcurrido for _, _, transcurrido in resultados)
+
+def prueba_de_carga(host, puerto, niveles, duracion, modo=CONTRA_HUMANO, guion=(), procesos=1):
+    """
+    Corre una etapa por cada número de conexiones y resume latencias, errores y rendimiento.
+    Marca como saturación la primera etapa en la que el p99 es más del doble que en la primera y
+    las jugadas por segundo crecen menos de un 10 % respecto a la etapa anterior. En partidas entre bots
+    los números de conexiones impares se redondean hacia arriba para que ningún bot quede sin rival.
+    """
+    if modo == CONTRA_HUMANO and any(conexiones % 2 for conexiones in niveles):
+        # Un bot sin pareja se quedaría esperando rival hasta TIEMPO_ESPERA y alargaría la etapa
+        niveles = [conexiones + conexiones % 2 for conexiones in niveles]
+        print("Aviso: en partidas entre bots las conexiones se redondean a un número par")
+    print(f"{'Conexiones':>10} {'Jugadas/s':>10} {'Partidas/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+          f"{'Err. con.':>9} {'Timeouts':>8} {'Abandonos':>9}")
+    primera_p99 = None
+    anterior = None
+    saturacion = None
+    for conexiones in niveles:
+        histograma, estadisticas, transcurrido = etapa(host, puerto, conexiones, duracion, modo, guion, procesos)
+        jugadas_s = estadisticas["jugadas"] / transcurrido
+        # En partidas entre bots cada partida la cuentan sus dos jugadores
+        partidas_s = estadisticas["partidas"] / transcurrido / (2 if modo == CONTRA_HUMANO else 1)
+        p99 = histograma.percentil(99)
+        print(f"{conexiones:>10} {jugadas_s:>10,.0f} {partidas_s:>10,.1f} {histograma.percentil(50) * 1e3:>9.2f} "
+              f"{histograma.percentil(95) * 1e3:>9.2f} {p99 * 1e3:>9.2f} {estadisticas['errores_conexion']:>9} "
+              f"{estadisticas['timeouts']:>8} {estadisticas['abandonos']:>9}")
+        if primera_p99 is None:
+            primera_p99 = p99
+        elif saturacion is None and p99 > 2 * primera_p99 and jugadas_s < 1.1 * anterior:
+            saturacion = conexiones
+        anterior = jugadas_s
+    if saturacion is not None:
+        print(f"\nSaturación aproximada a partir de {saturacion} conexiones")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generador de carga con bots para el servidor del gato (Lab_7S.py).")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--puerto", type=int, default=12345)
+    parser.add_argument("--conexiones", type=int, nargs="+", default=[50, 100, 200, 400],
+                        help="Número de bots de cada etapa")
+    parser.add_argument("--duracion", type=float, default=5.0, help="Segundos de cada etapa")
+    parser.add_argument("--ia", action="store_true", help="Cada bot juega contra la IA del servidor")
+    parser.add_argument("--guion", type=int, nargs="*", default=[],
+                        help="Casillas (0-15) que los bots juegan en orden de preferencia; sin guion juegan al azar")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos entre los que se reparten los bots")
+    parser.add_argument("--servidor", action="store_true",
+                        help="Arranca un servidor Lab_7S en otro proceso en lugar de usar uno ya abierto")
+    args = parser.parse_args()
+    if any(not 0 <= casilla < TAMAÑO * TAMAÑO for casilla in args.guion):
+        parser.error(f"Las casillas de --guion deben estar entre 0 y {TAMAÑO * TAMAÑO - 1}")
+
+    proceso = None
+    if args.servidor:
+        from Lab_7S import _servidor_en_proceso
+        listo = multiprocessing.Event()
+        proceso = multiprocessing.Process(target=_servidor_en_proceso, args=(args.host, args.puerto, listo))
+        proceso.start()
+        listo.wait()
+    try:
+        prueba_de_carga(args.host, args.puerto, args.conexiones, args.duracion,
+                        CONTRA_IA if args.ia else CONTRA_HUMANO, args.guion, args.procesos)
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.join()
@@ -0,0 +1,225 @@
+import argparse
+import math
+import random
+import time
+
+from motor_gato import BITS, GANA, LLENO, TAMAÑO, MotorGato, casilla
+
+# ------------------- Búsqueda de árbol Monte Carlo (UCT) para el gato 4x4 ------------------- #
+# En lugar de una heurística a profundidad fija, estima el valor de cada jugada con partidas
+# aleatorias (playouts) sobre las mismas máscaras de 16 bits que motor_gato.py. El árbol crece
+# hacia las jugadas prometedoras según la fórmula UCT y se conserva entre turnos.
+
+EXPLORACION = math.sqrt(2)  # Constante C de UCT
+REVISION = 64               # Cada cuántos playouts se revisan el tiempo y la cancelación
+
+def simular(ia, jugador, turno_ia, generador):
+    """
+    Juega al azar desde la posición hasta el final y devuelve la recompensa para la IA:
+    1 si gana, 0 si pierde y 0.5 si empata.
+    """
+    ocupadas = ia | jugador
+    vacias = [c for c in range(TAMAÑO * TAMAÑO) if not ocupadas >> c & 1]
+    generador.shuffle(vacias)
+    for c in vacias:
+        if turno_ia:
+            ia |= 1 << c
+            if GANA[ia]:
+                return 1.0
+        else:
+            jugador |= 1 << c
+            if GANA[jugador]:
+                return 0.0
+        turno_ia = not turno_ia
+    return 0.5
+
+class NodoMCTS:
+    """Posición del árbol. 'valor' acumula la recompensa del jugador que hizo la jugada que lleva a este nodo."""
+
+    __slots__ = ("ia", "jugador", "turno_ia", "bit", "padre", "hijos", "sin_probar", "visitas", "valor", "final")
+
+    def __init__(self, ia, jugador, turno_ia, bit=0, padre=None, generador=None):
+        self.ia = ia
+        self.jugador = jugador
+        self.turno_ia = turno_ia
+        self.bit = bit        # Jugada que lleva a este nodo desde el padre
+        self.padre = padre
+        self.hijos = []
+        self.visitas = 0
+        self.valor = 0.0
+        # Recompensa para la IA si la partida ya terminó, None si sigue
+        if GANA[ia]:
+            self.final = 1.0
+        elif GANA[jugador]:
+            self.final = 0.0
+        elif ia | jugador == LLENO:
+            self.final = 0.5
+        else:
+            self.final = None
+        vacias = LLENO & ~(ia | jugador) if self.final is None else 0
+        self.sin_probar = [1 << c for c in range(TAMAÑO * TAMAÑO) if vacias >> c & 1]
+        if generador is not None:
+            generador.shuffle(self.sin_probar)  # Orden aleatorio de expansión
+
+    def expandir(self, generador):
+        """Crea el hijo de una jugada todavía no probada."""
+        bit = self.sin_probar.pop()
+        if self.turno_ia:
+            hijo = NodoMCTS(self.ia | bit, self.jugador, False, bit, self, generador)
+        else:
+            hijo = NodoMCTS(self.ia, self.jugador | bit, True, bit, self, generador)
+        self.hijos.append(hijo)
+        return hijo
+
+    def seleccionar(self):
+        """Elige el hijo con mayor cota UCT."""
+        log_visitas = math.log(self.visitas)
+        mejor, mejor_cota = None, -math.inf
+        for hijo in self.hijos:
+            cota = hijo.valor / hijo.visitas + EXPLORACION * math.sqrt(log_visitas / hijo.visitas)
+            if cota > mejor_cota:
+                mejor, mejor_cota = hijo, cota
+        return mejor
+
+class MotorMCTS:
+    """
+    Motor UCT con presupuesto de playouts o de tiempo. El árbol de la jugada anterior se reutiliza si la
+    posición nueva es un descendiente suyo (normalmente la jugada propia seguida de la respuesta del rival).
+    """
+
+    def __init__(self, semilla=None):
+        self.generador = random.Random(semilla)
+        self.raiz = None
+        self.cancelado = False
+        self.playouts = 0          # Playouts de la última búsqueda
+        self.reutilizados = 0      # Visitas heredadas del árbol anterior
+        self.tiempo = 0.0
+
+    def cancelar(self):
+        """Pide detener la búsqueda en curso (se puede llamar desde otro hilo)."""
+        self.cancelado = True
+
+    def reanudar(self):
+        """Limpia el indicador de cancelación antes de una nueva búsqueda."""
+        self.cancelado = False
+
+    def reutilizar(self, ia, jugador):
+        """Busca la posición entre la raíz anterior y sus nietos; si no está, empieza un árbol nuevo."""
+        pendientes = [self.raiz] if self.raiz is not None else []
+        for _ in range(3):
+            siguientes = []
+            for nodo in pendientes:
+                if nodo.ia == ia and nodo.jugador == jugador and nodo.turno_ia:
+                    nodo.padre = None  # Libera el resto del árbol anterior
+                    return nodo
+                if BITS[nodo.ia | nodo.jugador] < BITS[ia | jugador]:
+                    siguientes.extend(h for h in nodo.hijos if h.ia & ~ia == 0 and h.jugador & ~jugador == 0)
+            pendientes = siguientes
+        return NodoMCTS(ia, jugador, True, generador=self.generador)
+
+    def mejor_movimiento(self, ia, jugador, tiempo_limite=None, playouts=None):
+        """
+        Ejecuta playouts hasta agotar 'playouts' o 'tiempo_limite' segundos (al menos uno de los dos)
+        y devuelve (fila, columna) de la jugada más visitada. Juega la IA.
+        """
+        if tiempo_limite is None and playouts is None:
+            raise ValueError("Se necesita un límite de tiempo o de playouts")
+        if playouts is not None and playouts < 1:
+            raise ValueError(f"Se necesita al menos un playout (se pidieron {playouts})")
+        raiz = self.reutilizar(ia, jugador)
+        self.raiz = raiz
+        self.reutilizados = raiz.visitas
+        if raiz.final is not None:
+            return (-1, -1)
+
+        generador = self.generador
+        inicio = time.perf_counter()
+        limite = inicio + tiempo_limite if tiempo_limite is not None else math.inf
+        maximo = playouts if playouts is not None else math.inf
+        hechos = 0
+        while hechos < maximo:
+            if hechos % REVISION == 0 and (self.cancelado or time.perf_counter() >= limite) and raiz.hijos:
+                break
+            # Selección y expansión
+            nodo = raiz
+            while not nodo.sin_probar and nodo.hijos:
+                nodo = nodo.seleccionar()
+            if nodo.sin_probar:
+                nodo = nodo.expandir(generador)
+            # Simulación
+            recompensa = nodo.final if nodo.final is not None else simular(nodo.ia, nodo.jugador, nodo.turno_ia, generador)
+            # Retropropagación: cada nodo suma la recompensa de quien jugó para llegar a él
+            while nodo is not None:
+                nodo.visitas += 1
+                nodo.valor += 1.0 - recompensa if nodo.turno_ia else recompensa
+                nodo = nodo.padre
+            hechos += 1
+        self.playouts = hechos
+        self.tiempo = time.perf_counter() - inicio
+
+        mejor = max(raiz.hijos, key=lambda hijo: hijo.visitas)
+        return casilla(mejor.bit)
+
+# ------------------- Comparación con minimax ------------------- #
+
+def jugar_partida(motor_x, motor_o, tiempo):
+    """
+    Juega una partida completa; cada motor recibe (propias, rivales) y el mismo tiempo por jugada.
+    Devuelve 'X', 'O' o None (empate).
+    """
+    x = o = 0
+    turno_x = True
+    while True:
+        if turno_x:
+            fila, columna = mover(motor_x, x, o, tiempo)
+            x |= 1 << (fila * TAMAÑO + columna)
+            if GANA[x]:
+                return "X"
+        else:
+            fila, columna = mover(motor_o, o, x, tiempo)
+            o |= 1 << (fila * TAMAÑO + columna)
+            if GANA[o]:
+                return "O"
+        if x | o == LLENO:
+            return None
+        turno_x = not turno_x
+
+def mover(motor, propias, rivales, tiempo):
+    """Pide una jugada a cualquiera de los dos motores con el mismo presupuesto de tiempo."""
+    if isinstance(motor, MotorMCTS):
+        return motor.mejor_movimiento(propias, rivales, tiempo_limite=tiempo)
+    return motor.mejor_movimiento_iterativo(propias, rivales, tiempo)
+
+def comparar_minimax(tiempos=(0.05, 0.2), partidas=10, semilla=0):
+    """
+    Mide playouts por segundo y juega 'partidas' partidas entre MCTS y minimax (profundización
+    iterativa con tabla de transposición) con el mismo tiempo por jugada, alternando quién empieza.
+    """
+    motor = MotorMCTS(semilla)
+    for nombre, (ia, jugador) in [("vacío", (0, 0)), ("medio juego", (0b0000_0100_0110_0000, 0b0000_0010_1001_0001))]:
+        motor.raiz = None
+        motor.mejor_movimiento(ia, jugador, tiempo_limite=1.0)
+        print(f"Posición {nombre}: {motor.playouts / motor.tiempo:,.0f} playouts/s")
+
+    print(f"\n{'Tiempo (s)':>10} {'Victorias':>10} {'Empates':>8} {'Derrotas':>9}   (desde el punto de vista de MCTS)")
+    for tiempo in tiempos:
+        victorias = empates = derrotas = 0
+        for partida in range(partidas):
+            mcts = MotorMCTS(semilla + partida)
+            minimax = MotorGato(usar_tabla=True)
+            mcts_es_x = partida % 2 == 0
+            ganador = jugar_partida(mcts, minimax, tiempo) if mcts_es_x else jugar_partida(minimax, mcts, tiempo)
+            if ganador is None:
+                empates += 1
+            elif (ganador == "X") == mcts_es_x:
+                victorias += 1
+            else:
+                derrotas += 1
+        print(f"{tiempo:>10} {victorias:>10} {empates:>8} {derrotas:>9}   ({(victorias + empates / 2) / partidas:.0%})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCTS (UCT) para el gato 4x4 y comparación contra minimax.")
+    parser.add_argument("--tiempos", type=float, nargs="+", default=[0.05, 0.2], help="Segundos por jugada")
+    parser.add_argument("--partidas", type=int, default=10, help="Partidas por cada tiempo")
+    args = parser.parse_args()
+    comparar_minimax(args.tiempos, args.partidas)
@@ -0,0 +1,992 @@
+import math
+import multiprocessing
+import random
+import time
+
+# ------------------- Representación con bitboards ------------------- #
+# Cada jugador se guarda como un entero de 16 bits: el bit i*4 + j corresponde a la casilla (i, j).
+# Así el bit menos significativo es la casilla (0, 0) y recorrer los bits de menor a mayor
+# equivale a recorrer el tablero fila por fila, igual que el motor original.
+
+TAMAÑO = 4                    # Tamaño del tablero (4x4)
+LLENO = (1 << TAMAÑO * TAMAÑO) - 1  # Máscara con todas las casillas ocupadas
+
+def calcular_lineas():
+    """Devuelve las 10 máscaras de línea del tablero 4x4: 4 filas, 4 columnas y 2 diagonales."""
+    lineas = []
+    for i in range(TAMAÑO):
+        lineas.append(sum(1 << (i * TAMAÑO + j) for j in range(TAMAÑO)))  # Fila i
+    for j in range(TAMAÑO):
+        lineas.append(sum(1 << (i * TAMAÑO + j) for i in range(TAMAÑO)))  # Columna j
+    lineas.append(sum(1 << (i * TAMAÑO + i) for i in range(TAMAÑO)))  # Diagonal principal
+    lineas.append(sum(1 << (i * TAMAÑO + TAMAÑO - 1 - i) for i in range(TAMAÑO)))  # Diagonal secundaria
+    return lineas
+
+LINEAS = calcular_lineas()
+
+# Tablas precalculadas sobre las 2^16 máscaras posibles
+BITS = bytes(bin(m).count("1") for m in range(LLENO + 1))  # Número de casillas ocupadas
+GANA = bytes(any(m & linea == linea for linea in LINEAS) for m in range(LLENO + 1))  # ¿Contiene una línea?
+
+# Puntajes del motor (los mismos que usa Lab_7.py)
+VICTORIA = 1000
+TRES_EN_LINEA = 100
+
+def desde_tablero(tablero, simbolo_ia, simbolo_jugador):
+    """Convierte un tablero de listas de cadenas en el par de máscaras (ia, jugador)."""
+    ia = jugador = 0
+    for i in range(TAMAÑO):
+        for j in range(TAMAÑO):
+            if tablero[i][j] == simbolo_ia:
+                ia |= 1 << (i * TAMAÑO + j)
+            elif tablero[i][j] == simbolo_jugador:
+                jugador |= 1 << (i * TAMAÑO + j)
+    return ia, jugador
+
+def casilla(bit):
+    """Convierte una máscara de un solo bit en las coordenadas (fila, columna)."""
+    indice = bit.bit_length() - 1
+    return divmod(indice, TAMAÑO)
+
+def hay_ganador(mascara):
+    """Verifica si la máscara de un jugador contiene alguna de las 10 líneas ganadoras."""
+    return GANA[mascara]
+
+def evaluar_tablero(ia, jugador):
+    """
+    Evalúa el tablero con la misma heurística que Lab_7.py: +100 por cada línea con 3 fichas
+    de la IA y una casilla vacía, -100 por cada línea con 3 fichas del jugador y una vacía.
+    """
+    puntaje = 0
+    for linea in LINEAS:
+        propias = ia & linea
+        rivales = jugador & linea
+        if not rivales and BITS[propias] == 3:
+            puntaje += TRES_EN_LINEA
+        elif not propias and BITS[rivales] == 3:
+            puntaje -= TRES_EN_LINEA
+    return puntaje
+
+# ------------------- Evaluación incremental por patrones de línea ------------------- #
+# Cada línea se codifica en base 3 (0 = vacía, 1 = IA, 2 = jugador; la casilla k de la línea pesa 3^k).
+# El puntaje de los 3^4 = 81 patrones se calcula una sola vez con la misma regla que evaluar_linea
+# de Lab_7.py, y durante la búsqueda solo se actualizan las líneas que pasan por la casilla jugada.
+
+VACIA, FICHA_IA, FICHA_JUGADOR = 0, 1, 2
+
+def puntaje_patron(codigo):
+    """Puntaje de una línea a partir de su código en base 3 (misma regla que evaluar_linea)."""
+    casillas = [codigo // 3**k % 3 for k in range(TAMAÑO)]
+    if casillas.count(FICHA_IA) == 3 and casillas.count(VACIA) == 1:
+        return TRES_EN_LINEA
+    if casillas.count(FICHA_JUGADOR) == 3 and casillas.count(VACIA) == 1:
+        return -TRES_EN_LINEA
+    return 0
+
+PUNTAJE_PATRON = [puntaje_patron(codigo) for codigo in range(3**TAMAÑO)]
+
+def calcular_lineas_de_casilla():
+    """Para cada casilla, las líneas que pasan por ella y el peso 3^k de la casilla dentro de cada una."""
+    lineas_de_casilla = [[] for _ in range(TAMAÑO * TAMAÑO)]
+    for indice_linea, linea in enumerate(LINEAS):
+        k = 0
+        for c in range(TAMAÑO * TAMAÑO):
+            if linea >> c & 1:
+                lineas_de_casilla[c].append((indice_linea, 3**k))
+                k += 1
+    return [tuple(lineas) for lineas in lineas_de_casilla]
+
+LINEAS_DE_CASILLA = calcular_lineas_de_casilla()
+
+class EvaluadorPatrones:
+    """
+    Mantiene el código de patrón de cada línea y la suma de sus puntajes. jugar/deshacer actualizan
+    solo las 2 o 3 líneas de la casilla, así que evaluar una hoja es leer self.puntaje.
+    """
+
+    def __init__(self, ia=0, jugador=0):
+        self.reiniciar(ia, jugador)
+
+    def reiniciar(self, ia, jugador):
+        """Recalcula los códigos y el puntaje desde las máscaras."""
+        self.codigos = [0] * len(LINEAS)
+        self.puntaje = 0
+        for c in range(TAMAÑO * TAMAÑO):
+            if ia >> c & 1:
+                self.jugar(c, FICHA_IA)
+            elif jugador >> c & 1:
+                self.jugar(c, FICHA_JUGADOR)
+
+    def jugar(self, indice, ficha):
+        """Coloca 'ficha' (FICHA_IA o FICHA_JUGADOR) en la casilla 'indice'."""
+        codigos = self.codigos
+        puntaje = self.puntaje
+        for linea, peso in LINEAS_DE_CASILLA[indice]:
+            anterior = codigos[linea]
+            nuevo = anterior + peso * ficha
+            codigos[linea] = nuevo
+            puntaje += PUNTAJE_PATRON[nuevo] - PUNTAJE_PATRON[anterior]
+        self.puntaje = puntaje
+
+    def deshacer(self, indice, ficha):
+        """Retira 'ficha' de la casilla 'indice'."""
+        codigos = self.codigos
+        puntaje = self.puntaje
+        for linea, peso in LINEAS_DE_CASILLA[indice]:
+            anterior = codigos[linea]
+            nuevo = anterior - peso * ficha
+            codigos[linea] = nuevo
+            puntaje += PUNTAJE_PATRON[nuevo] - PUNTAJE_PATRON[anterior]
+        self.puntaje = puntaje
+
+# ------------------- Simetrías y hashing de Zobrist ------------------- #
+
+def calcular_simetrias():
+    """
+    Devuelve las 8 simetrías del cuadrado (grupo diedral) como permutaciones de casillas:
+    SIMETRIAS[s][c] es la casilla a la que la simetría s lleva la casilla c.
+    """
+    n = TAMAÑO - 1
+    transformaciones = [
+        lambda i, j: (i, j),          # Identidad
+        lambda i, j: (j, n - i),      # Rotación 90°
+        lambda i, j: (n - i, n - j),  # Rotación 180°
+        lambda i, j: (n - j, i),      # Rotación 270°
+        lambda i, j: (i, n - j),      # Reflejo horizontal
+        lambda i, j: (n - i, j),      # Reflejo vertical
+        lambda i, j: (j, i),          # Transpuesta
+        lambda i, j: (n - j, n - i),  # Antitranspuesta
+    ]
+    simetrias = []
+    for t in transformaciones:
+        permutacion = []
+        for c in range(TAMAÑO * TAMAÑO):
+            i, j = t(*divmod(c, TAMAÑO))
+            permutacion.append(i * TAMAÑO + j)
+        simetrias.append(permutacion)
+    return simetrias
+
+SIMETRIAS = calcular_simetrias()
+
+# Claves de Zobrist de 64 bits por (lado, casilla), con semilla fija para que sean reproducibles
+_aleatorio = random.Random(20241128)
+_CLAVES = [[_aleatorio.getrandbits(64) for _ in range(TAMAÑO * TAMAÑO)] for _ in range(2)]
+CLAVE_TURNO_MAX = _aleatorio.getrandbits(64)  # Se combina cuando le toca mover a la IA
+
+# ZOBRIST[lado][c] = claves de la casilla c vista desde cada una de las 8 simetrías.
+# Mantener los 8 hashes a la vez permite obtener una clave canónica (el mínimo) que es la
+# misma para las 8 rotaciones y reflexiones de una posición.
+ZOBRIST = [[tuple(_CLAVES[lado][perm[c]] for perm in SIMETRIAS) for c in range(TAMAÑO * TAMAÑO)]
+           for lado in range(2)]
+LADO_IA, LADO_JUGADOR = 0, 1
+
+def hashes_simetricos(ia, jugador):
+    """Calcula desde cero los 8 hashes de Zobrist (uno por simetría) de una posición."""
+    hashes = [0] * len(SIMETRIAS)
+    for lado, mascara in ((LADO_IA, ia), (LADO_JUGADOR, jugador)):
+        while mascara:
+            bit = mascara & -mascara
+            mascara ^= bit
+            claves = ZOBRIST[lado][bit.bit_length() - 1]
+            hashes = [h ^ z for h, z in zip(hashes, claves)]
+    return tuple(hashes)
+
+# Tipos de cota guardados en la tabla de transposición
+EXACTO, INFERIOR, SUPERIOR = 0, 1, 2
+
+class TablaTransposicion:
+    """
+    Tabla de transposición de tamaño fijo (potencia de 2) indexada por la clave canónica.
+    Cada entrada guarda (clave, profundidad, tipo de cota, valor, generación). Política de reemplazo:
+    se sobrescribe si la casilla está libre, es la misma posición, la entrada pertenece a una búsqueda
+    anterior o la nueva profundidad es mayor o igual a la guardada.
+    """
+
+    def __init__(self, bits=18):
+        self.mascara = (1 << bits) - 1
+        self.entradas = [None] * (1 << bits)
+        self.generacion = 0
+        self.consultas = 0
+        self.aciertos = 0
+
+    def nueva_busqueda(self):
+        """Marca el inicio de una nueva búsqueda (las entradas anteriores pasan a ser reemplazables)."""
+        self.generacion += 1
+        self.consultas = 0
+        self.aciertos = 0
+
+    def consultar(self, clave):
+        """Devuelve la entrada de la posición o None."""
+        self.consultas += 1
+        entrada = self.entradas[clave & self.mascara]
+        if entrada is not None and entrada[0] == clave:
+            return entrada
+        return None
+
+    def guardar(self, clave, profundidad, tipo, valor):
+        """Guarda el resultado de una búsqueda aplicando la política de reemplazo."""
+        indice = clave & self.mascara
+        actual = self.entradas[indice]
+        if (actual is None or actual[0] == clave or actual[4] != self.generacion
+                or profundidad >= actual[1]):
+            self.entradas[indice] = (clave, profundidad, tipo, valor, self.generacion)
+
+    def tasa_aciertos(self):
+        """Fracción de consultas de la última búsqueda que evitaron buscar el subárbol."""
+        return self.aciertos / self.consultas if self.consultas else 0.0
+
+# ------------------- Motor de búsqueda ------------------- #
+
+class TiempoAgotado(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el tiempo asignado a la jugada."""
+
+
+class MotorIterativo:
+    """
+    Núcleo de la profundización iterativa, común a MotorGato (4x4) y MotorNK (N×N con k en línea):
+    Alfa-Beta con tabla de transposición, variante principal, asesinos, historia y cancelación.
+    Lo que depende del tablero lo aportan las subclases con estos métodos:
+    - contexto_raiz(ia, jugador): estado auxiliar de la raíz (hashes, zona de candidatas, puntaje...).
+    - candidatas(ia, jugador): movimientos de la raíz; movimientos(ocupadas, contexto): los de un nodo.
+    - gana_con(mascara, indice): ¿la ficha puesta en 'indice' completa una línea de 'mascara'?
+    - jugar(contexto, ia, jugador, indice, bit, es_max): contexto del hijo; deshacer(indice, es_max).
+    - reiniciar(ia, jugador): prepara el evaluador antes de cada movimiento de la raíz.
+    - hoja(ia, jugador, contexto): puntaje de una hoja; clave(contexto, es_max): clave de la tabla.
+    - casilla(bit): (fila, columna) de una máscara de un solo bit.
+    """
+
+    def __init__(self, casillas, lleno, usar_tabla=False, bits_tabla=18):
+        self.casillas = casillas      # Número de casillas del tablero
+        self.lleno = lleno            # Máscara con todas las casillas ocupadas
+        self.nodos = 0                # Nodos visitados en la última búsqueda
+        self.tabla = TablaTransposicion(bits_tabla) if usar_tabla else None
+        self.bits_tabla = bits_tabla
+        # Estado de la profundización iterativa
+        self.limite = math.inf        # Instante (perf_counter) en que se debe abandonar la búsqueda
+        self.cancelado = False        # Lo activa cancelar() desde otro hilo
+        self.variante = []            # Variante principal de la última iteración completada
+        self.killers = []             # Dos movimientos asesinos por nivel
+        self.historia = [[0] * casillas for _ in range(2)]  # Heurística de historia por lado y casilla
+        self.profundidad_completada = -1
+        self.valor = None
+
+    def reiniciar(self, ia, jugador):
+        """Prepara el evaluador incremental para la posición (no hace nada si no hay uno)."""
+
+    def deshacer(self, indice, es_max):
+        """Revierte lo que jugar() cambió en el evaluador incremental (no hace nada si no hay uno)."""
+
+    def ordenar(self, movimientos, lado, nivel, en_variante):
+        """
+        Ordena los movimientos de una posición: primero el de la variante principal anterior,
+        luego los dos asesinos del nivel y el resto según la heurística de historia.
+        """
+        lista = []
+        while movimientos:
+            bit = movimientos & -movimientos
+            movimientos ^= bit
+            lista.append(bit)
+        historia = self.historia[lado]
+        asesinos = self.killers[nivel] if nivel < len(self.killers) else ()
+        pv = self.variante[nivel] if en_variante and nivel < len(self.variante) else 0
+
+        def prioridad(bit):
+            if bit == pv:
+                return 1 << 40
+            if bit in asesinos:
+                return 1 << 30
+            return historia[bit.bit_length() - 1]
+
+        lista.sort(key=prioridad, reverse=True)
+        return lista
+
+    def alfabeta(self, ia, jugador, contexto, profundidad, es_max, alpha, beta, nivel, en_variante, variante):
+        """
+        Alfa-Beta con tabla de transposición y ordenamiento de movimientos para la profundización
+        iterativa. Escribe en 'variante' la mejor línea encontrada desde este nodo. Las victorias se
+        detectan al poner la ficha, así que el nodo recibido nunca tiene una línea completa.
+        """
+        self.nodos += 1
+        if self.nodos & 1023 == 0 and (self.cancelado or time.perf_counter() > self.limite):
+            raise TiempoAgotado
+        ocupadas = ia | jugador
+        if ocupadas == self.lleno or profundidad == 0:
+            return self.hoja(ia, jugador, contexto)
+
+        tabla = self.tabla
+        clave = self.clave(contexto, es_max)
+        entrada = tabla.consultar(clave)
+        # En la variante principal no se corta con la tabla para poder reconstruir la línea completa
+        if entrada is not None and entrada[1] >= profundidad and not en_variante:
+            tipo, valor = entrada[2], entrada[3]
+            if (tipo == EXACTO or (tipo == INFERIOR and valor >= beta)
+                    or (tipo == SUPERIOR and valor <= alpha)):
+                tabla.aciertos += 1
+                return valor
+
+        lado = LADO_IA if es_max else LADO_JUGADOR
+        alpha_original, beta_original = alpha, beta
+        mejor = -math.inf if es_max else math.inf
+        linea_hija = []
+        primero = True
+        for bit in self.ordenar(self.movimientos(ocupadas, contexto), lado, nivel, en_variante):
+            indice = bit.bit_length() - 1
+            sigue_variante = en_variante and primero
+            linea_hija.clear()
+            if es_max:
+                if self.gana_con(ia | bit, indice):
+                    eval = VICTORIA
+                else:
+                    hijo = self.jugar(contexto, ia, jugador, indice, bit, True)
+                    eval = self.alfabeta(ia | bit, jugador, hijo, profundidad - 1, False, alpha, beta,
+                                         nivel + 1, sigue_variante, linea_hija)
+                    self.deshacer(indice, True)
+                if eval > mejor:
+                    mejor = eval
+                    variante[:] = [bit] + linea_hija
+                if eval > alpha:
+                    alpha = eval
+            else:
+                if self.gana_con(jugador | bit, indice):
+                    eval = -VICTORIA
+                else:
+                    hijo = self.jugar(contexto, ia, jugador, indice, bit, False)
+                    eval = self.alfabeta(ia, jugador | bit, hijo, profundidad - 1, True, alpha, beta,
+                                         nivel + 1, sigue_variante, linea_hija)
+                    self.deshacer(indice, False)
+                if eval < mejor:
+                    mejor = eval
+                    variante[:] = [bit] + linea_hija
+                if eval < beta:
+                    beta = eval
+            primero = False
+            if beta <= alpha:
+                # Corte: el movimiento pasa a ser asesino de este nivel y suma a la historia
+                asesinos = self.killers[nivel]
+                if bit != asesinos[0]:
+                    asesinos[1], asesinos[0] = asesinos[0], bit
+                self.historia[lado][indice] += profundidad * profundidad
+                break
+
+        if mejor <= alpha_original:
+            tipo = SUPERIOR
+        elif mejor >= beta_original:
+            tipo = INFERIOR
+        else:
+            tipo = EXACTO
+        tabla.guardar(clave, profundidad, tipo, mejor)
+        return mejor
+
+    def buscar_raiz(self, ia, jugador, contexto, profundidad):
+        """
+        Busca todos los movimientos de la raíz a la profundidad dada (con la misma convención que
+        mejor_movimiento). La cota alfa se conserva entre movimientos de la raíz, así que los que no
+        pueden superar al mejor se refutan con una ventana estrecha.
+        """
+        alpha = -math.inf
+        mejor_valor = -math.inf
+        mejor_variante = []
+        linea_hija = []
+        primero = True
+        for bit in self.ordenar(self.candidatas(ia, jugador), LADO_IA, 0, True):
+            indice = bit.bit_length() - 1
+            linea_hija.clear()
+            if self.gana_con(ia | bit, indice):
+                valor = VICTORIA
+            else:
+                # Se reinicia en cada movimiento: una búsqueda interrumpida puede dejarlo a medias
+                self.reiniciar(ia, jugador)
+                hijo = self.jugar(contexto, ia, jugador, indice, bit, True)
+                valor = self.alfabeta(ia | bit, jugador, hijo, profundidad, False, alpha, math.inf,
+                                      1, primero, linea_hija)
+            primero = False
+            if valor > mejor_valor:
+                mejor_valor = valor
+                mejor_variante = [bit] + linea_hija
+            if valor > alpha:
+                alpha = valor
+        return mejor_valor, mejor_variante
+
+    def cancelar(self):
+        """
+        Pide abandonar la búsqueda iterativa en curso (se puede llamar desde otro hilo). La búsqueda
+        termina en unos milisegundos devolviendo la última iteración completada. El indicador se
+        limpia con reanudar().
+        """
+        self.cancelado = True
+
+    def reanudar(self):
+        """Limpia el indicador de cancelación antes de una nueva búsqueda."""
+        self.cancelado = False
+
+    def mejor_movimiento_iterativo(self, ia, jugador, tiempo_limite, profundidad_max=None):
+        """
+        Profundización iterativa con límite de tiempo: busca a profundidad 0, 1, 2, ... reutilizando la
+        tabla de transposición, la variante principal, los asesinos y la historia de la iteración previa.
+        Cuando se agota el tiempo devuelve el resultado de la última iteración completada.
+
+        Retorna:
+        - (fila, columna) del mejor movimiento. Los detalles quedan en self.profundidad_completada,
+          self.valor, self.variante y self.nodos.
+        """
+        if self.tabla is None:
+            self.tabla = TablaTransposicion(self.bits_tabla)  # La profundización iterativa necesita la tabla
+        self.tabla.nueva_busqueda()
+        self.nodos = 0
+        self.variante = []
+        self.historia = [[0] * self.casillas for _ in range(2)]
+        self.profundidad_completada = -1
+        self.valor = None
+        self.limite = time.perf_counter() + tiempo_limite
+
+        candidatas = self.candidatas(ia, jugador)
+        if not candidatas:
+            return (-1, -1)
+        # Más allá de las casillas libres el árbol ya no crece
+        limite_util = (self.lleno & ~(ia | jugador)).bit_count() - 1
+        if profundidad_max is None or profundidad_max > limite_util:
+            profundidad_max = limite_util
+
+        contexto = self.contexto_raiz(ia, jugador)
+        mejor_mov = self.casilla(candidatas & -candidatas)  # Respaldo si no se completa ni la primera iteración
+        try:
+            for profundidad in range(profundidad_max + 1):
+                self.killers = [[0, 0] for _ in range(profundidad + 2)]
+                valor, variante = self.buscar_raiz(ia, jugador, contexto, profundidad)
+                self.variante = variante
+                self.valor = valor
+                self.profundidad_completada = profundidad
+                mejor_mov = self.casilla(variante[0])
+                if abs(valor) >= VICTORIA:
+                    break  # Resultado forzado: buscar más hondo no lo cambia
+        except TiempoAgotado:
+            pass
+        finally:
+            self.limite = math.inf
+        return mejor_mov
+
+
+class MotorGato(MotorIterativo):
+    """
+    Motor Minimax con poda Alfa-Beta sobre bitboards. Cuenta los nodos visitados en cada búsqueda.
+    Con usar_tabla=True reutiliza resultados de posiciones ya buscadas (incluidas sus simetrías)
+    mediante una tabla de transposición de 2^bits_tabla entradas. El evaluador puede ser
+    "mascaras" (evaluar_tablero en cada hoja) o "patrones" (EvaluadorPatrones incremental);
+    ambos dan exactamente los mismos puntajes. La profundización iterativa es la de MotorIterativo.
+    """
+
+    def __init__(self, usar_tabla=False, bits_tabla=18, evaluador="mascaras"):
+        if evaluador not in ("mascaras", "patrones"):
+            raise ValueError(f"Evaluador desconocido: {evaluador}")
+        super().__init__(TAMAÑO * TAMAÑO, LLENO, usar_tabla, bits_tabla)
+        self.patrones = EvaluadorPatrones() if evaluador == "patrones" else None
+
+    def minimax(self, ia, jugador, profundidad, es_max, alpha, beta):
+        """
+        Minimax con poda Alfa-Beta, equivalente al de Lab_7.py: mismo orden de movimientos,
+        mismos valores terminales y misma evaluación en las hojas.
+        """
+        self.nodos += 1
+        if GANA[ia]:
+            return VICTORIA  # La IA ha ganado
+        if GANA[jugador]:
+            return -VICTORIA  # El jugador ha ganado
+        ocupadas = ia | jugador
+        if ocupadas == LLENO or profundidad == 0:
+            return evaluar_tablero(ia, jugador)
+
+        vacias = LLENO & ~ocupadas
+        if es_max:  # Maximiza el puntaje de la IA
+            max_eval = -math.inf
+            while vacias:
+                bit = vacias & -vacias  # Casilla vacía de menor índice
+                vacias ^= bit
+                ia ^= bit  # Hacer el movimiento
+                eval = self.minimax(ia, jugador, profundidad - 1, False, alpha, beta)
+                ia ^= bit  # Deshacer el movimiento
+                if eval > max_eval:
+                    max_eval = eval
+                if eval > alpha:
+                    alpha = eval
+                if beta <= alpha:
+                    break  # Poda Alfa-Beta
+            return max_eval
+        else:  # Minimiza el puntaje del jugador
+            min_eval = math.inf
+            while vacias:
+                bit = vacias & -vacias
+                vacias ^= bit
+                jugador ^= bit
+                eval = self.minimax(ia, jugador, profundidad - 1, True, alpha, beta)
+                jugador ^= bit
+                if eval < min_eval:
+                    min_eval = eval
+                if eval < beta:
+                    beta = eval
+                if beta <= alpha:
+                    break
+            return min_eval
+
+    def minimax_patrones(self, ia, jugador, profundidad, es_max, alpha, beta):
+        """Igual que minimax, pero evalúa las hojas con el puntaje incremental de self.patrones."""
+        self.nodos += 1
+        if GANA[ia]:
+            return VICTORIA
+        if GANA[jugador]:
+            return -VICTORIA
+        ocupadas = ia | jugador
+        patrones = self.patrones
+        if ocupadas == LLENO or profundidad == 0:
+            return patrones.puntaje
+
+        vacias = LLENO & ~ocupadas
+        if es_max:
+            max_eval = -math.inf
+            while vacias:
+                bit = vacias & -vacias
+                vacias ^= bit
+                indice = bit.bit_length() - 1
+                patrones.jugar(indice, FICHA_IA)
+                eval = self.minimax_patrones(ia ^ bit, jugador, profundidad - 1, False, alpha, beta)
+                patrones.deshacer(indice, FICHA_IA)
+                if eval > max_eval:
+                    max_eval = eval
+                if eval > alpha:
+                    alpha = eval
+                if beta <= alpha:
+                    break
+            return max_eval
+        else:
+            min_eval = math.inf
+            while vacias:
+                bit = vacias & -vacias
+                vacias ^= bit
+                indice = bit.bit_length() - 1
+                patrones.jugar(indice, FICHA_JUGADOR)
+                eval = self.minimax_patrones(ia, jugador ^ bit, profundidad - 1, True, alpha, beta)
+                patrones.deshacer(indice, FICHA_JUGADOR)
+                if eval < min_eval:
+                    min_eval = eval
+                if eval < beta:
+                    beta = eval
+                if beta <= alpha:
+                    break
+            return min_eval
+
+    def minimax_tabla(self, ia, jugador, hashes, profundidad, es_max, alpha, beta):
+        """
+        Minimax con poda Alfa-Beta y tabla de transposición. 'hashes' son los 8 hashes de Zobrist
+        de la posición, que se actualizan con un XOR por simetría en cada movimiento.
+        """
+        self.nodos += 1
+        if GANA[ia]:
+            return VICTORIA
+        if GANA[jugador]:
+            return -VICTORIA
+        ocupadas = ia | jugador
+        if ocupadas == LLENO or profundidad == 0:
+            return evaluar_tablero(ia, jugador)
+
+        # Consultar la tabla con la clave canónica (igual para las 8 simetrías de la posición)
+        tabla = self.tabla
+        clave = min(hashes) ^ CLAVE_TURNO_MAX if es_max else min(hashes)
+        entrada = tabla.consultar(clave)
+        if entrada is not None and entrada[1] >= profundidad:
+            tipo, valor = entrada[2], entrada[3]
+            if (tipo == EXACTO or (tipo == INFERIOR and valor >= beta)
+                    or (tipo == SUPERIOR and valor <= alpha)):
+                tabla.aciertos += 1
+                return valor
+
+        alpha_original, beta_original = alpha, beta
+        vacias = LLENO & ~ocupadas
+        if es_max:
+            mejor = -math.inf
+            claves = ZOBRIST[LADO_IA]
+            while vacias:
+                bit = vacias & -vacias
+                vacias ^= bit
+                hijos = tuple(h ^ z for h, z in zip(hashes, claves[bit.bit_length() - 1]))
+                eval = self.minimax_tabla(ia ^ bit, jugador, hijos, profundidad - 1, False, alpha, beta)
+                if eval > mejor:
+                    mejor = eval
+                if eval > alpha:
+                    alpha = eval
+                if beta <= alpha:
+                    break
+        else:
+            mejor = math.inf
+            claves = ZOBRIST[LADO_JUGADOR]
+            while vacias:
+                bit = vacias & -vacias
+                vacias ^= bit
+                hijos = tuple(h ^ z for h, z in zip(hashes, claves[bit.bit_length() - 1]))
+                eval = self.minimax_tabla(ia, jugador ^ bit, hijos, profundidad - 1, True, alpha, beta)
+                if eval < mejor:
+                    mejor = eval
+                if eval < beta:
+                    beta = eval
+                if beta <= alpha:
+                    break
+
+        # Guardar el valor con el tipo de cota que corresponde a la ventana original
+        if mejor <= alpha_original:
+            tipo = SUPERIOR
+        elif mejor >= beta_original:
+            tipo = INFERIOR
+        else:
+            tipo = EXACTO
+        tabla.guardar(clave, profundidad, tipo, mejor)
+        return mejor
+
+    def mejor_movimiento(self, ia, jugador, profundidad):
+        """Encuentra el mejor movimiento (fila, columna) para la IA, igual que mejor_movimiento de Lab_7.py."""
+        self.nodos = 0
+        if self.tabla is not None:
+            self.tabla.nueva_busqueda()
+            hashes = hashes_simetricos(ia, jugador)
+        mejor_valor = -math.inf
+        mejor_mov = (-1, -1)
+        vacias = LLENO & ~(ia | jugador)
+        while vacias:
+            bit = vacias & -vacias
+            vacias ^= bit
+            if self.tabla is not None:
+                hijos = tuple(h ^ z for h, z in zip(hashes, ZOBRIST[LADO_IA][bit.bit_length() - 1]))
+                mov_valor = self.minimax_tabla(ia ^ bit, jugador, hijos, profundidad, False, -math.inf, math.inf)
+            elif self.patrones is not None:
+                self.patrones.reiniciar(ia ^ bit, jugador)
+                mov_valor = self.minimax_patrones(ia ^ bit, jugador, profundidad, False, -math.inf, math.inf)
+            else:
+                mov_valor = self.minimax(ia ^ bit, jugador, profundidad, False, -math.inf, math.inf)
+            if mov_valor > mejor_valor:  # Actualiza el mejor movimiento
+                mejor_valor = mov_valor
+                mejor_mov = casilla(bit)
+        return mejor_mov
+
+    # ------------------- Tablero 4x4 para la profundización iterativa ------------------- #
+    # El contexto de cada nodo son los 8 hashes de Zobrist de la posición (uno por simetría).
+
+    def casilla(self, bit):
+        """Convierte una máscara de un solo bit en las coordenadas (fila, columna)."""
+        return casilla(bit)
+
+    def contexto_raiz(self, ia, jugador):
+        return hashes_simetricos(ia, jugador)
+
+    def candidatas(self, ia, jugador):
+        return LLENO & ~(ia | jugador)
+
+    def movimientos(self, ocupadas, hashes):
+        return LLENO & ~ocupadas
+
+    def gana_con(self, mascara, indice):
+        return GANA[mascara]
+
+    def jugar(self, hashes, ia, jugador, indice, bit, es_max):
+        if self.patrones is not None:
+            self.patrones.jugar(indice, FICHA_IA if es_max else FICHA_JUGADOR)
+        claves = ZOBRIST[LADO_IA if es_max else LADO_JUGADOR][indice]
+        return tuple(h ^ z for h, z in zip(hashes, claves))
+
+    def deshacer(self, indice, es_max):
+        if self.patrones is not None:
+            self.patrones.deshacer(indice, FICHA_IA if es_max else FICHA_JUGADOR)
+
+    def reiniciar(self, ia, jugador):
+        if self.patrones is not None:
+            self.patrones.reiniciar(ia, jugador)
+
+    def hoja(self, ia, jugador, hashes):
+        return self.patrones.puntaje if self.patrones is not None else evaluar_tablero(ia, jugador)
+
+    def clave(self, hashes, es_max):
+        """Clave canónica: la misma para las 8 simetrías de la posición."""
+        return min(hashes) ^ CLAVE_TURNO_MAX if es_max else min(hashes)
+
+
+# ------------------- Búsqueda paralela en la raíz ------------------- #
+
+REVISION_COTA = 1024  # Nodos entre dos lecturas de la cota compartida en cada trabajador
+
+class _MotorTrabajador(MotorGato):
+    """
+    Motor de un proceso trabajador: cada nodo sube su alfa hasta la cota que publicaron los demás
+    procesos (menos 1), releída cada REVISION_COTA nodos. Como los valores se miden siempre desde la
+    IA, esa cota vale como alfa en todo el subárbol; subirla durante la búsqueda solo agrega cortes.
+    """
+
+    def __init__(self, cota):
+        super().__init__()
+        self.cota = cota
+        self.alpha_externo = -math.inf
+
+    def minimax(self, ia, jugador, profundidad, es_max, alpha, beta):
+        if self.nodos % REVISION_COTA == 0:
+            publicado = self.cota.value  # Lectura sin candado: un valor algo viejo solo poda menos
+            if publicado != -math.inf and publicado - 1 > self.alpha_externo:
+                self.alpha_externo = publicado - 1
+        if self.alpha_externo > alpha:
+            alpha = self.alpha_externo
+        return MotorGato.minimax(self, ia, jugador, profundidad, es_max, alpha, beta)
+
+# Estado de cada proceso trabajador (se inicializa una vez por proceso)
+_motor_trabajador = None
+_cota_compartida = None
+
+def _iniciar_trabajador(cota):
+    """Inicializador del grupo de procesos: crea el motor local y guarda la cota compartida."""
+    global _motor_trabajador, _cota_compartida
+    _motor_trabajador = _MotorTrabajador(cota)
+    _cota_compartida = cota
+
+def _buscar_movimiento_raiz(argumentos):
+    """
+    Busca un movimiento de la raíz en un proceso trabajador. Usa como alfa la mejor cota publicada
+    por los demás procesos menos 1: los valores del motor son enteros, así que un movimiento que
+    empata con el mejor sigue obteniendo su valor exacto y el desempate por orden se conserva.
+    La cota se vuelve a leer durante la búsqueda (ver _MotorTrabajador).
+    """
+    bit, ia, jugador, profundidad = argumentos
+    _motor_trabajador.nodos = 0
+    _motor_trabajador.alpha_externo = -math.inf
+    valor = _motor_trabajador.minimax(ia ^ bit, jugador, profundidad, False, -math.inf, math.inf)
+    alpha = _motor_trabajador.alpha_externo
+    # Publicar el valor si mejora la cota (solo puede ser exacto si supera a la última alfa usada)
+    if valor > alpha:
+        with _cota_compartida.get_lock():
+            if valor > _cota_compartida.value:
+                _cota_compartida.value = valor
+    return bit, valor, _motor_trabajador.nodos
+
+class BuscadorParalelo:
+    """
+    Reparte los movimientos de la raíz entre un grupo de procesos. El primer movimiento (el
+    hermano mayor) se busca en el proceso principal para obtener una cota, y los demás se buscan
+    en paralelo compartiendo la mejor cota conforme mejora. Devuelve el mismo movimiento que
+    MotorGato.mejor_movimiento. Se usa como administrador de contexto para cerrar el grupo.
+    """
+
+    def __init__(self, procesos):
+        self.cota = multiprocessing.Value("d", -math.inf)
+        self.grupo = multiprocessing.Pool(procesos, initializer=_iniciar_trabajador, initargs=(self.cota,))
+        self.motor = MotorGato()
+        self.nodos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def cerrar(self):
+        """Termina los procesos del grupo."""
+        self.grupo.close()
+        self.grupo.join()
+
+    def mejor_movimiento(self, ia, jugador, profundidad):
+        """Encuentra el mejor movimiento (fila, columna) para la IA repartiendo la raíz entre procesos."""
+        movimientos = []
+        vacias = LLENO & ~(ia | jugador)
+        while vacias:
+            bit = vacias & -vacias
+            vacias ^= bit
+            movimientos.append(bit)
+        if not movimientos:
+            return (-1, -1)
+
+        # Hermano mayor: se busca completo en este proceso para fijar la primera cota
+        self.motor.nodos = 0
+        primero = movimientos[0]
+        valor_primero = self.motor.minimax(ia ^ primero, jugador, profundidad, False, -math.inf, math.inf)
+        self.nodos = self.motor.nodos
+        with self.cota.get_lock():
+            self.cota.value = valor_primero
+
+        valores = {primero: valor_primero}
+        tareas = [(bit, ia, jugador, profundidad) for bit in movimientos[1:]]
+        for bit, valor, nodos in self.grupo.imap_unordered(_buscar_movimiento_raiz, tareas):
+            valores[bit] = valor
+            self.nodos += nodos
+
+        # Mismo criterio que la búsqueda en serie: el mayor valor y, si empatan, el primero en orden
+        mejor = max(movimientos, key=lambda bit: (valores[bit], -bit))
+        return casilla(mejor)
+
+def comparar_paralelo(profundidades=(6, 7, 8, 9, 10), procesos=(2, 4, 8)):
+    """
+    Mide la aceleración de BuscadorParalelo frente a la búsqueda en serie y comprueba que ambos
+    elijan el mismo movimiento.
+    """
+    ia, jugador = 1 << 5, 1 << 0  # Posición de apertura: X en (0,0), O en (1,1)
+    print(f"Núcleos disponibles: {multiprocessing.cpu_count()}")
+    print(f"{'Prof.':>5} {'Serie (s)':>10} " + " ".join(f"{f'{p} proc.':>14}" for p in procesos))
+    buscadores = {p: BuscadorParalelo(p) for p in procesos}
+    try:
+        for profundidad in profundidades:
+            motor = MotorGato()
+            inicio = time.perf_counter()
+            mov_serie = motor.mejor_movimiento(ia, jugador, profundidad)
+            tiempo_serie = time.perf_counter() - inicio
+            columnas = []
+            for p, buscador in buscadores.items():
+                inicio = time.perf_counter()
+                mov = buscador.mejor_movimiento(ia, jugador, profundidad)
+                tiempo = time.perf_counter() - inicio
+                assert mov == mov_serie, f"Movimientos distintos con {p} procesos: {mov} != {mov_serie}"
+                columnas.append(f"{tiempo_serie / tiempo:>13.2f}x")
+            print(f"{profundidad:>5} {tiempo_serie:>10.2f} " + " ".join(columnas))
+    finally:
+        for buscador in buscadores.values():
+            buscador.cerrar()
+
+# ------------------- Comparación con el motor original ------------------- #
+
+def comparar_motores(profundidades=(1, 2, 3, 4)):
+    """
+    Compara el motor de bitboards con el motor de listas de Lab_7.py en un tablero vacío y en una
+    posición de medio juego. Verifica que ambos elijan el mismo movimiento y reporta nodos por segundo.
+    Como los dos recorren exactamente el mismo árbol, se usa el conteo de nodos del motor de bitboards
+    para ambos.
+    """
+    import Lab_7  # Importación diferida: Lab_7 importa este módulo
+
+    posiciones = {
+        "vacío": Lab_7.crear_tablero(),
+        "medio juego": [list(fila) for fila in ["X.O.", ".XO.", "..X.", "O..."]],
+    }
+    motor = MotorGato()
+    print(f"{'Posición':<12} {'Prof.':>5} {'Nodos':>10} {'Listas (n/s)':>14} {'Bitboards (n/s)':>16} {'Aceleración':>12}")
+    for nombre, tablero in posiciones.items():
+        ia, jugador = desde_tablero(tablero, Lab_7.IA, Lab_7.JUGADOR)
+        for profundidad in profundidades:
+            inicio = time.perf_counter()
+            mov_listas = Lab_7.mejor_movimiento_listas(tablero, profundidad)
+            tiempo_listas = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            mov_bits = motor.mejor_movimiento(ia, jugador, profundidad)
+            tiempo_bits = time.perf_counter() - inicio
+
+            assert mov_listas == mov_bits, f"Movimientos distintos: {mov_listas} != {mov_bits}"
+            print(f"{nombre:<12} {profundidad:>5} {motor.nodos:>10} {motor.nodos / tiempo_listas:>14,.0f} "
+                  f"{motor.nodos / tiempo_bits:>16,.0f} {tiempo_listas / tiempo_bits:>11.1f}x")
+
+def comparar_tabla(profundidades=(4, 6, 8)):
+    """
+    Mide la tasa de aciertos de la tabla de transposición y la reducción de nodos que produce
+    frente al motor sin tabla, partiendo de una posición de apertura.
+    """
+    # Posición tras dos jugadas (X en (0,0), O en (1,1)); desde el tablero vacío la profundidad 8 es muy lenta sin tabla
+    ia, jugador = 1 << 5, 1 << 0
+    print(f"{'Prof.':>5} {'Nodos sin tabla':>16} {'Nodos con tabla':>16} {'Reducción':>10} {'Aciertos':>9} {'Mov.':>8}")
+    for profundidad in profundidades:
+        simple = MotorGato()
+        inicio = time.perf_counter()
+        mov_simple = simple.mejor_movimiento(ia, jugador, profundidad)
+        tiempo_simple = time.perf_counter() - inicio
+
+        con_tabla = MotorGato(usar_tabla=True)
+        inicio = time.perf_counter()
+        mov_tabla = con_tabla.mejor_movimiento(ia, jugador, profundidad)
+        tiempo_tabla = time.perf_counter() - inicio
+
+        reduccion = 1 - con_tabla.nodos / simple.nodos
+        print(f"{profundidad:>5} {simple.nodos:>16,} {con_tabla.nodos:>16,} {reduccion:>9.1%} "
+              f"{con_tabla.tabla.tasa_aciertos():>8.1%} {str(mov_simple == mov_tabla):>8}"
+              f"   ({tiempo_simple:.2f} s -> {tiempo_tabla:.2f} s)")
+
+def comparar_evaluadores(cantidad=20000, semilla=0):
+    """
+    Mide por separado el costo de evaluar una hoja con cada evaluador sobre posiciones aleatorias
+    y comprueba que los tres den el mismo puntaje:
+    - listas: evaluar_tablero de Lab_7.py (reconstruye filas, columnas y diagonales).
+    - mascaras: evaluar_tablero de este módulo (10 líneas con tablas de bits).
+    - patrones: jugar + leer el puntaje + deshacer, que es lo que cuesta una hoja en la búsqueda.
+    """
+    import Lab_7  # Importación diferida: Lab_7 importa este módulo
+
+    generador = random.Random(semilla)
+    posiciones = []
+    for _ in range(cantidad):
+        casillas = generador.sample(range(TAMAÑO * TAMAÑO), generador.randint(1, 15))
+        mitad = (len(casillas) + 1) // 2
+        jugador = sum(1 << c for c in casillas[:mitad])
+        ia = sum(1 << c for c in casillas[mitad:])
+        ultimo = casillas[-1]
+        ficha = FICHA_IA if ia >> ultimo & 1 else FICHA_JUGADOR
+        tablero = [[Lab_7.IA if ia >> (i * TAMAÑO + j) & 1 else Lab_7.JUGADOR if jugador >> (i * TAMAÑO + j) & 1
+                    else Lab_7.VACIO for j in range(TAMAÑO)] for i in range(TAMAÑO)]
+        # El evaluador incremental parte de la posición sin la última ficha, como en la búsqueda
+        padre = EvaluadorPatrones(ia & ~(1 << ultimo), jugador & ~(1 << ultimo))
+        posiciones.append((tablero, ia, jugador, padre, ultimo, ficha))
+
+    for tablero, ia, jugador, padre, ultimo, ficha in posiciones:
+        padre.jugar(ultimo, ficha)
+        assert Lab_7.evaluar_tablero(tablero) == evaluar_tablero(ia, jugador) == padre.puntaje
+        padre.deshacer(ultimo, ficha)
+
+    inicio = time.perf_counter()
+    for tablero, *_ in posiciones:
+        Lab_7.evaluar_tablero(tablero)
+    tiempo_listas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _, ia, jugador, *_ in posiciones:
+        evaluar_tablero(ia, jugador)
+    tiempo_mascaras = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _, _, _, padre, ultimo, ficha in posiciones:
+        padre.jugar(ultimo, ficha)
+        padre.puntaje
+        padre.deshacer(ultimo, ficha)
+    tiempo_patrones = time.perf_counter() - inicio
+
+    print(f"{cantidad} evaluaciones (mismos puntajes en los tres evaluadores)")
+    for nombre, tiempo in [("listas", tiempo_listas), ("mascaras", tiempo_mascaras), ("patrones", tiempo_patrones)]:
+        print(f"  {nombre:<9} {tiempo / cantidad * 1e9:>8.0f} ns por hoja  ({tiempo_listas / tiempo:.1f}x frente a listas)")
+
+    ia, jugador = 1 << 5, 1 << 0
+    for evaluador in ("mascaras", "patrones"):
+        motor = MotorGato(evaluador=evaluador)
+        inicio = time.perf_counter()
+        movimiento = motor.mejor_movimiento(ia, jugador, 6)
+        print(f"  búsqueda a profundidad 6 con {evaluador}: {time.perf_counter() - inicio:.2f} s, "
+              f"{motor.nodos:,} nodos, movimiento {movimiento}")
+
+def comparar_iterativo(tiempos=(0.1, 0.5, 2.0)):
+    """Muestra la profundidad que alcanza la profundización iterativa con distintos presupuestos de tiempo."""
+    posiciones = {"vacío": (0, 0), "apertura": (1 << 5, 1 << 0)}
+    print(f"{'Posición':<10} {'Tiempo':>7} {'Prof.':>6} {'Nodos':>10} {'Valor':>6}  Movimiento")
+    for nombre, (ia, jugador) in posiciones.items():
+        for tiempo in tiempos:
+            motor = MotorGato(usar_tabla=True)
+            movimiento = motor.mejor_movimiento_iterativo(ia, jugador, tiempo)
+            print(f"{nombre:<10} {tiempo:>6.1f}s {motor.profundidad_completada:>6} {motor.nodos:>10,} "
+                  f"{motor.valor!s:>6}  {movimiento}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del motor del gato 4x4.")
+    parser.add_argument("prueba", nargs="?", choices=["motores", "tabla", "iterativo", "paralelo", "evaluadores"],
+                        default="motores",
+                        help="motores: bitboards contra listas; tabla: efecto de la tabla de transposición; "
+                             "iterativo: profundidad alcanzada con límite de tiempo; "
+                             "paralelo: aceleración de la búsqueda repartida entre procesos; "
+                             "evaluadores: costo por hoja de cada evaluador")
+    parser.add_argument("--profundidades", type=int, nargs="+", default=[6, 7, 8, 9, 10],
+                        help="Profundidades de la prueba paralelo (la serie tarda minutos en 9 y 10)")
+    args = parser.parse_args()
+
+    if args.prueba == "motores":
+        comparar_motores()
+    elif args.prueba == "tabla":
+        comparar_tabla()
+    elif args.prueba == "iterativo":
+        comparar_iterativo()
+    elif args.prueba == "paralelo":
+        comparar_paralelo(args.profundidades)
+    elif args.prueba == "evaluadores":
+        comparar_evaluadores()
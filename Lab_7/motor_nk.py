@@ -0,0 +1,303 @@
+import math
+import random
+import time
+
+from motor_gato import (CLAVE_TURNO_MAX, LADO_IA, LADO_JUGADOR, TRES_EN_LINEA, VICTORIA, MotorGato,
+                         MotorIterativo)
+
+# ------------------- Gato N×N con k en línea ------------------- #
+# Generaliza motor_gato.py a tableros de cualquier tamaño: cada jugador se guarda como un entero de
+# Python de N*N bits (el bit i*N + j es la casilla (i, j)) y las líneas ganadoras son todas las
+# ventanas de k casillas consecutivas en filas, columnas y diagonales. Con N = k = 4 el motor
+# reproduce exactamente las decisiones de MotorGato.
+
+class Geometria:
+    """Máscaras precalculadas de un tablero N×N con k en línea."""
+
+    def __init__(self, tamaño, k):
+        if not 2 <= k <= tamaño:
+            raise ValueError(f"Se necesita 2 <= k <= N (N={tamaño}, k={k})")
+        self.tamaño = tamaño
+        self.k = k
+        self.casillas = tamaño * tamaño
+        self.lleno = (1 << self.casillas) - 1
+
+        # Ventanas de k casillas en las 4 direcciones: derecha, abajo, diagonal y antidiagonal
+        self.lineas = []
+        for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for i in range(tamaño):
+                for j in range(tamaño):
+                    fin_i, fin_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= fin_i < tamaño and 0 <= fin_j < tamaño:
+                        self.lineas.append(sum(1 << ((i + di * p) * tamaño + j + dj * p) for p in range(k)))
+        self.lineas_de_casilla = [tuple(linea for linea in self.lineas if linea >> c & 1)
+                                  for c in range(self.casillas)]
+
+        # Casillas a distancia 1 (incluida la propia) para restringir los candidatos
+        self.vecinos = []
+        for c in range(self.casillas):
+            i, j = divmod(c, tamaño)
+            self.vecinos.append(sum(1 << (a * tamaño + b)
+                                    for a in range(max(0, i - 1), min(tamaño, i + 2))
+                                    for b in range(max(0, j - 1), min(tamaño, j + 2))))
+
+        # Claves de Zobrist por (lado, casilla) para la tabla de transposición, reproducibles por (N, k)
+        aleatorio = random.Random(tamaño * 100 + k)
+        self.claves = [[aleatorio.getrandbits(64) for _ in range(self.casillas)] for _ in range(2)]
+
+    def gana(self, mascara):
+        """¿La máscara contiene alguna línea completa?"""
+        return any(mascara & linea == linea for linea in self.lineas)
+
+    def gana_con(self, mascara, indice):
+        """¿La ficha recién puesta en 'indice' completa alguna línea? Solo revisa las líneas de esa casilla."""
+        return any(mascara & linea == linea for linea in self.lineas_de_casilla[indice])
+
+    def hash(self, ia, jugador):
+        """Hash de Zobrist de la posición, calculado desde cero."""
+        clave = 0
+        for lado, mascara in ((LADO_IA, ia), (LADO_JUGADOR, jugador)):
+            while mascara:
+                bit = mascara & -mascara
+                mascara ^= bit
+                clave ^= self.claves[lado][bit.bit_length() - 1]
+        return clave
+
+    def puntaje_linea(self, ia, jugador, linea):
+        """+100 si la IA tiene k-1 fichas de la línea y la otra está vacía, -100 en el caso simétrico."""
+        propias = (ia & linea).bit_count()
+        rivales = (jugador & linea).bit_count()
+        if rivales == 0 and propias == self.k - 1:
+            return TRES_EN_LINEA
+        if propias == 0 and rivales == self.k - 1:
+            return -TRES_EN_LINEA
+        return 0
+
+    def evaluar(self, ia, jugador):
+        """Suma la heurística de todas las líneas (generaliza evaluar_tablero de Lab_7.py)."""
+        return sum(self.puntaje_linea(ia, jugador, linea) for linea in self.lineas)
+
+    def delta(self, ia, jugador, indice, bit, es_ia):
+        """Cambio del puntaje al poner la ficha 'bit' (casilla 'indice'); solo cambian las líneas de esa casilla."""
+        cambio = 0
+        for linea in self.lineas_de_casilla[indice]:
+            antes = self.puntaje_linea(ia, jugador, linea)
+            despues = self.puntaje_linea(ia | bit, jugador, linea) if es_ia else self.puntaje_linea(ia, jugador | bit, linea)
+            cambio += despues - antes
+        return cambio
+
+_GEOMETRIAS = {}
+
+def obtener_geometria(tamaño, k):
+    """Devuelve la geometría de (N, k), calculándola solo la primera vez."""
+    if (tamaño, k) not in _GEOMETRIAS:
+        _GEOMETRIAS[(tamaño, k)] = Geometria(tamaño, k)
+    return _GEOMETRIAS[(tamaño, k)]
+
+def desde_tablero(tablero, simbolo_ia, simbolo_jugador):
+    """Convierte un tablero de listas (de cualquier tamaño) en el par de máscaras (ia, jugador)."""
+    tamaño = len(tablero)
+    ia = jugador = 0
+    for i in range(tamaño):
+        for j in range(tamaño):
+            if tablero[i][j] == simbolo_ia:
+                ia |= 1 << (i * tamaño + j)
+            elif tablero[i][j] == simbolo_jugador:
+                jugador |= 1 << (i * tamaño + j)
+    return ia, jugador
+
+class MotorNK(MotorIterativo):
+    """
+    Alfa-Beta para N×N con k en línea. Igual que MotorGato, la búsqueda a profundidad fija recorre la
+    raíz en orden de casillas con ventana completa, y la profundización iterativa es la de
+    MotorIterativo, con una tabla de transposición de 2^bits_tabla entradas. Para que el árbol no
+    explote en tableros grandes solo se consideran las casillas vecinas (radio=1) de alguna ficha; con
+    radio=0 se consideran todas (por defecto así en 4x4 o menos). La heurística se actualiza de forma
+    incremental.
+    """
+
+    def __init__(self, tamaño=4, k=4, radio=None, bits_tabla=18):
+        if radio not in (None, 0, 1):
+            raise ValueError("El radio de candidatas debe ser 0 (todas las casillas) o 1")
+        self.geometria = obtener_geometria(tamaño, k)
+        super().__init__(self.geometria.casillas, self.geometria.lleno, bits_tabla=bits_tabla)
+        self.radio = radio if radio is not None else (0 if tamaño <= 4 else 1)
+        self.puntaje = 0  # Puntaje de la posición actual en la búsqueda a profundidad fija
+
+    def casilla(self, bit):
+        """Convierte una máscara de un solo bit en (fila, columna)."""
+        return divmod(bit.bit_length() - 1, self.geometria.tamaño)
+
+    def zona(self, ia, jugador):
+        """Casillas a distancia 'radio' de alguna ficha (todas con radio 0, ninguna con el tablero vacío)."""
+        geometria = self.geometria
+        if self.radio == 0:
+            return geometria.lleno
+        cerca = 0
+        resto = ia | jugador
+        while resto:
+            bit = resto & -resto
+            resto ^= bit
+            cerca |= geometria.vecinos[bit.bit_length() - 1]
+        return cerca
+
+    def candidatas(self, ia, jugador):
+        """Casillas vacías que se consideran en la posición (todas si el tablero está vacío)."""
+        ocupadas = ia | jugador
+        vacias = self.geometria.lleno & ~ocupadas
+        return vacias & self.zona(ia, jugador) if ocupadas else vacias
+
+    def hijas(self, cerca, bit):
+        """Zona de candidatas tras jugar 'bit' (se actualiza sin recorrer todas las fichas)."""
+        if self.radio == 0:
+            return cerca
+        return cerca | self.geometria.vecinos[bit.bit_length() - 1]
+
+    def minimax(self, ia, jugador, cerca, profundidad, es_max, alpha, beta):
+        """Minimax con poda Alfa-Beta a profundidad fija, con el mismo recorrido que MotorGato.minimax."""
+        self.nodos += 1
+        geometria = self.geometria
+        ocupadas = ia | jugador
+        if ocupadas == geometria.lleno or profundidad == 0:
+            return self.puntaje
+
+        movimientos = geometria.lleno & ~ocupadas & cerca
+        mejor = -math.inf if es_max else math.inf
+        while movimientos:
+            bit = movimientos & -movimientos
+            movimientos ^= bit
+            indice = bit.bit_length() - 1
+            if es_max:
+                if geometria.gana_con(ia | bit, indice):
+                    self.nodos += 1
+                    eval = VICTORIA
+                else:
+                    cambio = geometria.delta(ia, jugador, indice, bit, True)
+                    self.puntaje += cambio
+                    eval = self.minimax(ia | bit, jugador, self.hijas(cerca, bit),
+                                        profundidad - 1, False, alpha, beta)
+                    self.puntaje -= cambio
+                if eval > mejor:
+                    mejor = eval
+                if eval > alpha:
+                    alpha = eval
+            else:
+                if geometria.gana_con(jugador | bit, indice):
+                    self.nodos += 1
+                    eval = -VICTORIA
+                else:
+                    cambio = geometria.delta(ia, jugador, indice, bit, False)
+                    self.puntaje += cambio
+                    eval = self.minimax(ia, jugador | bit, self.hijas(cerca, bit),
+                                        profundidad - 1, True, alpha, beta)
+                    self.puntaje -= cambio
+                if eval < mejor:
+                    mejor = eval
+                if eval < beta:
+                    beta = eval
+            if beta <= alpha:
+                break
+        return mejor
+
+    def mejor_movimiento(self, ia, jugador, profundidad):
+        """
+        Encuentra el mejor movimiento para la IA a profundidad fija (misma convención que
+        MotorGato.mejor_movimiento). Retorna (fila, columna) o (-1, -1) si no hay casillas libres.
+        """
+        self.nodos = 0
+        geometria = self.geometria
+        mejor_valor = -math.inf
+        mejor_mov = (-1, -1)
+        movimientos = self.candidatas(ia, jugador)
+        cerca = self.zona(ia, jugador)
+        while movimientos:
+            bit = movimientos & -movimientos
+            movimientos ^= bit
+            indice = bit.bit_length() - 1
+            if geometria.gana_con(ia | bit, indice):
+                self.nodos += 1
+                mov_valor = VICTORIA
+            else:
+                self.puntaje = geometria.evaluar(ia | bit, jugador)
+                mov_valor = self.minimax(ia | bit, jugador, self.hijas(cerca, bit),
+                                         profundidad, False, -math.inf, math.inf)
+            if mov_valor > mejor_valor:
+                mejor_valor = mov_valor
+                mejor_mov = self.casilla(bit)
+        return mejor_mov
+
+    # ------------------- Tablero N×N para la profundización iterativa ------------------- #
+    # La búsqueda es la de MotorIterativo. El contexto de cada nodo es (zona de candidatas, hash de
+    # Zobrist, puntaje): el puntaje viaja con el nodo, así que no hay nada que deshacer al volver.
+
+    def contexto_raiz(self, ia, jugador):
+        geometria = self.geometria
+        return self.zona(ia, jugador), geometria.hash(ia, jugador), geometria.evaluar(ia, jugador)
+
+    def movimientos(self, ocupadas, contexto):
+        return self.geometria.lleno & ~ocupadas & contexto[0]
+
+    def gana_con(self, mascara, indice):
+        return self.geometria.gana_con(mascara, indice)
+
+    def jugar(self, contexto, ia, jugador, indice, bit, es_max):
+        cerca, clave, puntaje = contexto
+        geometria = self.geometria
+        return (self.hijas(cerca, bit), clave ^ geometria.claves[LADO_IA if es_max else LADO_JUGADOR][indice],
+                puntaje + geometria.delta(ia, jugador, indice, bit, es_max))
+
+    def hoja(self, ia, jugador, contexto):
+        return contexto[2]
+
+    def clave(self, contexto, es_max):
+        return contexto[1] ^ CLAVE_TURNO_MAX if es_max else contexto[1]
+
+# ------------------- Pruebas ------------------- #
+
+def verificar_4x4(posiciones=200, semilla=0):
+    """Comprueba que con N = k = 4 el motor elija los mismos movimientos que MotorGato."""
+    generador = random.Random(semilla)
+    referencia = MotorGato()
+    motor = MotorNK(4, 4)
+    revisadas = 0
+    while revisadas < posiciones:
+        casillas = generador.sample(range(16), generador.randint(0, 9))
+        mitad = (len(casillas) + 1) // 2
+        jugador = sum(1 << c for c in casillas[:mitad])
+        ia = sum(1 << c for c in casillas[mitad:])
+        if motor.geometria.gana(ia) or motor.geometria.gana(jugador):
+            continue
+        for profundidad in (1, 2, 3):
+            assert motor.mejor_movimiento(ia, jugador, profundidad) == referencia.mejor_movimiento(ia, jugador, profundidad)
+        revisadas += 1
+    print(f"4x4: {posiciones} posiciones con los mismos movimientos que MotorGato a profundidad 1-3")
+
+def comparar_tamaños(variantes=((5, 4), (6, 4), (7, 4), (7, 5)), tiempo=1.0):
+    """Profundidad alcanzada y nodos por segundo con límite de tiempo, y efecto del radio de candidatas."""
+    print(f"\n{'N':>3} {'k':>3} {'Líneas':>7} {'Prof.':>6} {'Nodos/s':>10} {'Nodos prof. 2 (radio 1 / todas)':>32}")
+    for tamaño, k in variantes:
+        centro = tamaño // 2
+        # Una ficha de cada lado cerca del centro
+        jugador = 1 << (centro * tamaño + centro)
+        ia = 1 << (centro * tamaño + centro + 1)
+        motor = MotorNK(tamaño, k)
+        inicio = time.perf_counter()
+        motor.mejor_movimiento_iterativo(ia, jugador, tiempo)
+        transcurrido = time.perf_counter() - inicio
+        profundidad, nodos_s = motor.profundidad_completada, motor.nodos / transcurrido
+
+        motor.mejor_movimiento(ia, jugador, 2)
+        nodos_radio = motor.nodos
+        todas = MotorNK(tamaño, k, radio=0)
+        todas.mejor_movimiento(ia, jugador, 2)
+        print(f"{tamaño:>3} {k:>3} {len(motor.geometria.lineas):>7} {profundidad:>6} {nodos_s:>10,.0f} "
+              f"{nodos_radio:>15,} / {todas.nodos:<,}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Motor del gato N×N con k en línea.")
+    parser.add_argument("--tiempo", type=float, default=1.0, help="Segundos por búsqueda iterativa")
+    args = parser.parse_args()
+    verificar_4x4()
+    comparar_tamaños(tiempo=args.tiempo)
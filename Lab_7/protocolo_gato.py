@@ -0,0 +1,236 @@
+import asyncio
+import pickle
+import random
+import socket
+import struct
+import time
+
+# --- Protocolo binario del gato en red ---
+# Cada mensaje es una trama: 2 bytes de longitud (big-endian, sin contar el prefijo), 1 byte de tipo
+# y los campos del tipo. Las casillas viajan como un índice i * 4 + j y los tableros como dos
+# máscaras de 16 bits (el bit i * 4 + j es la casilla (i, j)), igual que en motor_gato.py.
+
+TAMAÑO = 4  # Tamaño del tablero (4x4)
+
+# Tipos de mensaje
+ASIGNACION = 1   # Servidor -> cliente: lado asignado (0 = X, 1 = O)
+TABLERO = 2      # Servidor -> cliente: tablero completo (máscara X, máscara O, turno)
+MOVIMIENTO = 3   # Cliente -> servidor: casilla; servidor -> clientes: casilla y lado que la jugó (delta)
+RESULTADO = 4    # Servidor -> clientes: 0 = gana X, 1 = gana O, 2 = empate
+REVANCHA = 5     # Servidor -> clientes: pregunta (respuesta 0); cliente -> servidor: 1 = sí, 0 = no
+DESPEDIDA = 6    # Servidor -> clientes: fin de la sesión
+MODO = 7         # Cliente -> servidor, primer mensaje: 0 = contra otra persona, 1 = contra la IA del servidor
+OBSERVAR = 8     # Cliente -> servidor, primer mensaje en lugar de MODO: identificador de la partida a observar
+PARTIDA = 9      # Servidor -> jugadores, después de la asignación: identificador de la partida
+
+LADO_X, LADO_O = 0, 1
+EMPATE = 2
+
+PREFIJO = struct.Struct("!H")
+CAMPOS = {
+    ASIGNACION: struct.Struct("!B"),
+    TABLERO: struct.Struct("!HHB"),
+    MOVIMIENTO: struct.Struct("!BB"),
+    RESULTADO: struct.Struct("!B"),
+    REVANCHA: struct.Struct("!B"),
+    DESPEDIDA: struct.Struct("!"),
+    MODO: struct.Struct("!B"),
+    OBSERVAR: struct.Struct("!I"),
+    PARTIDA: struct.Struct("!I"),
+}
+
+CONTRA_HUMANO, CONTRA_IA = 0, 1
+
+class ConexionCerrada(Exception):
+    """El otro extremo cerró la conexión a mitad de una trama o entre tramas."""
+
+def empaquetar(tipo, *campos):
+    """
+    Construye la trama completa de un mensaje.
+    :param tipo: Tipo de mensaje (ASIGNACION, TABLERO, ...).
+    :param campos: Valores de los campos del tipo.
+    :return: Los bytes de la trama, con el prefijo de longitud.
+    """
+    cuerpo = bytes((tipo,)) + CAMPOS[tipo].pack(*campos)
+    return PREFIJO.pack(len(cuerpo)) + cuerpo
+
+def desempaquetar(cuerpo):
+    """
+    Interpreta el cuerpo de una trama (sin el prefijo de longitud).
+    :param cuerpo: Bytes del tipo y los campos.
+    :return: Una tupla (tipo, campos).
+    """
+    if not cuerpo:
+        raise ValueError("Trama inválida: sin tipo (longitud 0)")
+    tipo = cuerpo[0]
+    formato = CAMPOS.get(tipo)
+    if formato is None or len(cuerpo) - 1 != formato.size:
+        raise ValueError(f"Trama inválida: tipo {tipo}, {len(cuerpo)} bytes")
+    return tipo, formato.unpack_from(cuerpo, 1)
+
+def enviar_mensaje(conexion, tipo, *campos):
+    """
+    Envía un mensaje por el socket.
+    :param conexion: El socket a través del cual se envía.
+    :param tipo: Tipo de mensaje.
+    :param campos: Valores de los campos del tipo.
+    """
+    conexion.sendall(empaquetar(tipo, *campos))
+
+def recibir_exacto(conexion, n):
+    """
+    Lee exactamente n bytes: recv puede devolver trozos de una trama o varias tramas juntas,
+    así que se repite hasta completar.
+    :param conexion: El socket desde el cual se recibe.
+    :param n: Número de bytes a leer.
+    :return: Los n bytes leídos.
+    """
+    datos = bytearray()
+    while len(datos) < n:
+        trozo = conexion.recv(n - len(datos))
+        if not trozo:
+            raise ConexionCerrada("La conexión se cerró antes de completar la trama")
+        datos += trozo
+    return bytes(datos)
+
+def recibir_mensaje(conexion):
+    """
+    Recibe un mensaje completo del socket.
+    :param conexion: El socket desde el cual se recibe.
+    :return: Una tupla (tipo, campos).
+    """
+    (longitud,) = PREFIJO.unpack(recibir_exacto(conexion, PREFIJO.size))
+    return desempaquetar(recibir_exacto(conexion, longitud))
+
+async def recibir_mensaje_async(lector):
+    """
+    Versión para asyncio de recibir_mensaje: readexactly ya espera hasta completar cada parte.
+    :param lector: El asyncio.StreamReader de la conexión.
+    :return: Una tupla (tipo, campos).
+    """
+    try:
+        (longitud,) = PREFIJO.unpack(await lector.readexactly(PREFIJO.size))
+        return desempaquetar(await lector.readexactly(longitud))
+    except asyncio.IncompleteReadError:
+        raise ConexionCerrada("La conexión se cerró antes de completar la trama") from None
+
+def a_mascaras(tablero, simbolo_x, simbolo_o):
+    """
+    Convierte un tablero de listas en las máscaras (x, o).
+    :param tablero: El tablero como lista 2D de símbolos.
+    :return: Una tupla (x, o) de enteros de 16 bits.
+    """
+    x = o = 0
+    for i in range(TAMAÑO):
+        for j in range(TAMAÑO):
+            if tablero[i][j] == simbolo_x:
+                x |= 1 << (i * TAMAÑO + j)
+            elif tablero[i][j] == simbolo_o:
+                o |= 1 << (i * TAMAÑO + j)
+    return x, o
+
+def desde_mascaras(x, o, simbolo_x, simbolo_o, vacio):
+    """
+    Convierte las máscaras (x, o) en un tablero de listas.
+    :return: Una lista 2D con los símbolos de cada casilla.
+    """
+    return [[simbolo_x if x >> (i * TAMAÑO + j) & 1 else simbolo_o if o >> (i * TAMAÑO + j) & 1 else vacio
+             for j in range(TAMAÑO)] for i in range(TAMAÑO)]
+
+# --- Comparación con el protocolo anterior (pickle sin tramas) ---
+
+def partida_aleatoria(generador):
+    """
+    Genera la secuencia de casillas de una partida aleatoria hasta que alguien gana o se llena el tablero.
+    :return: Una tupla (movimientos, resultado).
+    """
+    from motor_gato import GANA
+    casillas = generador.sample(range(TAMAÑO * TAMAÑO), TAMAÑO * TAMAÑO)
+    mascaras = [0, 0]
+    for n, c in enumerate(casillas):
+        lado = n % 2
+        mascaras[lado] |= 1 << c
+        if GANA[mascaras[lado]]:
+            return casillas[:n + 1], lado
+    return casillas, EMPATE
+
+def bytes_pickle(movimientos, resultado):
+    """
+    Bytes de una partida con el esquema anterior: el tablero completo de cadenas y el turno se envían
+    a ambos jugadores en cada turno.
+    """
+    simbolos = ("X", "O")
+    tablero = [["" for _ in range(TAMAÑO)] for _ in range(TAMAÑO)]
+    total = 2 * len(pickle.dumps("X"))  # Asignación de lados
+    for n, c in enumerate(movimientos):
+        total += 2 * len(pickle.dumps((tablero, simbolos[n % 2])))
+        total += len(pickle.dumps(divmod(c, TAMAÑO)))  # Movimiento del jugador
+        tablero[c // TAMAÑO][c % TAMAÑO] = simbolos[n % 2]
+    mensaje = "Empate" if resultado == EMPATE else f"{simbolos[resultado]} ha ganado!"
+    total += 2 * len(pickle.dumps(mensaje))
+    total += 2 * len(pickle.dumps("¿Quieres jugar de nuevo? (s/n)")) + 2 * len(pickle.dumps("s"))
+    return total
+
+def bytes_binario(movimientos, resultado):
+    """Bytes de la misma partida con el protocolo binario: un tablero inicial y después solo deltas."""
+    total = 2 * len(empaquetar(ASIGNACION, LADO_X)) + 2 * len(empaquetar(TABLERO, 0, 0, LADO_X))
+    for n, c in enumerate(movimientos):
+        total += len(empaquetar(MOVIMIENTO, c, 0))           # Movimiento del jugador
+        total += 2 * len(empaquetar(MOVIMIENTO, c, n % 2))   # Delta a ambos jugadores
+    total += 2 * len(empaquetar(RESULTADO, resultado))
+    total += 2 * len(empaquetar(REVANCHA, 0)) + 2 * len(empaquetar(REVANCHA, 1))
+    return total
+
+def latencia(enviar, recibir, mensajes):
+    """
+    Tiempo medio de ida y vuelta de cada mensaje sobre un par de sockets locales.
+    :param enviar: Función (socket, mensaje) que serializa y envía.
+    :param recibir: Función (socket) que recibe y deserializa.
+    :return: Microsegundos por mensaje (ida y vuelta dividido entre dos).
+    """
+    a, b = socket.socketpair()
+    try:
+        inicio = time.perf_counter()
+        for mensaje in mensajes:
+            enviar(a, mensaje)
+            enviar(b, recibir(b))
+            recibir(a)
+        return (time.perf_counter() - inicio) / len(mensajes) / 2 * 1e6
+    finally:
+        a.close()
+        b.close()
+
+def comparar_pickle(partidas=1000, semilla=0):
+    """
+    Reporta los bytes por partida y la latencia por mensaje del protocolo binario frente al esquema
+    anterior con pickle.
+    """
+    generador = random.Random(semilla)
+    juegos = [partida_aleatoria(generador) for _ in range(partidas)]
+    total_pickle = sum(bytes_pickle(*juego) for juego in juegos)
+    total_binario = sum(bytes_binario(*juego) for juego in juegos)
+    print(f"Bytes por partida ({partidas} partidas aleatorias): pickle {total_pickle / partidas:,.0f}, "
+          f"binario {total_binario / partidas:,.0f} ({total_pickle / total_binario:.1f}x menos)")
+
+    # Latencia: el esquema anterior manda el tablero completo; el binario, un delta
+    tablero = [["X", "", "O", ""], ["", "X", "", ""], ["O", "", "", ""], ["", "", "", ""]]
+    repeticiones = 20000
+
+    def enviar_pickle(conexion, datos):
+        conexion.sendall(pickle.dumps(datos))
+
+    def recibir_pickle(conexion):
+        return pickle.loads(conexion.recv(1024))
+
+    def enviar_binario(conexion, datos):
+        tipo, campos = datos
+        enviar_mensaje(conexion, tipo, *campos)
+
+    t_pickle = latencia(enviar_pickle, recibir_pickle, [(tablero, "X")] * repeticiones)
+    t_tablero = latencia(enviar_binario, recibir_mensaje, [(TABLERO, (0b101, 0b10100, LADO_O))] * repeticiones)
+    t_delta = latencia(enviar_binario, recibir_mensaje, [(MOVIMIENTO, (5, LADO_X))] * repeticiones)
+    print(f"Latencia por mensaje: pickle (tablero) {t_pickle:.1f} µs, binario tablero {t_tablero:.1f} µs, "
+          f"binario delta {t_delta:.1f} µs")
+
+if __name__ == "__main__":
+    comparar_pickle()
@@ -0,0 +1,341 @@
+import argparse
+import array
+import mmap
+import os
+import struct
+import sys
+import time
+from math import comb
+
+from motor_gato import BITS, GANA, LLENO, SIMETRIAS, TAMAÑO, casilla
+
+# ------------------- Tablas de finales (tablebase) del gato 4x4 ------------------- #
+# Resuelve por completo el juego: para cada posición alcanzable guarda el resultado con juego
+# perfecto (victoria, empate o derrota para el jugador que mueve) y la distancia en jugadas hasta
+# ese resultado. Las posiciones se representan con dos máscaras de 16 bits: x (primer jugador)
+# y o (segundo jugador); le toca a X cuando ambos tienen el mismo número de fichas.
+#
+# Índice: el rango combinatorio (ver abajo) cubre las 10.165.779 distribuciones de fichas con un
+# número válido de cada jugador, pero solo 1.217.977 son posiciones canónicas alcanzables. Por eso
+# el archivo guarda un mapa de bits sobre el rango que marca las almacenadas (en palabras de 64
+# bits), la cuenta acumulada de bits marcados al comienzo de cada palabra, y los resultados y las
+# distancias solo de las almacenadas, en orden de rango. El índice denso de una posición es la
+# cuenta de su palabra más los bits marcados antes que ella en la palabra. Así el archivo ocupa
+# 2,8 MB en lugar de los 7,6 MB de guardar 6 bits por cada valor del rango.
+
+# Resultados para el jugador que mueve (2 bits por posición; 0 = posición no almacenada)
+DESCONOCIDO, DERROTA, EMPATE, VICTORIA = 0, 1, 2, 3
+
+RUTA_PREDETERMINADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase_gato.bin")
+MAGICO = b"GATO4TB2"
+CABECERA = struct.Struct("<8sII")  # Firma, posiciones del rango y posiciones almacenadas
+
+# ------------------- Canonicalización por simetría ------------------- #
+
+def _tablas_simetria():
+    """
+    Para cada simetría, cuatro tablas de 256 entradas que transforman cada byte del código
+    x << 16 | o ya desplazado a su lugar; transformar un código son 4 consultas y 3 OR.
+    """
+    tablas = []
+    for permutacion in SIMETRIAS:
+        por_byte = []
+        for desplazamiento in (0, 8, 16, 24):
+            tabla = []
+            for valor in range(256):
+                resultado = 0
+                for b in range(8):
+                    if valor >> b & 1:
+                        bit = desplazamiento + b
+                        lado, celda = divmod(bit, 16)  # lado 0 = o, lado 1 = x
+                        resultado |= 1 << (lado * 16 + permutacion[celda])
+                tabla.append(resultado)
+            por_byte.append(tabla)
+        tablas.append(tuple(por_byte))
+    return tablas
+
+SIMETRIAS_BYTES = _tablas_simetria()
+
+def canonico(codigo):
+    """Devuelve el representante canónico (el menor código) de las 8 simetrías de x << 16 | o."""
+    b0 = codigo & 255
+    b1 = codigo >> 8 & 255
+    b2 = codigo >> 16 & 255
+    b3 = codigo >> 24
+    return min(t0[b0] | t1[b1] | t2[b2] | t3[b3] for t0, t1, t2, t3 in SIMETRIAS_BYTES)
+
+def canonico_con_simetria(codigo):
+    """
+    Como canonico, pero devuelve también el índice s de la simetría usada: una casilla c de la
+    posición original corresponde a la casilla SIMETRIAS[s][c] de la canónica.
+    """
+    b0 = codigo & 255
+    b1 = codigo >> 8 & 255
+    b2 = codigo >> 16 & 255
+    b3 = codigo >> 24
+    return min((t0[b0] | t1[b1] | t2[b2] | t3[b3], s) for s, (t0, t1, t2, t3) in enumerate(SIMETRIAS_BYTES))
+
+# ------------------- Índice combinatorio (rango) ------------------- #
+# rango = DESPLAZAMIENTO[k] + rango(ocupadas entre C(16, k)) * C(k, nx) + rango(x dentro de ocupadas)
+# donde k es el número de fichas y nx = ceil(k / 2) las de X. Es denso sobre todas las distribuciones
+# con un número de fichas válido (10.165.779), no sobre las posiciones almacenadas: el paso de uno
+# a otro lo hace el mapa de bits de TablaFinal.
+
+COMBINACIONES = [[comb(n, r) for r in range(TAMAÑO * TAMAÑO + 1)] for n in range(TAMAÑO * TAMAÑO + 1)]
+
+def _rango_colex_bytes():
+    """Tablas para el rango colexicográfico de una máscara: byte bajo y byte alto según los bits del bajo."""
+    bajo = [sum(COMBINACIONES[i][j + 1] for j, i in enumerate(b for b in range(8) if m >> b & 1))
+            for m in range(256)]
+    alto = [[sum(COMBINACIONES[i + 8][j + c + 1] for j, i in enumerate(b for b in range(8) if m >> b & 1))
+             for m in range(256)] for c in range(9)]
+    return bajo, alto
+
+RANGO_BAJO, RANGO_ALTO = _rango_colex_bytes()
+
+def _extraer_bytes():
+    """EXTRAER[ocupadas << 8 | valor]: bits de 'valor' en las posiciones de 'ocupadas', compactados (pext de 8 bits)."""
+    tabla = bytearray(1 << 16)
+    for ocupadas in range(256):
+        for valor in range(256):
+            resultado = 0
+            posicion = 0
+            for b in range(8):
+                if ocupadas >> b & 1:
+                    if valor >> b & 1:
+                        resultado |= 1 << posicion
+                    posicion += 1
+            tabla[ocupadas << 8 | valor] = resultado
+    return bytes(tabla)
+
+EXTRAER = _extraer_bytes()
+
+DESPLAZAMIENTO = []
+_total = 0
+for _k in range(TAMAÑO * TAMAÑO + 1):
+    DESPLAZAMIENTO.append(_total)
+    _total += COMBINACIONES[16][_k] * COMBINACIONES[_k][(_k + 1) // 2]
+TOTAL_POSICIONES = _total
+PALABRAS_MAPA = (TOTAL_POSICIONES + 63) // 64  # Palabras de 64 bits del mapa de posiciones almacenadas
+
+def rango_colex(mascara):
+    """Rango colexicográfico de una máscara de 16 bits entre las de su mismo número de bits."""
+    bajo = mascara & 255
+    return RANGO_BAJO[bajo] + RANGO_ALTO[BITS[bajo]][mascara >> 8]
+
+def rango(x, o):
+    """Índice denso de la posición (x, o) en la tabla."""
+    ocupadas = x | o
+    k = BITS[ocupadas]
+    bajo = ocupadas & 255
+    alto = ocupadas >> 8
+    x_compacto = EXTRAER[bajo << 8 | (x & 255)] | EXTRAER[alto << 8 | (x >> 8)] << BITS[bajo]
+    return (DESPLAZAMIENTO[k] + rango_colex(ocupadas) * COMBINACIONES[k][(k + 1) // 2]
+            + rango_colex(x_compacto))
+
+# ------------------- Generación (análisis retrógrado) ------------------- #
+
+def enumerar_capas():
+    """
+    Enumera hacia adelante las posiciones canónicas alcanzables, agrupadas por número de fichas.
+    Las posiciones con un ganador son terminales y no se expanden.
+    """
+    capas = [[0]]
+    for k in range(TAMAÑO * TAMAÑO):
+        siguiente = set()
+        turno_x = k % 2 == 0
+        for codigo in capas[k]:
+            x = codigo >> 16
+            o = codigo & LLENO
+            if GANA[x] or GANA[o]:
+                continue
+            vacias = LLENO & ~(x | o)
+            while vacias:
+                bit = vacias & -vacias
+                vacias ^= bit
+                siguiente.add(canonico(codigo | bit << 16 if turno_x else codigo | bit))
+        capas.append(sorted(siguiente))
+    return capas
+
+def generar(ruta=RUTA_PREDETERMINADA, mostrar=True):
+    """
+    Resuelve todas las posiciones alcanzables por análisis retrógrado: recorre las capas desde el
+    tablero lleno hasta el vacío, de modo que los hijos de cada posición ya están resueltos.
+    Guarda el mapa de posiciones almacenadas y, para cada una, el resultado con 2 bits y la
+    distancia con 4 bits.
+    """
+    inicio = time.perf_counter()
+    capas = enumerar_capas()
+    if mostrar:
+        print(f"Posiciones canónicas alcanzables: {sum(len(c) for c in capas):,} "
+              f"({time.perf_counter() - inicio:.1f} s)")
+
+    resultado = bytearray(TOTAL_POSICIONES)
+    distancia = bytearray(TOTAL_POSICIONES)
+    for k in range(TAMAÑO * TAMAÑO, -1, -1):
+        turno_x = k % 2 == 0
+        for codigo in capas[k]:
+            x = codigo >> 16
+            o = codigo & LLENO
+            indice = rango(x, o)
+            if GANA[x] or GANA[o]:
+                resultado[indice] = DERROTA  # Ganó quien acaba de mover
+                continue
+            vacias = LLENO & ~(x | o)
+            if not vacias:
+                resultado[indice] = EMPATE
+                continue
+
+            gana = empata = False
+            distancia_victoria = 99
+            distancia_derrota = 0
+            while vacias:
+                bit = vacias & -vacias
+                vacias ^= bit
+                hijo = canonico(codigo | bit << 16 if turno_x else codigo | bit)
+                indice_hijo = rango(hijo >> 16, hijo & LLENO)
+                valor_hijo = resultado[indice_hijo]
+                if valor_hijo == DERROTA:  # El rival pierde: esta jugada gana
+                    gana = True
+                    distancia_victoria = min(distancia_victoria, distancia[indice_hijo] + 1)
+                elif valor_hijo == EMPATE:
+                    empata = True
+                else:
+                    distancia_derrota = max(distancia_derrota, distancia[indice_hijo] + 1)
+
+            if gana:
+                resultado[indice], distancia[indice] = VICTORIA, distancia_victoria
+            elif empata:
+                resultado[indice] = EMPATE
+            else:
+                resultado[indice], distancia[indice] = DERROTA, distancia_derrota
+        if mostrar:
+            print(f"  capa {k:>2}: {len(capas[k]):>9,} posiciones ({time.perf_counter() - inicio:.1f} s)")
+
+    # Mapa de bits de las posiciones almacenadas y cuenta acumulada al comienzo de cada bloque
+    indices = sorted(rango(codigo >> 16, codigo & LLENO) for capa in capas for codigo in capa)
+    almacenadas = len(indices)
+    mapa = bytearray(PALABRAS_MAPA * 8)
+    for i in indices:
+        mapa[i >> 3] |= 1 << (i & 7)
+    cuentas = array.array("I")
+    acumulado = 0
+    for p in range(0, len(mapa), 8):
+        cuentas.append(acumulado)
+        acumulado += int.from_bytes(mapa[p:p + 8], "little").bit_count()
+    if sys.byteorder != "little":
+        cuentas.byteswap()
+
+    # Empaquetar en orden de rango: 4 resultados por byte y 2 distancias por byte
+    empaquetado = bytearray((almacenadas + 3) // 4)
+    distancias = bytearray((almacenadas + 1) // 2)
+    for denso, i in enumerate(indices):
+        empaquetado[denso >> 2] |= resultado[i] << (2 * (denso & 3))
+        distancias[denso >> 1] |= distancia[i] << (4 * (denso & 1))
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(CABECERA.pack(MAGICO, TOTAL_POSICIONES, almacenadas))
+        archivo.write(mapa)
+        archivo.write(cuentas.tobytes())
+        archivo.write(empaquetado)
+        archivo.write(distancias)
+    if mostrar:
+        print(f"Tabla escrita en {ruta} ({os.path.getsize(ruta) / 1e6:.1f} MB, "
+              f"{time.perf_counter() - inicio:.1f} s)")
+
+# ------------------- Consulta mediante mapeo en memoria ------------------- #
+
+class TablaFinal:
+    """
+    Lee la tabla generada mediante un mapeo en memoria: cada consulta canonicaliza la posición,
+    calcula su rango, lo convierte en índice denso con el mapa de bits y lee 2 bits (resultado) y
+    4 bits (distancia) sin cargar el archivo completo.
+    """
+
+    def __init__(self, ruta=RUTA_PREDETERMINADA):
+        self.archivo = open(ruta, "rb")
+        self.datos = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, total, almacenadas = CABECERA.unpack_from(self.datos, 0)
+        if magico != MAGICO or total != TOTAL_POSICIONES:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es una tabla de finales del gato 4x4 válida "
+                             f"(se genera con: python tablebase_gato.py generar)")
+        inicio_cuentas = CABECERA.size + PALABRAS_MAPA * 8
+        self.inicio_resultados = inicio_cuentas + PALABRAS_MAPA * 4
+        if sys.byteorder == "little":
+            # Vistas sobre el mapeo: cada consulta lee una palabra y una cuenta sin copiar nada
+            self.mapa = memoryview(self.datos)[CABECERA.size:inicio_cuentas].cast("Q")
+            self.cuentas = memoryview(self.datos)[inicio_cuentas:self.inicio_resultados].cast("I")
+        else:
+            self.mapa = array.array("Q", self.datos[CABECERA.size:inicio_cuentas])
+            self.cuentas = array.array("I", self.datos[inicio_cuentas:self.inicio_resultados])
+            self.mapa.byteswap()
+            self.cuentas.byteswap()
+        self.inicio_distancias = self.inicio_resultados + (almacenadas + 3) // 4
+
+    def cerrar(self):
+        """Libera el mapeo y el archivo."""
+        for vista in (getattr(self, "mapa", None), getattr(self, "cuentas", None)):
+            if isinstance(vista, memoryview):
+                vista.release()
+        self.datos.close()
+        self.archivo.close()
+
+    def consultar(self, x, o):
+        """Devuelve (resultado, distancia) para el jugador que mueve en la posición (x, o)."""
+        codigo = canonico(x << 16 | o)
+        indice = rango(codigo >> 16, codigo & LLENO)
+        palabra = self.mapa[indice >> 6]
+        bit = indice & 63
+        if not palabra >> bit & 1:
+            return DESCONOCIDO, 0  # Posición no alcanzable
+        denso = self.cuentas[indice >> 6] + (palabra & ((1 << bit) - 1)).bit_count()
+        valor = self.datos[self.inicio_resultados + (denso >> 2)] >> (2 * (denso & 3)) & 3
+        distancia = self.datos[self.inicio_distancias + (denso >> 1)] >> (4 * (denso & 1)) & 15
+        return valor, distancia
+
+    def mejor_movimiento(self, x, o):
+        """
+        Devuelve (fila, columna) de una jugada perfecta para el jugador que mueve: gana lo antes
+        posible, si no empata, y si pierde retrasa la derrota todo lo que puede.
+        """
+        turno_x = BITS[x] == BITS[o]
+        mejor_clave = None
+        mejor_bit = 0
+        vacias = LLENO & ~(x | o)
+        while vacias:
+            bit = vacias & -vacias
+            vacias ^= bit
+            valor, distancia = self.consultar(x | bit, o) if turno_x else self.consultar(x, o | bit)
+            # Resultado del rival tras la jugada: su derrota es lo mejor, con la menor distancia
+            if valor == DERROTA:
+                clave = (2, -distancia)
+            elif valor == EMPATE:
+                clave = (1, 0)
+            else:
+                clave = (0, distancia)
+            if mejor_clave is None or clave > mejor_clave:
+                mejor_clave, mejor_bit = clave, bit
+        return casilla(mejor_bit) if mejor_bit else (-1, -1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tablas de finales del gato 4x4 (juego perfecto).")
+    parser.add_argument("accion", choices=["generar", "consultar"],
+                        help="generar: resuelve el juego y escribe el archivo; consultar: resultado del tablero vacío "
+                             "y tiempo medio de consulta")
+    parser.add_argument("--ruta", default=RUTA_PREDETERMINADA, help="Archivo de la tabla")
+    args = parser.parse_args()
+
+    if args.accion == "generar":
+        generar(args.ruta)
+    else:
+        tabla = TablaFinal(args.ruta)
+        nombres = {DERROTA: "derrota", EMPATE: "empate", VICTORIA: "victoria", DESCONOCIDO: "desconocido"}
+        valor, distancia = tabla.consultar(0, 0)
+        print(f"Tablero vacío: {nombres[valor]} para X (distancia {distancia})")
+        repeticiones = 10000
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            tabla.mejor_movimiento(1, 1 << 5)
+        print(f"mejor_movimiento: {(time.perf_counter() - inicio) / repeticiones * 1e6:.1f} µs por consulta")
+        tabla.cerrar()
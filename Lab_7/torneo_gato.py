@@ -0,0 +1,192 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import time
+
+from mcts_gato import MotorMCTS
+from motor_gato import GANA, LLENO, TAMAÑO, MotorGato
+from tablebase_gato import RUTA_PREDETERMINADA, TablaFinal
+
+# ------------------- Torneo sin interfaz entre configuraciones de la IA ------------------- #
+# Cada motor se describe con una cadena "tipo:clave=valor,clave=valor", por ejemplo:
+#   minimax:prof=4                    búsqueda a profundidad fija (la de la interfaz)
+#   minimax:prof=4,evaluador=patrones con el evaluador incremental
+#   minimax:prof=6,tabla=1            con tabla de transposición
+#   iterativo:tiempo=0.05             profundización iterativa con límite de tiempo
+#   mcts:playouts=2000  /  mcts:tiempo=0.05
+#   tablas                            juego perfecto leído de tablebase_gato.bin
+# Todos los pares de motores juegan las mismas aperturas aleatorias dos veces, una con cada color.
+
+TIPOS = ("minimax", "iterativo", "mcts", "tablas")
+
+class Participante:
+    """Motor configurado a partir de su especificación; mover() devuelve la jugada y los nodos visitados."""
+
+    def __init__(self, especificacion):
+        self.nombre = especificacion
+        tipo, _, parametros = especificacion.partition(":")
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de motor desconocido: {tipo}")
+        self.tipo = tipo
+        self.parametros = dict(par.split("=", 1) for par in parametros.split(",") if par)
+        self.tablas = TablaFinal() if tipo == "tablas" else None
+        self.nueva_partida()
+
+    def nueva_partida(self):
+        """Crea un motor nuevo para que no herede tablas ni árboles de la partida anterior."""
+        evaluador = self.parametros.get("evaluador", "mascaras")
+        if self.tipo == "minimax":
+            self.motor = MotorGato(usar_tabla=self.parametros.get("tabla") == "1", evaluador=evaluador)
+        elif self.tipo == "iterativo":
+            self.motor = MotorGato(usar_tabla=True, evaluador=evaluador)
+        elif self.tipo == "mcts":
+            self.motor = MotorMCTS(random.getrandbits(32))
+
+    def mover(self, x, o, turno_x):
+        """Jugada (fila, columna) para el jugador que mueve y nodos visitados (playouts en MCTS)."""
+        propias, rivales = (x, o) if turno_x else (o, x)
+        if self.tipo == "minimax":
+            movimiento = self.motor.mejor_movimiento(propias, rivales, int(self.parametros.get("prof", 4)))
+            return movimiento, self.motor.nodos
+        if self.tipo == "iterativo":
+            movimiento = self.motor.mejor_movimiento_iterativo(propias, rivales, float(self.parametros.get("tiempo", 0.1)))
+            return movimiento, self.motor.nodos
+        if self.tipo == "mcts":
+            playouts = self.parametros.get("playouts")
+            tiempo = self.parametros.get("tiempo")
+            movimiento = self.motor.mejor_movimiento(propias, rivales,
+                                                     tiempo_limite=float(tiempo) if tiempo else None,
+                                                     playouts=int(playouts) if playouts else None)
+            return movimiento, self.motor.playouts
+        return self.tablas.mejor_movimiento(x, o), 0
+
+def apertura_aleatoria(generador, jugadas):
+    """Coloca 'jugadas' fichas al azar alternando X y O (con menos de 7 no puede haber ganador)."""
+    casillas = generador.sample(range(TAMAÑO * TAMAÑO), jugadas)
+    x = sum(1 << c for c in casillas[0::2])
+    o = sum(1 << c for c in casillas[1::2])
+    return x, o
+
+def jugar_partida(motor_x, motor_o, x, o):
+    """
+    Juega desde la apertura (x, o) hasta el final.
+    Retorna el ganador ('X', 'O' o None) y, por cada color, la lista de latencias y el total de nodos.
+    """
+    motor_x.nueva_partida()
+    motor_o.nueva_partida()
+    latencias = {"X": [], "O": []}
+    nodos = {"X": 0, "O": 0}
+    turno_x = bin(x).count("1") == bin(o).count("1")
+    while True:
+        color, motor = ("X", motor_x) if turno_x else ("O", motor_o)
+        inicio = time.perf_counter()
+        (fila, columna), visitados = motor.mover(x, o, turno_x)
+        latencias[color].append(time.perf_counter() - inicio)
+        nodos[color] += visitados
+        bit = 1 << (fila * TAMAÑO + columna)
+        if turno_x:
+            x |= bit
+            if GANA[x]:
+                return "X", latencias, nodos
+        else:
+            o |= bit
+            if GANA[o]:
+                return "O", latencias, nodos
+        if x | o == LLENO:
+            return None, latencias, nodos
+        turno_x = not turno_x
+
+def _iniciar_torneo(especificaciones):
+    """Inicializador de cada proceso: construye los participantes una sola vez."""
+    global _participantes
+    _participantes = [Participante(especificacion) for especificacion in especificaciones]
+
+def _jugar_tarea(tarea):
+    """
+    Juega una partida del torneo en un proceso trabajador. La semilla viene en la tarea, así que el
+    resultado no depende de qué proceso la juegue ni en qué orden.
+    """
+    a, b, a_es_x, x, o, semilla = tarea
+    random.seed(semilla)  # De aquí salen las semillas de los motores MCTS (nueva_partida)
+    motor_x, motor_o = (_participantes[a], _participantes[b]) if a_es_x else (_participantes[b], _participantes[a])
+    ganador, latencias, nodos = jugar_partida(motor_x, motor_o, x, o)
+    color_a, color_b = ("X", "O") if a_es_x else ("O", "X")
+    resultado_a = None if ganador is None else ganador == color_a
+    return a, b, resultado_a, latencias[color_a], nodos[color_a], latencias[color_b], nodos[color_b]
+
+def percentil(valores, p):
+    """Percentil p (0-100) por el método del rango más cercano."""
+    ordenados = sorted(valores)
+    return ordenados[max(0, min(len(ordenados) - 1, int(len(ordenados) * p / 100 + 0.5) - 1))]
+
+def torneo(especificaciones, partidas=100, aperturas=2, procesos=None, semilla=0):
+    """
+    Enfrenta todos los pares de motores en 'partidas' partidas por par (la mitad de las aperturas con cada
+    color) repartidas entre 'procesos' procesos.
+
+    Retorna:
+    - (estadisticas, cruces): por motor, victorias/empates/derrotas, latencias y nodos; por par, (V, E, D)
+      desde el punto de vista del primero.
+    """
+    generador = random.Random(semilla)
+    tareas = []
+    for a, b in itertools.combinations(range(len(especificaciones)), 2):
+        for _ in range((partidas + 1) // 2):
+            x, o = apertura_aleatoria(generador, aperturas)
+            tareas.append((a, b, True, x, o, generador.getrandbits(32)))
+            tareas.append((a, b, False, x, o, generador.getrandbits(32)))
+
+    estadisticas = [{"V": 0, "E": 0, "D": 0, "latencias": [], "nodos": 0} for _ in especificaciones]
+    cruces = {par: [0, 0, 0] for par in itertools.combinations(range(len(especificaciones)), 2)}
+    procesos = procesos or multiprocessing.cpu_count()
+    with multiprocessing.Pool(procesos, initializer=_iniciar_torneo, initargs=(especificaciones,)) as grupo:
+        for a, b, resultado_a, latencias_a, nodos_a, latencias_b, nodos_b in grupo.imap_unordered(
+                _jugar_tarea, tareas, chunksize=max(1, len(tareas) // (procesos * 8))):
+            clave_a, clave_b, indice = ("E", "E", 1) if resultado_a is None else \
+                ("V", "D", 0) if resultado_a else ("D", "V", 2)
+            estadisticas[a][clave_a] += 1
+            estadisticas[b][clave_b] += 1
+            cruces[(a, b)][indice] += 1
+            estadisticas[a]["latencias"].extend(latencias_a)
+            estadisticas[b]["latencias"].extend(latencias_b)
+            estadisticas[a]["nodos"] += nodos_a
+            estadisticas[b]["nodos"] += nodos_b
+    return estadisticas, cruces
+
+def imprimir_resultados(especificaciones, estadisticas, cruces):
+    """Tabla por motor y resultados de cada cruce."""
+    ancho = max(len(e) for e in especificaciones)
+    print(f"{'Motor':<{ancho}} {'V':>6} {'E':>6} {'D':>6} {'Media (ms)':>11} {'p99 (ms)':>9} {'Nodos/s':>11}")
+    for especificacion, datos in zip(especificaciones, estadisticas):
+        latencias = datos["latencias"]
+        total = sum(latencias)
+        nodos_s = f"{datos['nodos'] / total:,.0f}" if datos["nodos"] and total else "-"
+        print(f"{especificacion:<{ancho}} {datos['V']:>6} {datos['E']:>6} {datos['D']:>6} "
+              f"{total / len(latencias) * 1e3:>11.2f} {percentil(latencias, 99) * 1e3:>9.2f} {nodos_s:>11}")
+    print("\nCruces (V-E-D del primero):")
+    for (a, b), (v, e, d) in cruces.items():
+        print(f"  {especificaciones[a]} contra {especificaciones[b]}: {v}-{e}-{d}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Torneo sin interfaz entre configuraciones de la IA del gato 4x4.")
+    parser.add_argument("motores", nargs="*",
+                        default=["minimax:prof=2", "minimax:prof=4", "minimax:prof=4,evaluador=patrones",
+                                 "iterativo:tiempo=0.02", "mcts:playouts=1000"],
+                        help="Especificaciones tipo:clave=valor,... (tipos: " + ", ".join(TIPOS) + ")")
+    parser.add_argument("--partidas", type=int, default=100, help="Partidas por cada par de motores")
+    parser.add_argument("--aperturas", type=int, default=2, help="Jugadas aleatorias al inicio de cada partida (0-6)")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    if not 0 <= args.aperturas <= 6:
+        parser.error("--aperturas debe estar entre 0 y 6 para que ninguna apertura esté ya decidida")
+    if "tablas" in args.motores and not os.path.exists(RUTA_PREDETERMINADA):
+        parser.error("El motor 'tablas' necesita el archivo generado con: python tablebase_gato.py generar")
+
+    inicio = time.perf_counter()
+    estadisticas, cruces = torneo(args.motores, args.partidas, args.aperturas, args.procesos, args.semilla)
+    total = sum(d["V"] + d["E"] + d["D"] for d in estadisticas) // 2
+    print(f"{total} partidas en {time.perf_counter() - inicio:.1f} s\n")
+    imprimir_resultados(args.motores, estadisticas, cruces)
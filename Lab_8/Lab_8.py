@@ -1,11 +1,20 @@
 import pandas as pd  # Importamos la librería pandas, que nos permite trabajar con dataframes y manipular datos.
 
-# Definimos los nombres de las columnas para el dataset Iris.
-column_names = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width', 'class']
+from datos_iris import COLUMNAS, RUTA_BEZDEK, cargar_iris, como_dataframe  # Cargador tipado con caché del dataset Iris
+from lector_bloques import acumular  # Estadísticas por clase leyendo el archivo por bloques
 
-# Leemos el archivo CSV 'bezdekIris.data' y almacenamos los datos en un dataframe llamado 'iris_df'.
-# El archivo se lee con 'read_csv' y se le asignan nombres a las columnas usando el argumento 'names'.
-iris_df = pd.read_csv('bezdekIris.data', names=column_names)
+# Leemos el archivo 'bezdekIris.data' con tipos explícitos (float32 para las medidas y categoría para la clase).
+# La primera vez se interpreta el texto y se guarda una caché binaria junto al archivo; las siguientes
+# ejecuciones leen la caché mientras el archivo no cambie.
+X, y, clases = cargar_iris(RUTA_BEZDEK)
+
+# Armamos el dataframe 'iris_df' con los nombres de las columnas y la clase como columna categórica.
+iris_df = como_dataframe(X, y, clases)
 
 # Mostramos las primeras 5 filas del dataframe para verificar que los datos se han cargado correctamente.
 print(iris_df.head())
+
+# Calculamos la cuenta, la media y la varianza de cada medida por clase recorriendo el archivo por bloques,
+# sin cargar la tabla completa (el mismo código sirve para archivos que no caben en memoria), y mostramos las medias.
+estadisticas = acumular(RUTA_BEZDEK, filas=32)
+print(pd.DataFrame(estadisticas.media, index=estadisticas.clases, columns=COLUMNAS))
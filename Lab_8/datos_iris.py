@@ -0,0 +1,203 @@
+import argparse
+import hashlib
+import os
+import struct
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Cargador tipado y con caché de los archivos del dataset Iris ---
+# Los archivos .data se leen con tipos explícitos (float32 para las medidas y categoría para la clase)
+# y los arreglos resultantes se guardan en un archivo binario junto al original. La caché se reutiliza
+# mientras el archivo fuente no cambie: primero se compara su mtime y su tamaño y, si no coinciden,
+# su hash SHA-256 (un 'touch' o una copia no obligan a volver a interpretar el texto).
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RUTA_IRIS = os.path.join(DIRECTORIO, "iris.data")
+RUTA_BEZDEK = os.path.join(DIRECTORIO, "bezdekIris.data")  # Versión corregida; es la que trae sklearn
+
+COLUMNAS = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width']
+COLUMNA_CLASE = 'class'
+TIPOS = {**{columna: np.float32 for columna in COLUMNAS}, COLUMNA_CLASE: "category"}
+SUFIJO_CACHE = ".cache"
+MAGICO = b"IRISCAC1"  # Cambia si cambia el formato de la caché
+# Cabecera: mágico, mtime (ns) y tamaño del fuente, SHA-256, filas, medidas y bytes de los nombres de clase.
+# Después van X (float32), y (int8) y los nombres de las clases en UTF-8 separados por saltos de línea.
+CABECERA = struct.Struct("<8sqq32sIII")
+
+def huella(ruta):
+    """
+    Calcula el hash SHA-256 del contenido de un archivo.
+
+    Parámetros:
+    - ruta: Ruta del archivo.
+
+    Retorna:
+    - El hash en hexadecimal.
+    """
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+def interpretar_iris(ruta):
+    """
+    Lee un archivo con el formato de Iris (cuatro medidas y la clase, separadas por comas) con tipos
+    explícitos, sin inferencia de tipos.
+
+    Parámetros:
+    - ruta: Ruta del archivo .data.
+
+    Retorna:
+    - X: Matriz float32 de forma (n, 4) con las medidas.
+    - y: Vector int8 con el código de la clase de cada fila.
+    - clases: Arreglo con el nombre de cada clase, en el orden de los códigos.
+    """
+    # skip_blank_lines descarta la línea vacía con la que terminan los archivos originales
+    df = pd.read_csv(ruta, names=COLUMNAS + [COLUMNA_CLASE], dtype=TIPOS, skip_blank_lines=True)
+    clase = df[COLUMNA_CLASE].cat
+    X = np.ascontiguousarray(df[COLUMNAS].to_numpy(dtype=np.float32))
+    return X, clase.codes.to_numpy(dtype=np.int8), np.asarray(clase.categories, dtype=str)
+
+def _ruta_cache(ruta):
+    return ruta + SUFIJO_CACHE
+
+def _guardar_cache(ruta_cache, X, y, clases, estado, sha):
+    """
+    Escribe la caché de forma atómica: un proceso que la lea a la vez ve la versión anterior o la nueva,
+    nunca un archivo a medias. Si el directorio no admite escritura, simplemente no se guarda.
+    """
+    nombres = "\n".join(clases).encode("utf-8")
+    cabecera = CABECERA.pack(MAGICO, estado.st_mtime_ns, estado.st_size, bytes.fromhex(sha),
+                             X.shape[0], X.shape[1], len(nombres))
+    temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, "wb") as archivo:
+            archivo.write(cabecera + X.astype("<f4").tobytes() + y.astype(np.int8).tobytes() + nombres)
+        os.replace(temporal, ruta_cache)
+    except OSError:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+
+def _leer_cache(ruta_cache):
+    """
+    Lee la caché completa.
+
+    Retorna:
+    - Una tupla (mtime, tamaño, sha256, X, y, clases), o None si no existe o no es válida.
+    """
+    try:
+        with open(ruta_cache, "rb") as archivo:
+            datos = bytearray(archivo.read())  # Copia modificable: los arreglos no quedan de solo lectura
+    except OSError:
+        return None
+    if len(datos) < CABECERA.size:
+        return None
+    magico, mtime, tamaño, sha, filas, medidas, largo = CABECERA.unpack_from(datos)
+    inicio_y = CABECERA.size + filas * medidas * 4
+    if magico != MAGICO or len(datos) != inicio_y + filas + largo:
+        return None
+    X = np.frombuffer(datos, dtype="<f4", count=filas * medidas, offset=CABECERA.size).reshape(filas, medidas)
+    y = np.frombuffer(datos, dtype=np.int8, count=filas, offset=inicio_y)
+    clases = np.array(datos[inicio_y + filas:].decode("utf-8").split("\n"))
+    return mtime, tamaño, sha.hex(), X, y, clases
+
+def cargar_iris(ruta=RUTA_BEZDEK, usar_cache=True):
+    """
+    Carga un archivo con el formato de Iris, usando la caché binaria cuando sigue vigente.
+
+    La caché es válida si su formato coincide y el archivo fuente conserva el mtime y el tamaño
+    registrados. Si el mtime cambió pero el hash del contenido es el mismo, se reutilizan los arreglos
+    y solo se actualiza el mtime guardado; si el contenido cambió, se vuelve a interpretar el texto.
+
+    Parámetros:
+    - ruta: Ruta del archivo .data (por defecto bezdekIris.data).
+    - usar_cache: Si es False, siempre se interpreta el texto y no se escribe la caché.
+
+    Retorna:
+    - Una tupla (X, y, clases) como la de interpretar_iris.
+    """
+    if not usar_cache:
+        return interpretar_iris(ruta)
+    estado = os.stat(ruta)
+    ruta_cache = _ruta_cache(ruta)
+    sha = None
+    cache = _leer_cache(ruta_cache)
+    if cache is not None:
+        mtime, tamaño, sha_cache, X, y, clases = cache
+        if mtime == estado.st_mtime_ns and tamaño == estado.st_size:
+            return X, y, clases
+        sha = huella(ruta)
+        if sha == sha_cache:
+            _guardar_cache(ruta_cache, X, y, clases, estado, sha)
+            return X, y, clases
+    X, y, clases = interpretar_iris(ruta)
+    _guardar_cache(ruta_cache, X, y, clases, estado, sha or huella(ruta))
+    return X, y, clases
+
+def como_dataframe(X, y, clases):
+    """
+    Arma el DataFrame del dataset con las medidas en float32 y la clase como columna categórica.
+
+    Parámetros:
+    - X, y, clases: Los arreglos que devuelve cargar_iris.
+
+    Retorna:
+    - Un DataFrame con las columnas de COLUMNAS y la columna 'class'.
+    """
+    df = pd.DataFrame(X, columns=COLUMNAS)
+    df[COLUMNA_CLASE] = pd.Categorical.from_codes(y, categories=clases)
+    return df
+
+def medir_carga(ruta=RUTA_BEZDEK, repeticiones=200):
+    """
+    Compara el tiempo de carga en frío (sin caché: interpreta el texto y escribe la caché) y en caliente
+    (lee el archivo binario) con pd.read_csv sin tipos explícitos y con load_iris de sklearn.
+
+    Parámetros:
+    - ruta: Archivo a cargar.
+    - repeticiones: Veces que se repite cada medición; se reporta la mediana.
+    """
+    from sklearn.datasets import load_iris
+
+    def mediana(funcion, preparar=lambda: None):
+        tiempos = []
+        for _ in range(repeticiones):
+            preparar()
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+        return float(np.median(tiempos)) * 1e3
+
+    def borrar_cache():
+        try:
+            os.remove(_ruta_cache(ruta))
+        except FileNotFoundError:
+            pass
+
+    def tocar():
+        os.utime(ruta)  # Cambia el mtime sin cambiar el contenido
+
+    nombres = COLUMNAS + [COLUMNA_CLASE]
+    print(f"Carga de {os.path.basename(ruta)} (mediana de {repeticiones}):")
+    print(f"  pd.read_csv con inferencia de tipos: {mediana(lambda: pd.read_csv(ruta, names=nombres)):8.3f} ms")
+    print(f"  sklearn load_iris:                   {mediana(load_iris):8.3f} ms")
+    print(f"  cargar_iris en frío (sin caché):     {mediana(lambda: cargar_iris(ruta), borrar_cache):8.3f} ms")
+    print(f"  cargar_iris con mtime cambiado:      {mediana(lambda: cargar_iris(ruta), tocar):8.3f} ms")
+    print(f"  cargar_iris en caliente:             {mediana(lambda: cargar_iris(ruta)):8.3f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cargador con caché del dataset Iris.")
+    parser.add_argument("ruta", nargs="?", default=RUTA_BEZDEK, help="Archivo .data a cargar")
+    parser.add_argument("--medir", action="store_true", help="Compara los tiempos de carga en frío y en caliente")
+    args = parser.parse_args()
+
+    if args.medir:
+        medir_carga(args.ruta)
+    else:
+        X, y, clases = cargar_iris(args.ruta)
+        print(f"{X.shape[0]} filas, {X.shape[1]} medidas ({X.dtype}), clases: {', '.join(clases)}")
@@ -0,0 +1,398 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Lectura por bloques y estadísticas por clase sin cargar la tabla completa ---
+# Para archivos con el formato de Iris ('medida,...,medida,clase', sin encabezado) que no caben en
+# memoria: el lector entrega bloques de un número fijo de filas ya tipados (float32 y códigos de clase)
+# y el acumulador mantiene por clase la cuenta, la media y la suma de cuadrados de las desviaciones
+# (método de Welford). Los acumuladores de partes distintas del archivo se combinan con la misma
+# recurrencia, así que cada proceso puede leer su propio tramo. Con esas estadísticas se entrenan el
+# clasificador por centroides y el Bayes ingenuo gaussiano.
+
+FILAS_BLOQUE = 65536  # Filas de cada bloque que entrega el lector
+
+class _Tramo:
+    """Vista de solo lectura de los bytes [inicio, fin) de un archivo, para entregársela a pd.read_csv."""
+
+    def __init__(self, archivo, inicio, fin):
+        self.archivo = archivo
+        self.restantes = fin - inicio
+        archivo.seek(inicio)
+
+    def read(self, n=-1):
+        if n is None or n < 0 or n > self.restantes:
+            n = self.restantes
+        datos = self.archivo.read(n)
+        self.restantes -= len(datos)
+        return datos
+
+    def __iter__(self):
+        # pandas solo revisa que exista; la lectura se hace siempre con read
+        return iter(())
+
+def contar_medidas(ruta):
+    """
+    Cuenta las columnas de medidas (todas menos la última) mirando la primera línea no vacía.
+
+    Parámetros:
+    - ruta: Ruta del archivo.
+
+    Retorna:
+    - El número de medidas por fila.
+    """
+    with open(ruta, "rb") as archivo:
+        for linea in archivo:
+            if linea.strip():
+                return linea.count(b",")
+    raise ValueError(f"{ruta} no tiene filas")
+
+def tramos(ruta, partes):
+    """
+    Divide el archivo en 'partes' rangos de bytes que empiezan y terminan en un salto de línea.
+
+    Parámetros:
+    - ruta: Ruta del archivo.
+    - partes: Número de rangos deseado (puede salir alguno vacío, que se descarta).
+
+    Retorna:
+    - Lista de tuplas (inicio, fin).
+    """
+    tamaño = os.path.getsize(ruta)
+    cortes = [0]
+    with open(ruta, "rb") as archivo:
+        for p in range(1, partes):
+            archivo.seek(max(tamaño * p // partes, cortes[-1]))
+            archivo.readline()  # Avanza hasta el final de la línea en la que cayó el corte
+            cortes.append(min(archivo.tell(), tamaño))
+    cortes.append(tamaño)
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if b > a]
+
+def leer_bloques(ruta, filas=FILAS_BLOQUE, inicio=0, fin=None, medidas=None):
+    """
+    Lee el archivo (o el tramo [inicio, fin), que debe estar alineado a líneas) en bloques tipados.
+
+    Parámetros:
+    - ruta: Ruta del archivo.
+    - filas: Filas de cada bloque; solo el último puede tener menos.
+    - inicio, fin: Rango de bytes a leer (por defecto, el archivo completo).
+    - medidas: Número de columnas de medidas; si es None se deduce de la primera línea.
+
+    Retorna:
+    - Un generador de tuplas (X, y, clases): X es float32 de forma (filas, medidas), y son los códigos
+      int32 de la clase de cada fila y clases es la lista de nombres vista hasta ese bloque (el código
+      es la posición en la lista; la lista solo crece, así que los códigos anteriores siguen valiendo).
+    """
+    if medidas is None:
+        medidas = contar_medidas(ruta)
+    if fin is None:
+        fin = os.path.getsize(ruta)
+    tipos = {**{i: np.float32 for i in range(medidas)}, medidas: "category"}
+    clases = []
+    indices = {}
+    with open(ruta, "rb") as archivo:
+        lector = pd.read_csv(_Tramo(archivo, inicio, fin), header=None, dtype=tipos, chunksize=filas,
+                             skip_blank_lines=True)
+        for df in lector:
+            categoria = df[medidas].cat
+            for nombre in categoria.categories:
+                if nombre not in indices:
+                    indices[nombre] = len(clases)
+                    clases.append(nombre)
+            # Traduce los códigos locales del bloque a los códigos globales del lector
+            traduccion = np.array([indices[nombre] for nombre in categoria.categories], dtype=np.int32)
+            X = np.ascontiguousarray(df.iloc[:, :medidas].to_numpy(dtype=np.float32))
+            yield X, traduccion[categoria.codes.to_numpy()], clases
+
+class EstadisticasClase:
+    """
+    Cuenta, media y varianza de cada medida por clase, calculadas en línea con el método de Welford.
+
+    Cada bloque aporta su cuenta, media y suma de cuadrados de las desviaciones (M2) y se incorpora con
+    la recurrencia de Welford para grupos (Chan et al.):
+        n = na + nb,  δ = media_b - media_a,  media = media_a + δ·nb/n,  M2 = M2_a + M2_b + δ²·na·nb/n
+    Es la misma fórmula que combina dos acumuladores, por lo que el resultado no depende de cómo se
+    reparta el archivo entre procesos. Se acumula en float64 aunque los bloques lleguen en float32.
+    """
+
+    def __init__(self, medidas):
+        self.medidas = medidas
+        self.clases = []
+        self.indices = {}
+        self.cuenta = np.zeros(0, dtype=np.int64)
+        self.media = np.zeros((0, medidas))
+        self.m2 = np.zeros((0, medidas))
+
+    def _indice(self, nombre):
+        """Posición de la clase en los arreglos, agregándola si es nueva."""
+        indice = self.indices.get(nombre)
+        if indice is None:
+            indice = self.indices[nombre] = len(self.clases)
+            self.clases.append(nombre)
+            self.cuenta = np.append(self.cuenta, 0)
+            self.media = np.vstack([self.media, np.zeros(self.medidas)])
+            self.m2 = np.vstack([self.m2, np.zeros(self.medidas)])
+        return indice
+
+    def _combinar_clase(self, indice, nb, media_b, m2_b):
+        """Incorpora las estadísticas (nb, media_b, m2_b) de un grupo de filas de la clase 'indice'."""
+        na = self.cuenta[indice]
+        n = na + nb
+        delta = media_b - self.media[indice]
+        self.media[indice] += delta * (nb / n)
+        self.m2[indice] += m2_b + delta ** 2 * (na * nb / n)
+        self.cuenta[indice] = n
+
+    def agregar(self, X, y, clases):
+        """
+        Incorpora un bloque.
+
+        Parámetros:
+        - X: Medidas del bloque.
+        - y: Códigos de clase de cada fila.
+        - clases: Nombres de las clases que corresponden a los códigos.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        cuentas = np.bincount(y, minlength=len(clases))
+        for codigo in np.flatnonzero(cuentas):
+            filas = X[y == codigo]
+            media_b = filas.mean(axis=0)
+            self._combinar_clase(self._indice(clases[codigo]), cuentas[codigo], media_b,
+                                 ((filas - media_b) ** 2).sum(axis=0))
+
+    def combinar(self, otra):
+        """
+        Suma a este acumulador las estadísticas de otro (por ejemplo, el de otro tramo del archivo).
+
+        Parámetros:
+        - otra: Otro EstadisticasClase con el mismo número de medidas.
+        """
+        for nombre, nb, media_b, m2_b in zip(otra.clases, otra.cuenta, otra.media, otra.m2):
+            if nb:
+                self._combinar_clase(self._indice(nombre), nb, media_b, m2_b)
+        return self
+
+    def varianza(self, ddof=0):
+        """
+        Varianza de cada medida por clase.
+
+        Parámetros:
+        - ddof: 0 para la varianza poblacional (la que usa Bayes ingenuo), 1 para la muestral.
+
+        Retorna:
+        - Matriz (clases, medidas).
+        """
+        return self.m2 / np.maximum(self.cuenta - ddof, 1)[:, None]
+
+    def total(self):
+        """
+        Junta todas las clases en un solo grupo.
+
+        Retorna:
+        - Una tupla (cuenta, media, varianza) del conjunto completo.
+        """
+        global_ = EstadisticasClase(self.medidas)
+        for nb, media_b, m2_b in zip(self.cuenta, self.media, self.m2):
+            if nb:
+                global_._combinar_clase(global_._indice(None), nb, media_b, m2_b)
+        return global_.cuenta[0], global_.media[0], global_.varianza()[0]
+
+def _acumular_tramo(argumentos):
+    """Estadísticas de un tramo del archivo (se ejecuta en un proceso del grupo)."""
+    ruta, inicio, fin, filas, medidas = argumentos
+    estadisticas = EstadisticasClase(medidas)
+    for X, y, clases in leer_bloques(ruta, filas, inicio, fin, medidas):
+        estadisticas.agregar(X, y, clases)
+    return estadisticas
+
+def acumular(ruta, procesos=1, filas=FILAS_BLOQUE):
+    """
+    Calcula las estadísticas por clase de un archivo completo sin cargarlo en memoria.
+
+    Parámetros:
+    - ruta: Ruta del archivo.
+    - procesos: Procesos que leen tramos distintos del archivo en paralelo.
+    - filas: Filas de cada bloque.
+
+    Retorna:
+    - Un EstadisticasClase con todo el archivo.
+    """
+    medidas = contar_medidas(ruta)
+    tareas = [(ruta, inicio, fin, filas, medidas) for inicio, fin in tramos(ruta, procesos)]
+    if len(tareas) == 1:
+        return _acumular_tramo(tareas[0])
+    with multiprocessing.Pool(min(procesos, len(tareas))) as grupo:
+        parciales = grupo.map(_acumular_tramo, tareas)
+    # Combina por pares, como un árbol, en lugar de ir sumando todo sobre el primero
+    while len(parciales) > 1:
+        parciales = [parciales[i].combinar(parciales[i + 1]) if i + 1 < len(parciales) else parciales[i]
+                     for i in range(0, len(parciales), 2)]
+    return parciales[0]
+
+class ClasificadorCentroide:
+    """
+    Clasificador por distancia euclidiana al centroide de cada clase (el ClasificadorEuclidiano de Lab_9),
+    entrenado a partir de las medias de un EstadisticasClase.
+    """
+    def entrenar(self, estadisticas):
+        """
+        Toma las medias de cada clase como centroides.
+
+        Parámetros:
+        - estadisticas: El EstadisticasClase del conjunto de entrenamiento.
+        """
+        self.clases = np.array(estadisticas.clases)
+        self.centroides = estadisticas.media.copy()
+
+    def predecir(self, X):
+        """
+        Predice la clase del centroide más cercano a cada fila.
+
+        Parámetros:
+        - X: Matriz de medidas.
+
+        Retorna:
+        - Array con los nombres de las clases predichas.
+        """
+        distancias = ((np.asarray(X, dtype=np.float64)[:, None, :] - self.centroides[None]) ** 2).sum(axis=2)
+        return self.clases[distancias.argmin(axis=1)]
+
+class BayesGaussiano:
+    """
+    Bayes ingenuo con verosimilitud gaussiana por medida, equivalente a GaussianNB de sklearn, entrenado
+    a partir de la cuenta, la media y la varianza de un EstadisticasClase.
+    """
+    def __init__(self, suavizado=1e-9):
+        """
+        Parámetros:
+        - suavizado: Fracción de la mayor varianza del conjunto que se suma a todas las varianzas
+          (el 'var_smoothing' de GaussianNB), para que ninguna sea cero.
+        """
+        self.suavizado = suavizado
+
+    def entrenar(self, estadisticas):
+        """
+        Calcula las probabilidades a priori y los parámetros de cada gaussiana.
+
+        Parámetros:
+        - estadisticas: El EstadisticasClase del conjunto de entrenamiento.
+        """
+        _, _, varianza_total = estadisticas.total()
+        self.clases = np.array(estadisticas.clases)
+        self.medias = estadisticas.media.copy()
+        self.varianzas = estadisticas.varianza() + self.suavizado * varianza_total.max()
+        self.log_prior = np.log(estadisticas.cuenta / estadisticas.cuenta.sum())
+
+    def predecir(self, X):
+        """
+        Predice la clase con mayor probabilidad a posteriori para cada fila.
+
+        Parámetros:
+        - X: Matriz de medidas.
+
+        Retorna:
+        - Array con los nombres de las clases predichas.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        log_verosimilitud = -0.5 * (np.log(2 * np.pi * self.varianzas).sum(axis=1)[None]
+                                    + ((X[:, None, :] - self.medias[None]) ** 2 / self.varianzas[None]).sum(axis=2))
+        return self.clases[(self.log_prior[None] + log_verosimilitud).argmax(axis=1)]
+
+def evaluar_en_bloques(modelo, ruta, filas=FILAS_BLOQUE):
+    """
+    Calcula la precisión de un modelo recorriendo el archivo por bloques.
+
+    Parámetros:
+    - modelo: Un clasificador ya entrenado, con el método predecir.
+    - ruta: Archivo con las filas a clasificar.
+    - filas: Filas de cada bloque.
+
+    Retorna:
+    - La fracción de filas bien clasificadas.
+    """
+    aciertos = total = 0
+    for X, y, clases in leer_bloques(ruta, filas):
+        aciertos += int((modelo.predecir(X) == np.array(clases)[y]).sum())
+        total += len(y)
+    return aciertos / total
+
+def generar_csv(ruta, filas, medidas=8, clases=4, semilla=0, filas_bloque=FILAS_BLOQUE):
+    """
+    Escribe un archivo sintético de sensores con el formato 'medida,...,clase' para pruebas de volumen.
+    Cada clase es una gaussiana con su propia media y desviación por medida.
+
+    Parámetros:
+    - ruta: Archivo a crear.
+    - filas: Número de filas.
+    - medidas: Columnas de medidas.
+    - clases: Número de clases ('sensor_0', 'sensor_1', ...).
+    """
+    generador = np.random.default_rng(semilla)
+    medias = generador.uniform(-10, 10, (clases, medidas))
+    desviaciones = generador.uniform(0.5, 3, (clases, medidas))
+    nombres = np.array([f"sensor_{c}" for c in range(clases)], dtype=object)
+    with open(ruta, "w") as archivo:
+        for inicio in range(0, filas, filas_bloque):
+            n = min(filas_bloque, filas - inicio)
+            y = generador.integers(clases, size=n)
+            X = medias[y] + desviaciones[y] * generador.standard_normal((n, medidas))
+            df = pd.DataFrame(X.astype(np.float32))
+            df[medidas] = nombres[y]
+            df.to_csv(archivo, header=False, index=False, float_format="%.4f")
+
+def memoria_maxima():
+    """
+    Memoria residente máxima del proceso, en MiB.
+
+    Retorna:
+    - Los MiB, o None si el sistema no tiene el módulo resource (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxima = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la reporta en KiB y macOS en bytes
+    return maxima / 2 ** 20 if sys.platform == "darwin" else maxima / 1024
+
+def medir(ruta, procesos=1, filas=FILAS_BLOQUE):
+    """
+    Recorre el archivo con el lector por bloques, entrena los dos clasificadores y reporta tiempos,
+    rendimiento y memoria máxima.
+    """
+    tamaño = os.path.getsize(ruta) / 2 ** 20
+    inicio = time.perf_counter()
+    estadisticas = acumular(ruta, procesos, filas)
+    transcurrido = time.perf_counter() - inicio
+    print(f"{os.path.basename(ruta)}: {tamaño:,.1f} MiB, {estadisticas.cuenta.sum():,} filas en "
+          f"{transcurrido:.2f} s ({tamaño / transcurrido:,.1f} MiB/s, {procesos} proceso(s), bloques de {filas} filas)")
+    varianza = estadisticas.varianza()
+    for c, nombre in enumerate(estadisticas.clases):
+        print(f"  {nombre}: n={estadisticas.cuenta[c]:,} media={np.round(estadisticas.media[c], 3)} "
+              f"varianza={np.round(varianza[c], 3)}")
+    for modelo in (ClasificadorCentroide(), BayesGaussiano()):
+        modelo.entrenar(estadisticas)
+        inicio = time.perf_counter()
+        precision = evaluar_en_bloques(modelo, ruta, filas)
+        print(f"  {type(modelo).__name__}: precisión {precision:.4f} ({time.perf_counter() - inicio:.2f} s)")
+    memoria = memoria_maxima()
+    if memoria is not None:
+        print(f"  Memoria residente máxima: {memoria:,.0f} MiB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estadísticas por clase y clasificadores sobre archivos leídos por bloques.")
+    parser.add_argument("ruta", help="Archivo 'medida,...,clase' sin encabezado")
+    parser.add_argument("--filas", type=int, default=FILAS_BLOQUE, help="Filas por bloque")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos que leen tramos del archivo en paralelo")
+    parser.add_argument("--generar", type=int, metavar="FILAS", default=None,
+                        help="Antes de medir, crea en 'ruta' un archivo sintético de sensores con estas filas")
+    args = parser.parse_args()
+
+    if args.generar is not None:
+        generar_csv(args.ruta, args.generar)
+    medir(args.ruta, args.procesos, args.filas)
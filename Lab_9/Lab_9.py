@@ -1,10 +1,16 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split, KFold, LeaveOneOut
 from sklearn.metrics import accuracy_score, confusion_matrix
-from sklearn.datasets import load_iris, load_wine, load_digits
+from sklearn.datasets import load_wine, load_digits
 from scipy.spatial import distance
 
+# El cargador con caché de los archivos de Iris vive en Lab_8
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab_8"))
+from datos_iris import cargar_iris
+
 # Configuración de pandas para mostrar todas las columnas y ajustar el ancho de la salida
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 1000)
@@ -152,11 +158,9 @@ def mostrar_matriz_confusion(matriz, etiquetas_clases):
                              columns=[f"Predicción {etiqueta}" for etiqueta in etiquetas_clases])
     return matriz_df
 
-# Cargar datasets de sklearn
-# Carga el conjunto de datos Iris y obtiene las etiquetas
-iris = load_iris()
-X_iris, y_iris = iris.data, iris.target
-etiquetas_iris = iris.target_names
+# Cargar datasets
+# Carga el conjunto de datos Iris desde bezdekIris.data (los mismos valores que load_iris) con el cargador de Lab_8
+X_iris, y_iris, etiquetas_iris = cargar_iris()
 
 # Carga el conjunto de datos Wine y obtiene las etiquetas
 wine = load_wine()